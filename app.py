@@ -33,6 +33,9 @@ try:
     from src.predictor import NBAPredictor
     from src.data_fetcher import NBADataFetcher, FeatureEngineer, EloRatingSystem
     from src.odds_scraper import generate_bookmaker_odds, odds_to_american
+    from src.betting_odds import analyze_slate, compare_bookmakers, odds_matrix
+    from src.prediction_schema import migrate_predictions_table, prediction_keys
+    from src.feature_log import FeatureLog
     from src.real_odds_fetcher import RealOddsFetcher
     from src.model_feedback_system import ModelFeedbackSystem
     from src.injury_tracker import InjuryTracker
@@ -281,6 +284,8 @@ def init_database(db_path: str):
             pass
 
     conn.commit()
+    # Team IDs / game_id / model_version (added and backfilled in bulk)
+    migrate_predictions_table(conn)
     conn.close()
 
 def get_user_balance(db_path):
@@ -343,7 +348,12 @@ def convert_numpy_types(obj):
         return obj
 
 def save_prediction_to_db(db_path, prediction_data):
-    """Save or update prediction in database"""
+    """
+    Save or update prediction in database.
+
+    Returns the prediction's feature-log record; the caller collects the
+    slate's records and writes them with log_feature_records.
+    """
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
@@ -361,12 +371,17 @@ def save_prediction_to_db(db_path, prediction_data):
 
     # Use INSERT OR REPLACE to handle duplicates
     try:
+        home_team_id, away_team_id, game_id = prediction_keys(
+            conn, prediction_data['game_date'], prediction_data['home_team'],
+            prediction_data['away_team'], prediction_data.get('game_id')
+        )
         cursor.execute("""
             INSERT OR REPLACE INTO predictions (
                 prediction_date, game_date, home_team, away_team,
                 predicted_winner, predicted_home_prob, predicted_away_prob,
-                confidence, features_json, home_odds, away_odds
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                confidence, features_json, home_odds, away_odds,
+                home_team_id, away_team_id, game_id, model_version
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             prediction_data['game_date'],
@@ -378,7 +393,11 @@ def save_prediction_to_db(db_path, prediction_data):
             float(prediction_data['confidence']),
             features_json,
             prediction_data.get('home_odds'),
-            prediction_data.get('away_odds')
+            prediction_data.get('away_odds'),
+            home_team_id,
+            away_team_id,
+            game_id,
+            prediction_data.get('model_version')
         ))
         conn.commit()
     except Exception as e:
@@ -388,6 +407,24 @@ def save_prediction_to_db(db_path, prediction_data):
     finally:
         conn.close()
 
+    return {
+        'game_date': prediction_data['game_date'],
+        'home_team': home_team_id or prediction_data['home_team'],
+        'away_team': away_team_id or prediction_data['away_team'],
+        'model_version': prediction_data.get('model_version'),
+        'features': features
+    }
+
+def log_feature_records(db_path, records):
+    """Columnar float32 copy of a slate's features for analysis (one bulk write, best effort)."""
+    if not records:
+        return
+    try:
+        logged = FeatureLog(db_path).log_predictions(records)
+        print(f"[OK] Logged {logged} feature vectors")
+    except Exception as e:
+        print(f"⚠️ Could not log feature vectors: {e}")
+
 # =============================================================================
 # SETUP
 # =============================================================================
@@ -499,12 +536,14 @@ def get_api_quota(api_key: str) -> dict:
     if not api_key:
         return {'error': 'No API key'}
     try:
-        import requests
-        response = requests.get(
+        from src.http_client import http_get
+        from src.odds_key_manager import record_quota_headers
+        response = http_get(
             "https://api.the-odds-api.com/v4/sports",
             params={'apiKey': api_key},
             timeout=5
         )
+        record_quota_headers(api_key, response)
         if response.status_code == 200:
             return {
                 'remaining': response.headers.get('x-requests-remaining', 'Unknown'),
@@ -623,6 +662,17 @@ try:
 except AttributeError:
     _cache_decorator = st.cache(ttl=300, suppress_st_warning=True)
 
+# One fetcher per server process: keeps its board and failure backoff across reruns
+try:
+    _resource_decorator = st.cache_resource
+except AttributeError:
+    _resource_decorator = st.cache(allow_output_mutation=True)
+
+@_resource_decorator
+def get_real_odds_fetcher():
+    """Shared RealOddsFetcher (schema setup and legacy import run once)."""
+    return RealOddsFetcher()
+
 @_cache_decorator
 def get_real_or_simulated_odds(home_team, away_team, model_home_prob):
     """
@@ -632,7 +682,7 @@ def get_real_or_simulated_odds(home_team, away_team, model_home_prob):
         (odds_dict, is_real: bool, market_disagrees: bool)
     """
     try:
-        real_odds_fetcher = RealOddsFetcher()
+        real_odds_fetcher = get_real_odds_fetcher()
         real_odds = real_odds_fetcher.get_game_odds(home_team, away_team)
 
         if real_odds and real_odds.get('bookmakers'):
@@ -664,6 +714,41 @@ def get_real_or_simulated_odds(home_team, away_team, model_home_prob):
     return simulated, False, False
 
 
+def display_value_scan(preds):
+    """Scan every game and bookmaker for value bets in one vectorized pass."""
+    slate_odds = [
+        get_real_or_simulated_odds(p['home_team'], p['away_team'], p['home_win_probability'])[0]
+        for p in preds
+    ]
+    bookmakers, home_odds, away_odds = odds_matrix(slate_odds)
+    if not bookmakers:
+        return
+
+    slate = analyze_slate([p['home_win_probability'] for p in preds], home_odds, away_odds)
+
+    rows = []
+    for i, p in enumerate(preds):
+        for side, team, best_col in (('home', p['home_team'], slate['best_home_book'][i]),
+                                     ('away', p['away_team'], slate['best_away_book'][i])):
+            if best_col < 0 or not slate[f'value_{side}'][i, best_col]:
+                continue
+            rows.append({
+                'Game': f"{p['away_team']} @ {p['home_team']}",
+                'Bet': team,
+                'Bookmaker': bookmakers[best_col],
+                'Odds': round(float(home_odds[i, best_col] if side == 'home' else away_odds[i, best_col]), 2),
+                'EV %': round(float(slate[f'{side}_ev'][i, best_col]) * 100, 1),
+                'Kelly %': round(float(slate[f'{side}_kelly'][i, best_col]) * 100, 1),
+            })
+
+    st.markdown("---")
+    st.markdown("### 💰 Value Scan")
+    if rows:
+        safe_dataframe(pd.DataFrame(rows).sort_values('EV %', ascending=False), hide_index=True)
+    else:
+        st.caption("No bets above the +3% EV threshold at the best available price.")
+
+
 # =============================================================================
 # DISPLAY GAME
 # =============================================================================
@@ -817,6 +902,12 @@ def display_game(pred, expanded=False):
                 if book in odds['bookmakers']:
                     st.caption(f"{book}: {odds['bookmakers'][book]['away']:.2f}")
 
+        # Expected value per bookmaker (one vectorized pass over all books)
+        comparisons = compare_bookmakers(pred['home_win_probability'], odds['bookmakers'])
+        if comparisons:
+            from src.explainability_viz import create_ev_comparison_chart
+            safe_plotly_chart(create_ev_comparison_chart(comparisons, ht, at))
+
         # Metric definitions removed - now in sidebar for all matches
         
         # Metric and Feature definitions removed - now in sidebar for all matches
@@ -1364,6 +1455,7 @@ with tab1:
                         prog = st.progress(0)
                         status = st.empty()
                         preds = []
+                        feature_records = []
 
                         for i, (h, a, game_date) in enumerate(games_with_dates):
                             status.text(f"Analyzing {a} @ {h}...")
@@ -1384,7 +1476,7 @@ with tab1:
                                         away_odds = odds['bookmakers'].get('Pinnacle', {}).get('away', 2.0)
 
                                     preds.append(p)
-                                    save_prediction_to_db(str(db_path), {
+                                    feature_records.append(save_prediction_to_db(str(db_path), {
                                         'game_date': game_date,  # Use actual game date, not today
                                         'home_team': h, 'away_team': a,
                                         'predicted_winner': h if p['prediction'] == 'home' else a,
@@ -1393,8 +1485,9 @@ with tab1:
                                         'confidence': p['confidence'],
                                         'features': p.get('features', {}),
                                         'home_odds': home_odds,
-                                        'away_odds': away_odds
-                                    })
+                                        'away_odds': away_odds,
+                                        'model_version': p.get('model_version')
+                                    }))
                             except Exception as e:
                                 error_msg = str(e)
                                 st.warning(f"Error on {a} @ {h}: {error_msg}")
@@ -1406,6 +1499,7 @@ with tab1:
 
                         prog.empty()
                         status.empty()
+                        log_feature_records(str(db_path), feature_records)
                         st.session_state.todays_predictions = preds
                         if preds:
                             st.success(f"✅ Analyzed {len(preds)} games! ({len(games_with_dates)} total games found)")
@@ -1482,6 +1576,8 @@ with tab1:
                     except Exception as e:
                         st.error(f"❌ Error: {str(e)[:100]}")
 
+        display_value_scan(preds)
+
         st.markdown("---")
         st.markdown("### 🏀 Game Predictions")
         if len(preds) == 0:
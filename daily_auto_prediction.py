@@ -20,6 +20,9 @@ Arguments:
     --dry-run: Test mode - skip external services
     --verbose: Enable debug logging
     --date YYYY-MM-DD: Override date (default: today)
+    --record DIR: Save every HTTP response of the run to a cassette directory
+    --replay DIR: Serve HTTP responses from a cassette directory (no network)
+    --replay-latency-ms N: Latency injected per replayed response
 """
 
 import sys
@@ -28,7 +31,7 @@ import logging
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 import json
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -37,22 +40,27 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-# Import project modules
-from src.predictor import NBAPredictor
-from src.data_fetcher import NBADataFetcher, EloRatingSystem
-from src.twitter_integration import (
-    create_fresh_twitter_client,
-    load_credentials_from_env,
-    create_twitter_thread,
-    format_prediction_tweet
-)
+# Import project modules (the model stack, nba_api endpoints, tweepy and
+# plotly are imported on the code paths that need them)
 from src.betting_odds import calculate_betting_odds, get_fair_odds
-from src.model_feedback_system import ModelFeedbackSystem
 from src.email_reporter import EmailReporter
+from src.odds_history import OddsHistoryStore
+from src.odds_cache import OddsCache
+from src.prediction_schema import prediction_keys
+from src.feature_log import FeatureLog
+from src.drift_monitor import DriftMonitor
+from src.http_client import get_http_client
+from src.pipeline import Step, StepGraph, StopPipeline
+from src.run_checkpoint import RunCheckpoint, model_fingerprint
+from src.telemetry import get_telemetry, span
 import sqlite3
 import pandas as pd
 import numpy as np
 
+if TYPE_CHECKING:
+    from src.predictor import NBAPredictor
+    from src.data_fetcher import NBADataFetcher
+
 
 def convert_numpy_types(obj):
     """
@@ -104,11 +112,17 @@ class DailyPredictionAutomation:
         # Initialize logger
         self.logger = self._setup_logger()
 
-        # Initialize components (lazy loading)
-        self.predictor: Optional[NBAPredictor] = None
-        self.fetcher: Optional[NBADataFetcher] = None
+        # Initialize components (lazy loading, shared process-wide, see components)
+        self.predictor: Optional['NBAPredictor'] = None
+        self.fetcher: Optional['NBADataFetcher'] = None
         self.api_clients: Optional[Dict] = None
 
+    @property
+    def components(self):
+        """Process-wide component registry for this database and model directory."""
+        from src.components import get_components
+        return get_components(self.db_path, self.model_dir)
+
     def _setup_logger(self) -> logging.Logger:
         """Configure logging with both file and console handlers"""
         logger = logging.getLogger('DailyPredictionBot')
@@ -152,7 +166,8 @@ class DailyPredictionAutomation:
         self.logger.info("Checking ELO rating freshness...")
 
         try:
-            elo = EloRatingSystem(db_path=self.db_path)
+            # Shared instance: the predictor's feature engineer sees the refreshed ratings
+            elo = self.components.elo_system
 
             # Get freshness info
             conn = sqlite3.connect(self.db_path)
@@ -193,10 +208,14 @@ class DailyPredictionAutomation:
             self.logger.error(f"ELO freshness check failed: {e}")
             # Continue anyway - stale ELO is better than no ELO
 
-    def initialize_components(self) -> bool:
+    def initialize_components(self, refresh_elo: bool = True) -> bool:
         """
         Initialize predictor, data fetcher, and Twitter client
 
+        Args:
+            refresh_elo: Also refresh stale ELO ratings (the daily pipeline
+                         runs this as its own step after result reconciliation)
+
         Returns:
             True if all components initialized successfully, False otherwise
         """
@@ -216,10 +235,10 @@ class DailyPredictionAutomation:
                 masked_key = best_key[:8] + "..." + best_key[-4:]
                 self.logger.info(f"[OK] Using Odds API key: {masked_key}")
 
-                # Log quota info
+                # Log quota info (from the ledger - no extra request)
                 from src.odds_key_manager import OddsKeyManager
                 manager = OddsKeyManager()
-                quota = manager.get_key_quota(best_key)
+                quota = manager.get_cached_quota(best_key)
                 if quota.get('status') == 'OK':
                     self.logger.info(f"  Quota: {quota['remaining']} remaining, {quota['used']} used")
             else:
@@ -228,24 +247,24 @@ class DailyPredictionAutomation:
 
             # Initialize predictor
             self.logger.info("Loading NBA predictor model...")
-            self.predictor = NBAPredictor(
-                db_path=self.db_path,
-                model_dir=self.model_dir
-            )
-            self.predictor.load_model()
+            self.predictor = self.components.predictor
+            if not self.predictor.model_loaded:
+                self.predictor.load_model()
             self.logger.info("[OK] Predictor model loaded successfully")
 
-            # Initialize data fetcher
+            # Initialize data fetcher (same instance the predictor uses)
             self.logger.info("Initializing data fetcher...")
-            self.fetcher = NBADataFetcher(db_path=self.db_path)
+            self.fetcher = self.components.data_fetcher
             self.logger.info("[OK] Data fetcher initialized")
 
             # Ensure ELO ratings are fresh (critical for prediction quality)
-            self._ensure_fresh_elo()
+            if refresh_elo:
+                self._ensure_fresh_elo()
 
             # Initialize Twitter client
             if not self.dry_run:
                 self.logger.info("Connecting to Twitter API...")
+                from src.twitter_integration import create_fresh_twitter_client
                 self.api_clients = create_fresh_twitter_client()
 
                 # Check if client was created successfully
@@ -404,11 +423,12 @@ class DailyPredictionAutomation:
                 return None
 
             # Generate prediction (thread-safe: creates own DB connection internally)
-            result = self.predictor.predict_game(
-                home_team=home_team,
-                away_team=away_team,
-                game_date=game_date
-            )
+            with span('game', matchup=f"{away_team}@{home_team}"):
+                result = self.predictor.predict_game(
+                    home_team=home_team,
+                    away_team=away_team,
+                    game_date=game_date
+                )
 
             if not result:
                 self.logger.warning(f"  [ERROR] Prediction failed for {home_team} vs {away_team}")
@@ -530,12 +550,10 @@ class DailyPredictionAutomation:
         Returns:
             Number of predictions saved
         """
-        # Build tricode -> full name mapping
-        from nba_api.stats.static import teams
-        all_teams = teams.get_teams()
-        tricode_to_full = {t['abbreviation']: t['full_name'] for t in all_teams}
+        from src.team_identity import to_full_name
 
         saved_count = 0
+        feature_records = []
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -570,8 +588,8 @@ class DailyPredictionAutomation:
 
                     # Convert tricodes to full team names for database storage
                     # This ensures consistency with email display and GitHub Pages
-                    home_team = tricode_to_full.get(home_team_raw, home_team_raw)
-                    away_team = tricode_to_full.get(away_team_raw, away_team_raw)
+                    home_team = to_full_name(home_team_raw)
+                    away_team = to_full_name(away_team_raw)
 
                     # Determine winner (use full name)
                     if pred.get('prediction') == 'home':
@@ -606,13 +624,19 @@ class DailyPredictionAutomation:
                     if not away_odds and away_prob > 0:
                         away_odds = round(1 / away_prob, 2)
 
+                    home_team_id, away_team_id, game_id = prediction_keys(
+                        conn, pred_game_date, home_team, away_team,
+                        pred.get('game_info', {}).get('game_id')
+                    )
+
                     # Insert or replace prediction
                     cursor.execute("""
                         INSERT OR REPLACE INTO predictions (
                             prediction_date, game_date, home_team, away_team,
                             predicted_winner, predicted_home_prob, predicted_away_prob,
-                            confidence, features_json, home_odds, away_odds
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            confidence, features_json, home_odds, away_odds,
+                            home_team_id, away_team_id, game_id, model_version
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """, (
                         datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                         pred_game_date,
@@ -624,9 +648,20 @@ class DailyPredictionAutomation:
                         float(pred.get('confidence', 0.5)),
                         features_json,
                         home_odds,
-                        away_odds
+                        away_odds,
+                        home_team_id,
+                        away_team_id,
+                        game_id,
+                        pred.get('model_version')
                     ))
                     saved_count += 1
+                    feature_records.append({
+                        'game_date': pred_game_date,
+                        'home_team': home_team_id or home_team,
+                        'away_team': away_team_id or away_team,
+                        'model_version': pred.get('model_version'),
+                        'features': features
+                    })
 
                 except Exception as e:
                     self.logger.error(f"Error saving prediction for {home_team} vs {away_team}: {e}")
@@ -636,11 +671,50 @@ class DailyPredictionAutomation:
             conn.close()
             self.logger.info(f"[OK] Saved {saved_count} predictions to database")
 
+            # Columnar float32 copy of the features for analysis (one bulk write)
+            logged = FeatureLog(self.db_path).log_predictions(feature_records)
+            self.logger.info(f"[OK] Logged {logged} feature vectors")
+
         except Exception as e:
             self.logger.error(f"Failed to save predictions to database: {e}", exc_info=True)
 
         return saved_count
 
+    def _check_feature_drift(self, predictions: List[Dict], default_date: str) -> Optional[Dict]:
+        """
+        Record this run's feature sketches and compare recent inputs with training.
+
+        Args:
+            predictions: Predictions from generate_predictions (with 'features')
+            default_date: Date used when a prediction has no game_info date
+
+        Returns:
+            Drift report (see DriftMonitor.check) or None on failure
+        """
+        try:
+            monitor = DriftMonitor(self.db_path, model_dir=self.model_dir)
+            slates: Dict[str, List[Dict]] = {}
+            for pred in predictions:
+                game_date = pred.get('game_info', {}).get('game_date', default_date) or default_date
+                if pred.get('features'):
+                    slates.setdefault(game_date, []).append(pred['features'])
+            for game_date, feature_rows in slates.items():
+                monitor.record_slate(game_date, feature_rows)
+
+            report = monitor.check(as_of=max(slates) if slates else default_date)
+        except Exception as e:
+            self.logger.warning(f"[WARN] Drift check failed (non-critical): {e}")
+            return None
+
+        if report['reference'].startswith('scaler:'):
+            self.logger.info("  No training sketch for this model: PSI/KS skipped, default rates only")
+        if not report['alerts']:
+            self.logger.info(f"[OK] No feature drift ({len(report['features'])} features, "
+                             f"{report['window_start']} to {report['window_end']})")
+        for alert in report['alerts']:
+            self.logger.warning(f"[DRIFT] {alert['level'].upper()} {alert['message']}")
+        return report
+
     def filter_and_select_best(
         self,
         predictions: List[Dict],
@@ -1110,6 +1184,7 @@ class DailyPredictionAutomation:
             # Create image_paths list with None for first tweet
             image_paths_with_none = [None] + image_paths if image_paths else [None] * len(tweets)
 
+            from src.twitter_integration import create_twitter_thread
             responses = create_twitter_thread(
                 api_clients=self.api_clients,
                 texts=tweets,
@@ -1186,20 +1261,55 @@ class DailyPredictionAutomation:
             self.logger.info("  Step 1: Fetching game results from NBA API...")
 
             if not self.fetcher:
-                self.fetcher = NBADataFetcher(self.db_path)
+                self.fetcher = self.components.data_fetcher
 
             games_fetched = self.fetcher.update_recent_games(days_back=lookback_days)
             self.logger.info(f"  [OK] Fetched {games_fetched} games from NBA API")
 
+            # Refresh league box scores so player features come from local SQL
+            try:
+                log_counts = self.fetcher.ingest_season_game_logs()
+                self.logger.info(
+                    f"  [OK] Ingested {log_counts['team_rows']} team / "
+                    f"{log_counts['player_rows']} player box-score rows"
+                )
+            except Exception as e:
+                self.logger.warning(f"  [WARN] Box-score ingestion failed: {e}")
+
+            # Injury history retention (versioned snapshots)
+            try:
+                compaction = self.components.injury_tracker.compact_history()
+                self.logger.info(
+                    f"  [OK] Injury history compacted: {compaction['snapshots_deleted']} snapshots, "
+                    f"{compaction['versions_deleted']} versions removed"
+                )
+            except Exception as e:
+                self.logger.warning(f"  [WARN] Injury history compaction failed: {e}")
+
+            # Line-movement history downsampling (opening/closing lines kept)
+            try:
+                removed = OddsHistoryStore(self.db_path).compact()
+                self.logger.info(f"  [OK] Odds history compacted: {removed} rows removed")
+            except Exception as e:
+                self.logger.warning(f"  [WARN] Odds history compaction failed: {e}")
+
+            # Odds board cache retention (the one persisted copy of the board)
+            try:
+                removed = OddsCache(self.db_path).prune()
+                self.logger.info(f"  [OK] Odds cache pruned: {removed} old boards removed")
+            except Exception as e:
+                self.logger.warning(f"  [WARN] Odds cache pruning failed: {e}")
+
             # Step 2: Update predictions with results from database (like "Update Results" button)
             self.logger.info("  Step 2: Matching predictions with game results...")
 
-            feedback_system = ModelFeedbackSystem(self.db_path)
+            feedback_system = self.components.feedback_system
             updated_predictions = feedback_system.update_predictions_with_results(
                 lookback_days=lookback_days,
                 use_api=False  # Use database (already fetched in step 1)
             )
-            feedback_system.close()
+            # One model_performance snapshot per day (rolled-up metrics, no rescans)
+            feedback_system.record_performance_snapshot(period_days=30)
 
             self.logger.info(f"  [OK] Updated {updated_predictions} predictions")
 
@@ -1315,129 +1425,196 @@ class DailyPredictionAutomation:
             self.logger.error(f"GitHub push failed: {e}", exc_info=True)
             return False
 
-    def run(
+    # ------------------------------------------------------------------
+    # Workflow graph
+    # ------------------------------------------------------------------
+    def _prefetch_injuries(self) -> int:
+        """Warm the league-wide injury snapshot before per-game feature building."""
+        snapshot = self.predictor.feature_engineer.injury_tracker.get_snapshot()
+        self.logger.info(f"[OK] Injury snapshot ready ({len(snapshot)} teams)")
+        return len(snapshot)
+
+    def _prefetch_odds(self) -> int:
+        """Warm the odds board (one Odds API request for the whole slate)."""
+        index = self.predictor.feature_engineer.betting_lines_fetcher.odds_snapshot.get_index()
+        self.logger.info(f"[OK] Odds board ready ({len(index)} games)")
+        return len(index)
+
+    def build_pipeline(
         self,
         target_date: Optional[str] = None,
         lookback_days: int = 7,
         skip_prediction_check: bool = False
-    ) -> bool:
+    ) -> StepGraph:
         """
-        Execute the full daily automation workflow
+        Declare the daily workflow as a step graph.
 
-        Args:
-            target_date: Optional date override (YYYY-MM-DD)
-            lookback_days: Days to check for prediction results (default: 7)
-            skip_prediction_check: Skip updating previous predictions (default: False)
-
-        Returns:
-            True if workflow completed successfully, False otherwise
+        Result reconciliation runs alongside component initialization and
+        the schedule fetch; injury/odds prefetch overlap the ELO refresh;
+        export/push, drift check and email run side by side once
+        predictions are saved.
         """
-        try:
-            start_time = datetime.now()
-            self.logger.info(f"Starting daily automation workflow at {start_time}")
-            self.logger.info("=" * 80)
+        date_str = target_date or datetime.now().strftime('%Y-%m-%d')
 
-            # Step 0: Update previous predictions with results
-            if not skip_prediction_check:
-                self.logger.info("STEP 0: Updating previous predictions...")
-                self.check_and_update_previous_predictions(lookback_days=lookback_days)
-                self.logger.info("")
-            else:
-                self.logger.info("STEP 0: Skipping prediction updates (--skip-prediction-check)")
-                self.logger.info("")
+        def reconcile():
+            if skip_prediction_check:
+                self.logger.info("Skipping prediction updates (--skip-prediction-check)")
+                return {}
+            return self.check_and_update_previous_predictions(lookback_days=lookback_days)
 
-            # Step 1: Initialize components
-            self.logger.info("STEP 1: Initializing components...")
-            if not self.initialize_components():
-                self.logger.error("[ERROR] Workflow aborted: Component initialization failed")
-                return False
-            self.logger.info("")
+        def initialize():
+            if not self.initialize_components(refresh_elo=False):
+                raise RuntimeError("Component initialization failed")
 
-            # Step 2: Fetch today's games
-            self.logger.info("STEP 2: Fetching today's games...")
+        def fetch_games():
             games = self.fetch_todays_games(target_date)
             if not games:
-                self.logger.info("[INFO] No games today - workflow complete (nothing to post)")
-                return True  # Not a failure - just no games
-            self.logger.info("")
+                raise StopPipeline("No games today - nothing to post")
+            return games
 
-            # Step 3: Generate predictions
-            self.logger.info("STEP 3: Generating predictions...")
-            date_str = target_date or datetime.now().strftime('%Y-%m-%d')
+        def predict(games):
             predictions = self.generate_predictions(games)
             if not predictions:
-                self.logger.warning("[WARN] No predictions generated - workflow complete (nothing to post)")
-                return False
-            self.logger.info("")
+                raise StopPipeline("No predictions generated", success=False)
+            return predictions
 
-            # Step 3.5: Save predictions to database (critical for GitHub Pages publish)
-            self.logger.info("STEP 3.5: Saving predictions to database...")
+        def save(predictions):
             saved_count = self._save_predictions_to_db(predictions, date_str)
             self.logger.info(f"[OK] Saved {saved_count}/{len(predictions)} predictions to database")
-            self.logger.info("")
+            return saved_count
 
-            # Step 4: Export games for GitHub Pages
-            self.logger.info("STEP 4: Exporting games for GitHub Pages...")
-            export_success = False
-            try:
-                from src.daily_games_exporter import DailyGamesExporter
-                exporter = DailyGamesExporter(db_path=self.db_path)
-                export_success = exporter.export_games_for_publishing(target_date)
-                if export_success:
-                    self.logger.info("[OK] Games exported to docs/pending_games.json")
-                else:
-                    self.logger.warning("[WARN] Game export failed (non-critical)")
-            except Exception as e:
-                self.logger.warning(f"[WARN] Game export error (non-critical): {e}")
-            self.logger.info("")
+        def check_drift(predictions):
+            return self._check_feature_drift(predictions, date_str)
 
-            # Step 5: Push to GitHub (for GitHub Pages update)
-            self.logger.info("STEP 5: Pushing to GitHub...")
-            if export_success:
-                try:
-                    push_success = self._push_to_github(target_date)
-                    if push_success:
-                        self.logger.info("[OK] Changes pushed to GitHub")
-                    else:
-                        self.logger.warning("[WARN] GitHub push failed (non-critical)")
-                except Exception as e:
-                    self.logger.warning(f"[WARN] GitHub push error (non-critical): {e}")
-            else:
-                self.logger.info("[INFO] Skipping GitHub push (no export to push)")
-            self.logger.info("")
+        def export():
+            from src.daily_games_exporter import DailyGamesExporter
+            exporter = DailyGamesExporter(db_path=self.db_path)
+            if not exporter.export_games_for_publishing(target_date):
+                raise RuntimeError("Game export failed")
+            self.logger.info("[OK] Games exported to docs/pending_games.json")
+            return True
 
-            # Step 6: Send daily email report
-            self.logger.info("STEP 6: Sending daily email report...")
-            try:
-                email_reporter = EmailReporter(db_path=self.db_path)
-                email_success = email_reporter.send_daily_report(test_mode=False)
-                if email_success:
-                    self.logger.info("[OK] Email report sent successfully")
-                else:
-                    self.logger.warning("[WARN] Email report failed (non-critical)")
-            except Exception as e:
-                self.logger.warning(f"[WARN] Email report error (non-critical): {e}")
-            self.logger.info("")
+        def push(export_success):
+            if not self._push_to_github(target_date):
+                raise RuntimeError("GitHub push failed")
+            self.logger.info("[OK] Changes pushed to GitHub")
+
+        def send_email():
+            if not EmailReporter(db_path=self.db_path).send_daily_report(test_mode=False):
+                raise RuntimeError("Email report failed")
+            self.logger.info("[OK] Email report sent successfully")
+
+        return StepGraph([
+            Step('reconcile_results', reconcile, outputs=('reconcile_stats',), critical=False),
+            Step('initialize', initialize, timeout=300, resumable=False),
+            Step('fetch_games', fetch_games, outputs=('games',), after=('initialize',), timeout=180),
+            Step('refresh_elo', self._ensure_fresh_elo, after=('initialize', 'reconcile_results'),
+                 critical=False),
+            Step('prefetch_injuries', self._prefetch_injuries, after=('initialize',),
+                 timeout=120, critical=False, resumable=False),
+            Step('prefetch_odds', self._prefetch_odds, after=('initialize',),
+                 timeout=60, critical=False, resumable=False),
+            Step('predict', predict, inputs=('games',), outputs=('predictions',),
+                 after=('refresh_elo', 'prefetch_injuries', 'prefetch_odds')),
+            Step('save_predictions', save, inputs=('predictions',), outputs=('saved_count',)),
+            Step('check_drift', check_drift, inputs=('predictions',), outputs=('drift_report',),
+                 after=('save_predictions',), critical=False),
+            Step('export_games', export, outputs=('export_success',), after=('save_predictions',),
+                 timeout=120, critical=False),
+            Step('push_to_github', push, inputs=('export_success',), timeout=300, critical=False),
+            Step('send_email', send_email, after=('save_predictions', 'check_drift'),
+                 timeout=180, critical=False),
+        ], max_workers=4, logger=self.logger)
 
-            success = True  # Workflow success based on predictions generated
+    def run(
+        self,
+        target_date: Optional[str] = None,
+        lookback_days: int = 7,
+        skip_prediction_check: bool = False,
+        resume: bool = False
+    ) -> bool:
+        """
+        Execute the full daily automation workflow
 
-            # Workflow summary
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+        Args:
+            target_date: Optional date override (YYYY-MM-DD)
+            lookback_days: Days to check for prediction results (default: 7)
+            skip_prediction_check: Skip updating previous predictions (default: False)
+            resume: Skip steps already completed by an earlier run with the
+                    same date, parameters and model (default: False)
 
+        Returns:
+            True if workflow completed successfully, False otherwise
+        """
+        telemetry = get_telemetry()
+        telemetry.start_run('daily')
+        success = False
+        try:
+            start_time = datetime.now()
+            self.logger.info(f"Starting daily automation workflow at {start_time}")
             self.logger.info("=" * 80)
-            if success:
-                self.logger.info(f"[OK] WORKFLOW COMPLETED SUCCESSFULLY in {duration:.1f}s")
+
+            # Step outputs are checkpointed per (date, inputs) so a failed run can resume
+            checkpoint = RunCheckpoint(
+                run_date=target_date or start_time.strftime('%Y-%m-%d'),
+                params={
+                    'lookback_days': lookback_days,
+                    'skip_prediction_check': skip_prediction_check,
+                    'dry_run': self.dry_run,
+                    'db_path': str(self.db_path),
+                    'model': model_fingerprint(self.model_dir),
+                },
+                root=str(Path(self.db_path).parent / 'runs'),
+                resume=resume
+            )
+            self.logger.info(f"Run directory: {checkpoint.run_dir}" + (" (resuming)" if resume else ""))
+
+            pipeline = self.build_pipeline(target_date, lookback_days, skip_prediction_check)
+            result = pipeline.run(checkpoint=checkpoint)
+
+            # Workflow summary (per-step wall time)
+            self.logger.info("=" * 80)
+            self.logger.info("Step timings:")
+            for line in result.summary_lines():
+                self.logger.info(line)
+            if result.stop_reason:
+                self.logger.info(f"[INFO] {result.stop_reason}")
+            if result.success:
+                self.logger.info(f"[OK] WORKFLOW COMPLETED SUCCESSFULLY in {result.seconds:.1f}s")
             else:
-                self.logger.error(f"[ERROR] WORKFLOW FAILED in {duration:.1f}s")
+                self.logger.error(f"[ERROR] WORKFLOW FAILED in {result.seconds:.1f}s")
             self.logger.info("=" * 80)
 
+            # Outbound HTTP summary (per-host request counts and bytes)
+            get_http_client().log_host_stats(self.logger.info)
+
+            success = result.success
             return success
 
         except Exception as e:
             self.logger.error(f"[ERROR] Workflow failed with unexpected error: {e}", exc_info=True)
             return False
 
+        finally:
+            self._write_telemetry(telemetry.end_run(success))
+
+    def _write_telemetry(self, summary: Dict):
+        """Log the run's telemetry highlights and write the JSON/Prometheus files."""
+        sql = summary['sqlite']
+        inference = summary['inference']
+        self.logger.info(
+            f"Telemetry: {sql['statements']} SQL statements on {sql['connections']} connections "
+            f"({sql['execute_seconds']:.2f}s), {inference['count']} inferences "
+            f"({inference['seconds']:.2f}s)"
+        )
+        for name, stats in list(summary['spans'].items())[:8]:
+            self.logger.info(f"  {name:<28} {stats['count']:5d}x {stats['seconds']:8.2f}s")
+        try:
+            json_path, prom_path = get_telemetry().write(summary, self.log_dir)
+            self.logger.info(f"[OK] Telemetry written to {json_path} and {prom_path}")
+        except OSError as e:
+            self.logger.warning(f"[WARN] Could not write telemetry: {e}")
+
 
 def main():
     """Main entry point for the daily automation script"""
@@ -1454,6 +1631,9 @@ Examples:
   python daily_auto_prediction.py --date 2025-12-25          # Run for specific date
   python daily_auto_prediction.py --skip-prediction-check    # Skip updating old predictions (faster)
   python daily_auto_prediction.py --lookback-days 14         # Update predictions from last 14 days
+  python daily_auto_prediction.py --resume                   # Rerun, skipping steps that already completed
+  python daily_auto_prediction.py --dry-run --date 2026-01-05 --record data/cassettes/20260105
+  python daily_auto_prediction.py --dry-run --date 2026-01-05 --replay data/cassettes/20260105
 
 Features:
   - Updates previous pending predictions with actual results
@@ -1514,8 +1694,47 @@ Features:
         help='Skip updating previous predictions with results (faster startup)'
     )
 
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Reuse completed steps of an earlier run with the same date and inputs (data/runs/)'
+    )
+
+    parser.add_argument(
+        '--record',
+        type=str,
+        metavar='DIR',
+        help='Record all HTTP responses of this run into a cassette directory'
+    )
+
+    parser.add_argument(
+        '--replay',
+        type=str,
+        metavar='DIR',
+        help='Replay HTTP responses from a cassette directory (no network access)'
+    )
+
+    parser.add_argument(
+        '--replay-latency-ms',
+        type=float,
+        default=0.0,
+        help='Latency injected per replayed response in milliseconds (default: 0)'
+    )
+
     args = parser.parse_args()
 
+    if args.record and args.replay:
+        parser.error('--record and --replay are mutually exclusive')
+
+    # Record/replay HTTP fixtures (CLI flags take priority over HTTP_CASSETTE_* env vars)
+    from src.http_cassette import HTTPCassette, install_from_env
+    if args.record:
+        cassette = HTTPCassette(args.record, mode='record').install()
+    elif args.replay:
+        cassette = HTTPCassette(args.replay, mode='replay', latency_ms=args.replay_latency_ms).install()
+    else:
+        cassette = install_from_env()
+
     # Create automation instance
     # Use command line arg if provided, otherwise use .env value
     dry_run_mode = args.dry_run if args.dry_run else env_dry_run
@@ -1537,9 +1756,13 @@ Features:
     success = automation.run(
         target_date=args.date,
         lookback_days=args.lookback_days,
-        skip_prediction_check=args.skip_prediction_check
+        skip_prediction_check=args.skip_prediction_check,
+        resume=args.resume
     )
 
+    if cassette:
+        automation.logger.info(f"HTTP cassette: {cassette.summary()}")
+
     # Exit with appropriate code
     sys.exit(0 if success else 1)
 
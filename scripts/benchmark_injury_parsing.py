@@ -0,0 +1,184 @@
+"""
+scripts/benchmark_injury_parsing.py - Injury page parser benchmark
+
+Times the targeted injury parsers (src/injury_parsers.py) against the
+previous full-tree html.parser approach on saved HTML pages, and checks
+that both return the same players for every team.
+
+Trimmed pages are committed under data/fixtures/injury_pages/, so the
+benchmark and the check run offline. Exits non-zero if the parsers disagree.
+
+Usage:
+    # Benchmark on the committed fixtures
+    python scripts/benchmark_injury_parsing.py --repeat 20
+
+    # Benchmark on today's full pages instead (needs network)
+    python scripts/benchmark_injury_parsing.py --download --fixtures /tmp/injury_pages
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+
+from src.injury_tracker import InjuryTracker
+from src.injury_parsers import LXML_AVAILABLE, parse_hashtag_report, parse_rotowire_lineups
+
+
+FIXTURE_DIR = Path('data/fixtures/injury_pages')
+SOURCES = {
+    'hashtagbasketball': "https://hashtagbasketball.com/nba-injury-report",
+    'rotowire': "https://www.rotowire.com/basketball/nba-lineups.php",
+}
+
+
+def legacy_parse_hashtag(content: bytes, team_names, all_stars):
+    """Previous approach: full html.parser tree, get_text() per row, substring star scan."""
+    soup = BeautifulSoup(content, 'html.parser')
+    injuries = {}
+    for abbrev, team_search in team_names.items():
+        for table in soup.find_all('table'):
+            for row in table.find_all('tr'):
+                cells = row.find_all('td')
+                if len(cells) >= 4 and team_search.lower() in row.get_text().lower():
+                    player_name = cells[0].get_text().strip()
+                    injuries.setdefault(abbrev, []).append({
+                        'player': player_name,
+                        'status': cells[3].get_text().strip(),
+                        'is_star': any(star.lower() in player_name.lower() for star in all_stars)
+                    })
+    return injuries
+
+
+def legacy_parse_rotowire(content: bytes, team_slugs, all_stars):
+    """Previous approach: full html.parser tree, one card scan per team."""
+    soup = BeautifulSoup(content, 'html.parser')
+    injuries = {}
+    for abbrev, slug in team_slugs.items():
+        for card in soup.find_all('div', class_='lineup__box'):
+            header = card.find('a', class_='lineup__team')
+            if not header or slug not in header.get('href', '').lower():
+                continue
+            for li in card.find_all('li', class_='lineup__player'):
+                link = li.find('a')
+                if link and li.find('span', class_='lineup__inj'):
+                    player_name = link.get_text().strip()
+                    injuries.setdefault(abbrev, []).append({
+                        'player': player_name,
+                        'is_star': any(star.lower() in player_name.lower() for star in all_stars)
+                    })
+            break
+    return injuries
+
+
+def download_fixtures(fixture_dir: Path):
+    from src.http_client import http_get
+
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    for name, url in SOURCES.items():
+        response = http_get(url, headers=headers, timeout=15)
+        response.raise_for_status()
+        path = fixture_dir / f"{name}.html"
+        path.write_bytes(response.content)
+        print(f"  Saved {path} ({len(response.content) / 1024:.0f} KB)")
+
+
+def players_by_team(injuries):
+    """team_abbrev -> sorted player names, ignoring teams with no injuries."""
+    return {
+        abbrev: sorted(injury['player'] for injury in team_injuries)
+        for abbrev, team_injuries in injuries.items() if team_injuries
+    }
+
+
+def compare_outputs(legacy_result, targeted_result):
+    """Teams whose injured players differ between the two parsers."""
+    legacy_players = players_by_team(legacy_result)
+    targeted_players = players_by_team(targeted_result)
+    return [
+        (abbrev, legacy_players.get(abbrev, []), targeted_players.get(abbrev, []))
+        for abbrev in sorted(set(legacy_players) | set(targeted_players))
+        if legacy_players.get(abbrev) != targeted_players.get(abbrev)
+    ]
+
+
+def time_parser(func, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark injury page parsers')
+    parser.add_argument('--fixtures', default=str(FIXTURE_DIR), help='Directory with saved pages')
+    parser.add_argument('--download', action='store_true', help='Save current live pages first')
+    parser.add_argument('--repeat', type=int, default=10, help='Parses per parser (median reported)')
+    args = parser.parse_args()
+
+    fixture_dir = Path(args.fixtures)
+    if args.download:
+        print("Downloading fixtures...")
+        download_fixtures(fixture_dir)
+
+    tracker = InjuryTracker()
+    star_set = tracker._star_set
+    cases = {
+        'hashtagbasketball': (
+            lambda c: legacy_parse_hashtag(c, tracker.CBS_TEAM_NAMES, tracker.all_stars),
+            lambda c: parse_hashtag_report(c, tracker.CBS_TEAM_NAMES, star_set),
+        ),
+        'rotowire': (
+            lambda c: legacy_parse_rotowire(c, tracker.ROTOWIRE_TEAM_SLUGS, tracker.all_stars),
+            lambda c: parse_rotowire_lineups(c, tracker.ROTOWIRE_TEAM_SLUGS, star_set),
+        ),
+    }
+
+    mismatched = False
+    print("=" * 60)
+    print(f"INJURY PARSER BENCHMARK (lxml: {'yes' if LXML_AVAILABLE else 'no, SoupStrainer fallback'})")
+    print("=" * 60)
+
+    for name, (legacy, targeted) in cases.items():
+        path = fixture_dir / f"{name}.html"
+        if not path.exists():
+            print(f"\n{name}: no fixture at {path}")
+            continue
+
+        content = path.read_bytes()
+        legacy_ms, legacy_result = time_parser(lambda: legacy(content), args.repeat)
+        targeted_ms, targeted_result = time_parser(lambda: targeted(content), args.repeat)
+
+        legacy_rows = sum(len(v) for v in legacy_result.values())
+        targeted_rows = sum(len(v) for v in targeted_result.values())
+
+        print(f"\n{name} ({len(content) / 1024:.0f} KB)")
+        print(f"  legacy html.parser: {legacy_ms:8.1f} ms  ({legacy_rows} rows)")
+        print(f"  targeted parser:    {targeted_ms:8.1f} ms  ({targeted_rows} rows)")
+        if targeted_ms > 0:
+            print(f"  speedup:            {legacy_ms / targeted_ms:8.1f}x")
+
+        differences = compare_outputs(legacy_result, targeted_result)
+        if differences:
+            mismatched = True
+            print(f"  output check:       MISMATCH in {len(differences)} team(s)")
+            for abbrev, legacy_players, targeted_players in differences:
+                print(f"    {abbrev}: legacy={legacy_players} targeted={targeted_players}")
+        else:
+            print(f"  output check:       same players for {len(players_by_team(legacy_result))} teams")
+
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
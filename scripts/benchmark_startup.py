@@ -0,0 +1,130 @@
+"""
+scripts/benchmark_startup.py - CLI startup-time benchmark
+
+Loads each entry point in a fresh interpreter with `python -X importtime`
+(module-level code only: the `if __name__ == '__main__'` block does not
+run) and reports wall time, the slowest top-level imports and whether any
+of the heavy dependencies (shap, xgboost, lightgbm, plotly, kaleido,
+tweepy, nba_api endpoints, ...) were imported at startup.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --repeat 5 --top 15
+    python scripts/benchmark_startup.py --budget 1.0   # exit 1 if a light entry point is slower
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Entry point -> expected to start without the prediction stack
+ENTRY_POINTS = {
+    'scripts/mark_published.py': True,
+    'scripts/publish_single_thread.py': True,
+    'scripts/morning_routine.py': True,
+    'daily_auto_prediction.py': False,
+}
+
+HEAVY_MODULES = (
+    'shap', 'xgboost', 'lightgbm', 'sklearn', 'scipy', 'plotly', 'kaleido',
+    'tweepy', 'PIL', 'nba_api.stats.endpoints', 'streamlit',
+)
+
+LOADER = "import runpy, sys; sys.argv = [{path!r}]; runpy.run_path({path!r}, run_name='__startup__')"
+
+
+def load_entry_point(path: str) -> Tuple[float, str, int]:
+    """Load one entry point in a fresh interpreter: (wall seconds, importtime log, exit code)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', LOADER.format(path=path)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    return time.perf_counter() - start, proc.stderr, proc.returncode
+
+
+def parse_importtime(log: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        [(module, self_us, cumulative_us), ...] for top-level imports only
+        (nested imports are included in their parent's cumulative time)
+    """
+    rows = []
+    for line in log.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = fields
+        if name.startswith('  '):  # One space after the pipe, two more per nesting level
+            continue
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def imported_heavy_modules(log: str) -> List[str]:
+    """Heavy dependencies that appear anywhere in the import log."""
+    names = {line.rsplit('|', 1)[-1].strip() for line in log.splitlines() if line.startswith('import time:')}
+    return [heavy for heavy in HEAVY_MODULES
+            if any(name == heavy or name.startswith(heavy + '.') for name in names)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI entry point startup time')
+    parser.add_argument('--repeat', type=int, default=3, help='Loads per entry point (median reported)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports to list')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='Fail if a lightweight entry point takes longer (seconds)')
+    parser.add_argument('entry_points', nargs='*', help='Entry points to load (default: all)')
+    args = parser.parse_args()
+
+    entry_points = args.entry_points or list(ENTRY_POINTS)
+
+    print("=" * 60)
+    print(f"STARTUP BENCHMARK ({Path(sys.executable).name} -X importtime, median of {args.repeat})")
+    print("=" * 60)
+
+    over_budget = []
+    summary: Dict[str, float] = {}
+    for path in entry_points:
+        runs = [load_entry_point(path) for _ in range(args.repeat)]
+        wall = statistics.median(run[0] for run in runs)
+        _, log, returncode = runs[-1]
+        summary[path] = wall
+
+        imports = sorted(parse_importtime(log), key=lambda row: row[2], reverse=True)
+        heavy = imported_heavy_modules(log)
+
+        print(f"\n{path}")
+        print(f"  wall time:      {wall * 1000:8.0f} ms" + ("" if returncode == 0 else f"  (exit {returncode})"))
+        print(f"  import time:    {sum(row[2] for row in imports) / 1000:8.0f} ms")
+        print(f"  heavy imports:  {', '.join(heavy) if heavy else 'none'}")
+        for name, _, cumulative_us in imports[:args.top]:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+        if returncode != 0:
+            print("  " + log.strip().splitlines()[-1])
+
+        if args.budget is not None and ENTRY_POINTS.get(path, True) and wall > args.budget:
+            over_budget.append(path)
+
+    print("\n" + "=" * 60)
+    for path, wall in summary.items():
+        print(f"  {wall * 1000:8.0f} ms  {path}")
+
+    if over_budget:
+        print(f"\n[WARN] Over the {args.budget:.2f}s budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+scripts/ingest_game_logs.py - Bulk box-score ingestion
+
+Loads league-wide team and player game logs (one season-level API call each)
+into team_game_logs / player_game_logs, so player-aggregate features are
+computed from the local database instead of per-player API calls.
+
+Usage:
+    python scripts/ingest_game_logs.py
+    python scripts/ingest_game_logs.py --seasons 2025-26 2024-25
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_fetcher import NBADataFetcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load NBA box scores into the local database')
+    parser.add_argument('--seasons', nargs='+', default=None,
+                        help='Seasons to ingest, e.g. 2025-26 2024-25 (default: current season)')
+    parser.add_argument('--db', default='data/nba_predictor.db', help='Database path')
+    args = parser.parse_args()
+
+    fetcher = NBADataFetcher(args.db)
+    seasons = args.seasons or [fetcher.season_for_date()]
+
+    print("=" * 60)
+    print("NBA PREDICTOR - BOX SCORE INGESTION")
+    print("=" * 60)
+
+    total_team = 0
+    total_player = 0
+    for season in seasons:
+        counts = fetcher.ingest_season_game_logs(season)
+        total_team += counts['team_rows']
+        total_player += counts['player_rows']
+
+    print("\n" + "=" * 60)
+    print(f"Done: {total_team} team rows, {total_player} player rows")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,9 @@
 Morning Routine Script for NBA Predictor
 =========================================
 This script automates the morning tasks:
-1. Fetch today's predictions (generate predictions for today's games)
-2. Refresh game data from NBA API (get yesterday's scores)
-3. Update prediction results (verify yesterday's predictions)
+1. Refresh game data from NBA API (get yesterday's scores)
+2. Update prediction results (verify yesterday's predictions)
+3. Fetch today's predictions (generate predictions for today's games)
 4. Send email report (today's predictions + yesterday's results)
 
 Usage:
@@ -38,6 +38,9 @@ logger = logging.getLogger(__name__)
 # Database path
 DB_PATH = PROJECT_ROOT / 'data' / 'nba_predictor.db'
 
+from src.pipeline import Step, StepGraph
+from src.telemetry import get_telemetry
+
 
 def refresh_game_data(lookback_days: int = 7) -> bool:
     """
@@ -49,9 +52,10 @@ def refresh_game_data(lookback_days: int = 7) -> bool:
     logger.info("=" * 60)
 
     try:
-        from src.data_fetcher import NBADataFetcher
+        from src.components import get_components
 
-        fetcher = NBADataFetcher(db_path=str(DB_PATH))
+        # Shared with the prediction step (one fetcher per process)
+        fetcher = get_components(str(DB_PATH), str(PROJECT_ROOT / 'models')).data_fetcher
         games_fetched = fetcher.update_recent_games(
             days_back=lookback_days,
             timeout=90
@@ -305,6 +309,32 @@ def send_email_report() -> bool:
         return False
 
 
+def _required(step_func, *args, **kwargs):
+    """Adapt a bool-returning step to the pipeline (False counts as a failure)."""
+    def run():
+        if not step_func(*args, **kwargs):
+            raise RuntimeError(f"{step_func.__name__} reported failure")
+    return run
+
+
+def build_pipeline(args) -> StepGraph:
+    """Morning routine as a step graph (every step is non-critical)."""
+    steps = [
+        Step('refresh_game_data', _required(refresh_game_data, lookback_days=args.lookback),
+             timeout=600, critical=False),
+        Step('update_results', _required(update_prediction_results, lookback_days=args.lookback),
+             after=('refresh_game_data',), critical=False),
+    ]
+    if not args.skip_predictions:
+        # Elo and last-N features read the games table, so wait for the refresh
+        steps.append(Step('predictions', _required(fetch_todays_predictions), critical=False,
+                          after=('refresh_game_data', 'update_results')))
+    if not args.skip_email:
+        steps.append(Step('send_email', _required(send_email_report), timeout=180, critical=False,
+                          after=tuple(step.name for step in steps)))
+    return StepGraph(steps, max_workers=3, logger=logger)
+
+
 def main():
     parser = argparse.ArgumentParser(description='NBA Predictor Morning Routine')
     parser.add_argument('--skip-email', action='store_true', help='Skip sending email')
@@ -320,31 +350,32 @@ def main():
     # Create logs directory if needed
     (PROJECT_ROOT / 'logs').mkdir(exist_ok=True)
 
-    all_success = True
-
-    # CORRECT ORDER: Predictions -> Games -> Results -> Email
-
-    # Step 1: Fetch today's predictions (so they're ready for email)
-    if not args.skip_predictions:
-        if not fetch_todays_predictions():
-            all_success = False
-    else:
+    if args.skip_predictions:
         logger.info("\n[SKIP] Skipping predictions (--skip-predictions)")
+    if args.skip_email:
+        logger.info("\n[SKIP] Skipping email (--skip-email)")
 
-    # Step 2: Refresh game data (get yesterday's scores BEFORE updating results)
-    if not refresh_game_data(lookback_days=args.lookback):
-        all_success = False
+    # Predictions and the game refresh are independent and run side by side;
+    # results wait for fresh games, the email waits for both branches
+    telemetry = get_telemetry()
+    telemetry.start_run('morning')
+    all_success = False
+    result = None
+    try:
+        result = build_pipeline(args).run()
+        all_success = result.success and all(
+            step.status == 'ok' for step in result.steps.values()
+        )
+    except Exception as e:
+        logger.error(f"[ERROR] Morning pipeline failed: {e}", exc_info=True)
+    finally:
+        summary = telemetry.end_run(success=all_success)
 
-    # Step 3: Update prediction results (verify yesterday's predictions with fresh game data)
-    if not update_prediction_results(lookback_days=args.lookback):
-        all_success = False
-
-    # Step 4: Send email (today's predictions + yesterday's results - now updated!)
-    if not args.skip_email:
-        if not send_email_report():
-            all_success = False
-    else:
-        logger.info("\n[SKIP] Skipping email (--skip-email)")
+    if result is not None:
+        logger.info("")
+        logger.info("Step timings:")
+        for line in result.summary_lines():
+            logger.info(line)
 
     # Summary
     logger.info("")
@@ -356,6 +387,18 @@ def main():
     logger.info(f"Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("=" * 60)
 
+    from src.http_client import get_http_client
+    get_http_client().log_host_stats(logger.info)
+
+    sql = summary['sqlite']
+    logger.info(f"Telemetry: {sql['statements']} SQL statements ({sql['execute_seconds']:.2f}s), "
+                f"{summary['inference']['count']} inferences ({summary['inference']['seconds']:.2f}s)")
+    try:
+        json_path, _ = telemetry.write(summary, PROJECT_ROOT / 'logs')
+        logger.info(f"[OK] Telemetry written to {json_path}")
+    except OSError as e:
+        logger.warning(f"[WARN] Could not write telemetry: {e}")
+
     return 0 if all_success else 1
 
 
@@ -24,54 +24,9 @@ from typing import Dict, Optional
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-# Import project modules
-from src.twitter_integration import (
-    create_fresh_twitter_client,
-    create_twitter_thread,
-    format_prediction_tweet
-)
-from src.predictor import NBAPredictor
-from src.data_fetcher import NBADataFetcher
-from daily_auto_prediction import DailyPredictionAutomation
-
-# Full name to tricode mapping (reverse of TRICODE_TO_NAME)
-NAME_TO_TRICODE = {
-    'Atlanta Hawks': 'ATL',
-    'Boston Celtics': 'BOS',
-    'Brooklyn Nets': 'BKN',
-    'Charlotte Hornets': 'CHA',
-    'Chicago Bulls': 'CHI',
-    'Cleveland Cavaliers': 'CLE',
-    'Dallas Mavericks': 'DAL',
-    'Denver Nuggets': 'DEN',
-    'Detroit Pistons': 'DET',
-    'Golden State Warriors': 'GSW',
-    'Houston Rockets': 'HOU',
-    'Indiana Pacers': 'IND',
-    'LA Clippers': 'LAC',
-    'Los Angeles Lakers': 'LAL',
-    'Memphis Grizzlies': 'MEM',
-    'Miami Heat': 'MIA',
-    'Milwaukee Bucks': 'MIL',
-    'Minnesota Timberwolves': 'MIN',
-    'New Orleans Pelicans': 'NOP',
-    'New York Knicks': 'NYK',
-    'Oklahoma City Thunder': 'OKC',
-    'Orlando Magic': 'ORL',
-    'Philadelphia 76ers': 'PHI',
-    'Phoenix Suns': 'PHX',
-    'Portland Trail Blazers': 'POR',
-    'Sacramento Kings': 'SAC',
-    'San Antonio Spurs': 'SAS',
-    'Toronto Raptors': 'TOR',
-    'Utah Jazz': 'UTA',
-    'Washington Wizards': 'WAS',
-}
-
-
-def to_tricode(team: str) -> str:
-    """Convert full team name to tricode, or return as-is if already tricode."""
-    return NAME_TO_TRICODE.get(team, team)
+# Import project modules (tweepy, plotly and the prediction stack are
+# imported once a thread is actually being formatted/posted)
+from src.team_identity import resolve_team_id, to_tricode
 
 # Setup logging
 logging.basicConfig(
@@ -105,77 +60,41 @@ def get_prediction_from_db(home_team: str, away_team: str, game_date: str) -> Op
         conn = sqlite3.connect('data/nba_predictor.db')
         cursor = conn.cursor()
 
-        # Try both full names (Streamlit format) and tricodes (legacy format)
-        # First try with full names as-is
-        home_team_db = home_team
-        away_team_db = away_team
-        logger.info(f"DEBUG - DB lookup (full names): home='{home_team_db}', away='{away_team_db}'")
-
         # First check which columns exist in the table
         cursor.execute("PRAGMA table_info(predictions)")
         columns = {row[1] for row in cursor.fetchall()}
         # Check for features_json column (the actual column name in the database)
         has_features = 'features_json' in columns
 
-        # Build query based on available columns
-        if has_features:
-            cursor.execute("""
-                SELECT
-                    game_date,
-                    home_team,
-                    away_team,
-                    predicted_winner,
-                    predicted_home_prob,
-                    predicted_away_prob,
-                    confidence,
-                    home_odds,
-                    away_odds,
-                    features_json
+        select_columns = """
+            game_date, home_team, away_team, predicted_winner,
+            predicted_home_prob, predicted_away_prob, confidence,
+            home_odds, away_odds""" + (", features_json" if has_features else "")
+
+        row = None
+
+        # Direct index hit on (game_date, home_team_id, away_team_id)
+        home_team_id = resolve_team_id(home_team)
+        away_team_id = resolve_team_id(away_team)
+        if 'home_team_id' in columns and home_team_id is not None and away_team_id is not None:
+            cursor.execute(f"""
+                SELECT {select_columns}
                 FROM predictions
-                WHERE home_team = ? AND away_team = ? AND game_date = ?
-            """, (home_team_db, away_team_db, game_date))
-        else:
-            cursor.execute("""
-                SELECT
-                    game_date,
-                    home_team,
-                    away_team,
-                    predicted_winner,
-                    predicted_home_prob,
-                    predicted_away_prob,
-                    confidence,
-                    home_odds,
-                    away_odds
+                WHERE game_date = ? AND home_team_id = ? AND away_team_id = ?
+            """, (game_date, home_team_id, away_team_id))
+            row = cursor.fetchone()
+
+        # Rows not yet migrated: full names (Streamlit format), then tricodes (legacy format)
+        for home_team_db, away_team_db in ((home_team, away_team),
+                                           (to_tricode(home_team), to_tricode(away_team))):
+            if row:
+                break
+            logger.info(f"DEBUG - DB lookup by name: home='{home_team_db}', away='{away_team_db}'")
+            cursor.execute(f"""
+                SELECT {select_columns}
                 FROM predictions
                 WHERE home_team = ? AND away_team = ? AND game_date = ?
             """, (home_team_db, away_team_db, game_date))
-
-        row = cursor.fetchone()
-
-        # If not found with full names, try with tricodes
-        if not row:
-            home_team_db = to_tricode(home_team)
-            away_team_db = to_tricode(away_team)
-            logger.info(f"DEBUG - Retrying with tricodes: home='{home_team_db}', away='{away_team_db}'")
-
-            if has_features:
-                cursor.execute("""
-                    SELECT
-                        game_date, home_team, away_team, predicted_winner,
-                        predicted_home_prob, predicted_away_prob, confidence,
-                        home_odds, away_odds, features_json
-                    FROM predictions
-                    WHERE home_team = ? AND away_team = ? AND game_date = ?
-                """, (home_team_db, away_team_db, game_date))
-            else:
-                cursor.execute("""
-                    SELECT
-                        game_date, home_team, away_team, predicted_winner,
-                        predicted_home_prob, predicted_away_prob, confidence,
-                        home_odds, away_odds
-                    FROM predictions
-                    WHERE home_team = ? AND away_team = ? AND game_date = ?
-                """, (home_team_db, away_team_db, game_date))
             row = cursor.fetchone()
 
         conn.close()
@@ -231,6 +150,8 @@ def format_thread_tweets_full(prediction: Dict) -> tuple:
         Tuple of (texts, image_paths) for the thread
     """
     try:
+        from daily_auto_prediction import DailyPredictionAutomation
+
         # Create a temporary DailyPredictionAutomation instance to use its format_twitter_thread method
         temp_daily = DailyPredictionAutomation(
             db_path="data/nba_predictor.db",
@@ -370,6 +291,7 @@ def publish_thread(game_id: str) -> bool:
         # Expected lengths: API_KEY=25, API_SECRET=50, ACCESS_TOKEN=50, ACCESS_SECRET=45
         logger.info(f"   Expected lengths: API_KEY=25, API_SECRET=50, ACCESS_TOKEN=50, ACCESS_SECRET=45")
 
+        from src.twitter_integration import create_fresh_twitter_client, create_twitter_thread
         twitter_clients = create_fresh_twitter_client()
 
         # Post thread
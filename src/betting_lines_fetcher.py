@@ -8,17 +8,22 @@ from datetime import datetime
 import sqlite3
 from pathlib import Path
 from src.odds_api_client import OddsAPIClient
+from src.odds_key_manager import OddsKeyManager
+from src.odds_snapshot import OddsSnapshotService
 
 
 class BettingLinesFetcher:
     """
     Fetches betting lines (spreads, totals, moneylines) for use as features.
-    Uses The Odds API for live data.
+    Uses The Odds API for live data, via a slate-level odds snapshot
+    (one board download per refresh interval, shared by all games).
     """
     
     def __init__(self, db_path: str = "data/nba_predictor.db"):
         self.db_path = Path(db_path)
         self.odds_client = OddsAPIClient()
+        self.odds_snapshot = OddsSnapshotService(db_path, self.odds_client,
+                                                 key_manager=OddsKeyManager())
         self._init_betting_lines_table()
     
     def _init_betting_lines_table(self):
@@ -74,7 +79,7 @@ class BettingLinesFetcher:
         
         # Try to fetch live odds
         try:
-            odds_data = self.odds_client.find_game_odds(home_team, away_team)
+            odds_data = self.odds_snapshot.find_game_odds(home_team, away_team, game_date)
             
             if odds_data and odds_data.get('bookmakers'):
                 lines = self._parse_odds_to_lines(odds_data)
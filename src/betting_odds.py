@@ -1,8 +1,17 @@
 """
 Betting Odds Calculator
 Calculates proper betting odds from probabilities
+
+The *_array functions and analyze_slate work on NumPy arrays: a vector of
+model probabilities (one per game) against odds matrices of shape
+(games, bookmakers). Missing prices are NaN and propagate as NaN.
 """
 
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
 def calculate_betting_odds(probability: float, margin: float = 0.05) -> dict:
     """
     Calculate betting odds from win probability.
@@ -99,3 +108,225 @@ def compare_with_market(our_probability: float, market_decimal_odds: float) -> d
         'has_value': has_value,
         'recommendation': 'BET' if has_value else 'PASS'
     }
+
+
+# ----------------------------------------------------------------------
+# Array versions (whole slates, every bookmaker)
+# ----------------------------------------------------------------------
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def implied_probabilities(decimal_odds) -> np.ndarray:
+    """Raw implied probabilities 1/odds (vig included); NaN where odds <= 1."""
+    odds = _as_float_array(decimal_odds)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(odds > 1.0, 1.0 / odds, np.nan)
+
+
+def remove_vig(home_odds, away_odds):
+    """
+    Vig-free probabilities for two-way markets (proportional method).
+
+    Args:
+        home_odds: Decimal home odds, any shape (e.g., games x bookmakers)
+        away_odds: Decimal away odds, same shape
+
+    Returns:
+        (home_prob, away_prob, overround) arrays of the input shape
+    """
+    home_implied = implied_probabilities(home_odds)
+    away_implied = implied_probabilities(away_odds)
+    total = home_implied + away_implied
+    return home_implied / total, away_implied / total, total - 1.0
+
+
+def get_fair_odds_array(probabilities) -> np.ndarray:
+    """Fair decimal odds per probability (99.0 outside (0, 1), like get_fair_odds)."""
+    probs = _as_float_array(probabilities)
+    valid = (probs > 0) & (probs < 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(valid, np.round(1.0 / probs, 2), 99.0)
+
+
+def expected_value(probabilities, decimal_odds) -> np.ndarray:
+    """EV per unit staked: p * odds - 1 (broadcasts probabilities over bookmakers)."""
+    probs = _as_float_array(probabilities)
+    odds = _as_float_array(decimal_odds)
+    if probs.ndim == 1 and odds.ndim == 2:
+        probs = probs[:, None]
+    return probs * odds - 1.0
+
+
+def kelly_fraction(probabilities, decimal_odds, fraction: float = 1.0) -> np.ndarray:
+    """
+    Kelly stake as a fraction of bankroll, floored at 0 (no bet).
+
+    Args:
+        probabilities: Win probabilities (per game)
+        decimal_odds: Decimal odds (per game, or games x bookmakers)
+        fraction: Kelly multiplier (e.g., 0.25 for quarter Kelly)
+    """
+    probs = _as_float_array(probabilities)
+    odds = _as_float_array(decimal_odds)
+    if probs.ndim == 1 and odds.ndim == 2:
+        probs = probs[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kelly = (probs * odds - 1.0) / (odds - 1.0)
+    return np.where(np.isnan(kelly), np.nan, np.clip(kelly, 0.0, None) * fraction)
+
+
+def calculate_betting_odds_array(probabilities, margin: float = 0.05) -> Dict[str, np.ndarray]:
+    """
+    Array version of calculate_betting_odds (numeric formats only).
+
+    Returns:
+        dict with 'decimal' and 'implied_probability' (percent) arrays
+    """
+    probs = _as_float_array(probabilities)
+    valid = (probs > 0) & (probs < 1)
+    implied = np.minimum(probs * (1 + margin), 0.95)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decimal = np.where(valid, np.round(1.0 / implied, 2), 99.0)
+    return {
+        'decimal': decimal,
+        'implied_probability': np.where(valid, np.round(implied * 100, 1), np.nan)
+    }
+
+
+def analyze_slate(model_home_probs, home_odds, away_odds,
+                  min_edge: float = 0.03, kelly_multiplier: float = 1.0) -> Dict[str, np.ndarray]:
+    """
+    Value scan of a whole slate against every bookmaker in one pass.
+
+    Args:
+        model_home_probs: Model home win probability per game, shape (games,)
+        home_odds: Decimal home odds, shape (games, bookmakers); NaN = no price
+        away_odds: Decimal away odds, shape (games, bookmakers)
+        min_edge: EV per unit staked required to flag a value bet
+        kelly_multiplier: Kelly multiplier for the stake fractions
+
+    Returns:
+        dict of arrays:
+            market_home_prob / market_away_prob (games x bookmakers, vig removed)
+            consensus_home_prob (games,), mean vig-free market probability
+            overround (games x bookmakers)
+            fair_home_odds / fair_away_odds (games,), from the model
+            home_ev / away_ev, home_kelly / away_kelly (games x bookmakers)
+            best_home_book / best_away_book (games,), index of the best price (-1 if none)
+            value_home / value_away (games x bookmakers), EV >= min_edge
+    """
+    home_probs = _as_float_array(model_home_probs)
+    away_probs = 1.0 - home_probs
+    home_odds = np.atleast_2d(_as_float_array(home_odds))
+    away_odds = np.atleast_2d(_as_float_array(away_odds))
+
+    market_home, market_away, overround = remove_vig(home_odds, away_odds)
+    home_ev = expected_value(home_probs, home_odds)
+    away_ev = expected_value(away_probs, away_odds)
+
+    with np.errstate(invalid='ignore'):
+        value_home = home_ev >= min_edge
+        value_away = away_ev >= min_edge
+
+    priced = (~np.isnan(market_home)).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        consensus = np.where(priced > 0, np.nansum(market_home, axis=1) / priced, np.nan)
+
+    return {
+        'market_home_prob': market_home,
+        'market_away_prob': market_away,
+        'consensus_home_prob': consensus,
+        'overround': overround,
+        'fair_home_odds': get_fair_odds_array(home_probs),
+        'fair_away_odds': get_fair_odds_array(away_probs),
+        'home_ev': home_ev,
+        'away_ev': away_ev,
+        'home_kelly': kelly_fraction(home_probs, home_odds, kelly_multiplier),
+        'away_kelly': kelly_fraction(away_probs, away_odds, kelly_multiplier),
+        'best_home_book': _best_index(home_odds),
+        'best_away_book': _best_index(away_odds),
+        'value_home': value_home,
+        'value_away': value_away,
+    }
+
+
+def _best_index(odds: np.ndarray) -> np.ndarray:
+    """Column of the highest price per row, -1 for rows without prices."""
+    if odds.shape[1] == 0:
+        return np.full(odds.shape[0], -1)
+    filled = np.where(np.isnan(odds), -np.inf, odds)
+    best = filled.argmax(axis=1)
+    return np.where(np.isfinite(filled.max(axis=1)), best, -1)
+
+
+def odds_matrix(games: Sequence[Dict], bookmakers: Sequence[str] = None):
+    """
+    Stack per-game bookmaker odds into (games x bookmakers) matrices.
+
+    Args:
+        games: One {'bookmakers': {name: {'home': odds, 'away': odds}}} per game
+        bookmakers: Column order (default: every bookmaker seen, sorted)
+
+    Returns:
+        (bookmaker_names, home_odds, away_odds), missing prices as NaN
+    """
+    if bookmakers is None:
+        bookmakers = sorted({name for game in games for name in (game.get('bookmakers') or {})})
+    bookmakers = list(bookmakers)
+    columns = {name: j for j, name in enumerate(bookmakers)}
+
+    home = np.full((len(games), len(bookmakers)), np.nan)
+    away = np.full((len(games), len(bookmakers)), np.nan)
+    for i, game in enumerate(games):
+        for name, prices in (game.get('bookmakers') or {}).items():
+            j = columns.get(name)
+            if j is None or not prices:
+                continue
+            home[i, j] = prices.get('home') or np.nan
+            away[i, j] = prices.get('away') or np.nan
+    return bookmakers, home, away
+
+
+def compare_bookmakers(model_home_prob: float, bookmakers: Dict[str, Dict],
+                       kelly_multiplier: float = 1.0) -> List[Dict]:
+    """
+    Per-bookmaker EV and Kelly for one game (see create_ev_comparison_chart).
+
+    Args:
+        model_home_prob: Model home win probability
+        bookmakers: {name: {'home': odds, 'away': odds}}
+
+    Returns:
+        One dict per bookmaker with 'home_odds' / 'away_odds' analyses
+    """
+    names, home, away = odds_matrix([{'bookmakers': bookmakers}])
+    if not names:
+        return []
+    slate = analyze_slate([model_home_prob], home, away, kelly_multiplier=kelly_multiplier)
+
+    comparisons = []
+    for j, name in enumerate(names):
+        if np.isnan(home[0, j]) or np.isnan(away[0, j]):
+            continue
+        comparisons.append({
+            'bookmaker': name,
+            'margin': round(float(slate['overround'][0, j]) * 100, 1),
+            'home_odds': _side_summary(home[0, j], slate['market_home_prob'][0, j],
+                                       slate['home_ev'][0, j], slate['home_kelly'][0, j]),
+            'away_odds': _side_summary(away[0, j], slate['market_away_prob'][0, j],
+                                       slate['away_ev'][0, j], slate['away_kelly'][0, j]),
+        })
+    return comparisons
+
+
+def _side_summary(odds, market_prob, ev, kelly) -> Dict:
+    return {
+        'odds': round(float(odds), 2),
+        'market_probability': round(float(market_prob) * 100, 1),
+        'expected_value': {
+            'ev': round(float(ev), 4),
+            'ev_percentage': round(float(ev) * 100, 1),
+        },
+        'kelly_fraction': round(float(kelly), 4),
+    }
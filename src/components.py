@@ -0,0 +1,146 @@
+"""
+Component Registry
+Process-wide, lazily built, shared instances of the heavy components
+
+NBADataFetcher, EloRatingSystem, FeatureEngineer, InjuryTracker,
+BettingLinesFetcher and NBAPredictor each run schema DDL and load state in
+their constructors. The registry builds each of them once per database,
+on first use and under a lock, and wires the shared instances into each
+other (the predictor's feature engineer uses the registry's Elo system,
+injury tracker, odds fetcher and data fetcher).
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from src.player_cache import PlayerStatsCache
+from src.data_fetcher import NBADataFetcher, EloRatingSystem, FeatureEngineer
+
+
+class Components:
+    """
+    Shared components for one database and model directory.
+
+    Features:
+    - Lazy: nothing is constructed until first accessed
+    - Thread-safe: concurrent first accesses build a component once
+    - Dependency wiring between the shared instances
+    - Per-thread ModelFeedbackSystem (it holds a SQLite connection)
+    - Build timings (build_seconds) for diagnostics
+    """
+
+    def __init__(self, db_path: str = "data/nba_predictor.db", model_dir: str = "models"):
+        self.db_path = str(db_path)
+        self.model_dir = str(model_dir)
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self._thread_local = threading.local()
+        self.build_seconds: Dict[str, float] = {}
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._registry_lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        # One lock per component: building the predictor may build the
+        # fetcher and engineer first without deadlocking
+        with lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                start = time.perf_counter()
+                instance = factory()
+                self.build_seconds[name] = time.perf_counter() - start
+                self._instances[name] = instance
+        return instance
+
+    # ------------------------------------------------------------------
+    # Components
+    # ------------------------------------------------------------------
+    @property
+    def player_cache(self) -> PlayerStatsCache:
+        return self._get('player_cache', PlayerStatsCache)
+
+    @property
+    def data_fetcher(self) -> NBADataFetcher:
+        return self._get('data_fetcher', lambda: NBADataFetcher(
+            self.db_path, player_cache=self.player_cache
+        ))
+
+    @property
+    def elo_system(self) -> EloRatingSystem:
+        return self._get('elo_system', lambda: EloRatingSystem(self.db_path))
+
+    @property
+    def injury_tracker(self):
+        from src.injury_tracker import InjuryTracker
+        return self._get('injury_tracker', lambda: InjuryTracker(self.db_path))
+
+    @property
+    def betting_lines_fetcher(self):
+        from src.betting_lines_fetcher import BettingLinesFetcher
+        return self._get('betting_lines_fetcher', lambda: BettingLinesFetcher(self.db_path))
+
+    def _build_feature_engineer(self) -> FeatureEngineer:
+        try:
+            injury_tracker, betting_lines_fetcher = self.injury_tracker, self.betting_lines_fetcher
+        except ImportError:
+            # FeatureEngineer hits the same ImportError and disables enhanced features
+            injury_tracker = betting_lines_fetcher = None
+        return FeatureEngineer(
+            self.db_path,
+            elo_system=self.elo_system,
+            injury_tracker=injury_tracker,
+            betting_lines_fetcher=betting_lines_fetcher,
+            data_fetcher=self.data_fetcher
+        )
+
+    @property
+    def feature_engineer(self) -> FeatureEngineer:
+        return self._get('feature_engineer', self._build_feature_engineer)
+
+    @property
+    def predictor(self):
+        """NBAPredictor wired to the shared fetcher and engineer (model not loaded)."""
+        from src.predictor import NBAPredictor
+        return self._get('predictor', lambda: NBAPredictor(
+            self.db_path, self.model_dir,
+            data_fetcher=self.data_fetcher,
+            feature_engineer=self.feature_engineer
+        ))
+
+    @property
+    def feedback_system(self):
+        """ModelFeedbackSystem for the calling thread (SQLite connections are per thread)."""
+        feedback = getattr(self._thread_local, 'feedback_system', None)
+        if feedback is None:
+            from src.model_feedback_system import ModelFeedbackSystem
+            start = time.perf_counter()
+            feedback = ModelFeedbackSystem(self.db_path)
+            self.build_seconds['feedback_system'] = time.perf_counter() - start
+            self._thread_local.feedback_system = feedback
+        return feedback
+
+    def built(self) -> Dict[str, float]:
+        """Components constructed so far and their build time in seconds."""
+        return dict(self.build_seconds)
+
+
+_registries: Dict[Tuple[str, str], Components] = {}
+_registries_lock = threading.Lock()
+
+
+def get_components(db_path: str = "data/nba_predictor.db", model_dir: str = "models") -> Components:
+    """Get the process-wide component registry for a database and model directory."""
+    key = (str(Path(db_path).resolve()), str(Path(model_dir).resolve()))
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None:
+                registry = Components(db_path, model_dir)
+                _registries[key] = registry
+    return registry
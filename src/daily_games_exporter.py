@@ -63,6 +63,15 @@ class DailyGamesExporter:
             return TRICODE_TO_NAME[team]
         return team  # Already a full name
 
+    def _display_name(self, team_id: Optional[int], team: str) -> str:
+        """Full team name from the stored team ID (falls back to the stored name)."""
+        if team_id is not None:
+            from src.team_identity import team_tricode  # local import: nba_api static data
+            name = TRICODE_TO_NAME.get(team_tricode(team_id))
+            if name:
+                return name
+        return self._to_full_name(team)
+
     def get_today_predictions(self, date: Optional[str] = None) -> List[Dict]:
         """
         Get today's predictions from database.
@@ -89,7 +98,10 @@ class DailyGamesExporter:
                 predicted_away_prob,
                 confidence,
                 home_odds,
-                away_odds
+                away_odds,
+                home_team_id,
+                away_team_id,
+                game_id
             FROM predictions
             WHERE game_date = ? AND actual_winner IS NULL
             ORDER BY confidence DESC, home_team, away_team
@@ -97,7 +109,8 @@ class DailyGamesExporter:
 
         predictions = []
         for row in cursor.fetchall():
-            game_date, home_team, away_team, predicted_winner, pred_home_prob, pred_away_prob, confidence, home_odds, away_odds = row
+            game_date, home_team, away_team, predicted_winner, pred_home_prob, pred_away_prob, confidence, \
+                home_odds, away_odds, home_team_id, away_team_id, game_id = row
 
             # Use stored odds if available, otherwise calculate from probabilities
             if home_odds is None:
@@ -114,7 +127,10 @@ class DailyGamesExporter:
                 'predicted_away_prob': pred_away_prob,
                 'home_odds': home_odds,
                 'away_odds': away_odds,
-                'confidence': confidence
+                'confidence': confidence,
+                'home_team_id': home_team_id,
+                'away_team_id': away_team_id,
+                'game_id': game_id
             })
 
         conn.close()
@@ -124,9 +140,15 @@ class DailyGamesExporter:
         """Format raw prediction dicts into web-interface-ready dicts."""
         games_data = []
         for pred in predictions:
-            home_team = self._to_full_name(pred['home_team'])
-            away_team = self._to_full_name(pred['away_team'])
-            predicted_winner = self._to_full_name(pred['predicted_winner'])
+            home_team = self._display_name(pred.get('home_team_id'), pred['home_team'])
+            away_team = self._display_name(pred.get('away_team_id'), pred['away_team'])
+            # The winner is stored with the same spelling as one of the two sides
+            if pred['predicted_winner'] == pred['home_team']:
+                predicted_winner = home_team
+            elif pred['predicted_winner'] == pred['away_team']:
+                predicted_winner = away_team
+            else:
+                predicted_winner = self._to_full_name(pred['predicted_winner'])
             game_date = pred.get('game_date', date)
 
             game_id = f"{away_team}_vs_{home_team}_{game_date}".replace(' ', '_')
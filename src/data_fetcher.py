@@ -10,26 +10,20 @@ import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 import sqlite3
-import requests
+import threading
 from typing import Optional, List, Dict, Tuple
 
 # Rate limiting for NBA API
-from nba_api.stats.endpoints import (
-    leaguegamefinder,
-    teamgamelogs,
-    playergamelogs,
-    scoreboardv2,
-    commonteamroster,
-    teamdashboardbygeneralsplits,
-    leaguestandings,
-    commonplayerinfo,
-    playerdashboardbygeneralsplits,
-    leaguedashplayerstats
-)
 from nba_api.stats.static import teams, players
+# nba_api.stats.endpoints imports every endpoint module (slow): the methods
+# that call the stats API import their endpoints locally
 
 # Import player cache system
 from src.player_cache import PlayerStatsCache
+from src.http_client import http_get
+from src.team_identity import TEAMS_BY_ID, team_full_name
+from src.prediction_schema import migrate_predictions_table
+from src.telemetry import get_telemetry
 
 
 class NBADataFetcher:
@@ -39,15 +33,18 @@ class NBADataFetcher:
     """
     
     # Team ID mapping
-    TEAMS = {t['abbreviation']: t['id'] for t in teams.get_teams()}
-    TEAM_NAMES = {t['id']: t['full_name'] for t in teams.get_teams()}
+    TEAMS = {t['abbreviation']: team_id for team_id, t in TEAMS_BY_ID.items()}
+    TEAM_NAMES = {team_id: t['full_name'] for team_id, t in TEAMS_BY_ID.items()}
     
-    def __init__(self, db_path: str = "data/nba_predictor.db"):
+    def __init__(self, db_path: str = "data/nba_predictor.db",
+                 player_cache: Optional[PlayerStatsCache] = None):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
-        # Initialize player stats cache
-        self.player_cache = PlayerStatsCache()
+        # Initialize player stats cache (shared instance when injected)
+        self.player_cache = player_cache or PlayerStatsCache()
+        # Seasons whose player log age has been reported
+        self._log_age_reported = set()
         
     def _init_database(self):
         """Initialize SQLite database with proper schema."""
@@ -207,9 +204,49 @@ class NBADataFetcher:
             CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_game 
             ON predictions(game_date, home_team, away_team)
         """)
+
+        # Box-score lookups by team / player over a date range
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_team_game_logs_team_date
+            ON team_game_logs(team_id, game_date)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_player_game_logs_player_date
+            ON player_game_logs(player_id, game_date)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_player_game_logs_team_date
+            ON player_game_logs(team_id, game_date)
+        """)
+
+        # Result reconciliation joins predictions to games on these keys
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_games_date_teams
+            ON games(game_date, home_team_id, away_team_id)
+        """)
+
+        # Team IDs / game_id / model_version on predictions
+        migrate_predictions_table(conn)
         
         conn.commit()
         conn.close()
+
+    @staticmethod
+    def season_for_date(date_str: str = None) -> str:
+        """
+        NBA season string for a date (season starts in October).
+
+        Example: '2026-01-05' -> '2025-26', '2025-10-22' -> '2025-26'
+        """
+        date_obj = datetime.strptime(date_str[:10], '%Y-%m-%d') if date_str else datetime.now()
+        start_year = date_obj.year if date_obj.month >= 10 else date_obj.year - 1
+        return f"{start_year}-{str(start_year + 1)[2:]}"
+
+    @staticmethod
+    def _season_date_range(season: str) -> Tuple[str, str]:
+        """First and last calendar dates covered by a season string like '2025-26'."""
+        start_year = int(season[:4])
+        return f"{start_year}-09-01", f"{start_year + 1}-08-31"
         
     def _api_call_with_retry(self, func, max_retries=3, delay=0.5, timeout=15):
         """
@@ -256,6 +293,7 @@ class NBADataFetcher:
         Args:
             seasons: List of seasons like ['2023-24', '2022-23']
         """
+        from nba_api.stats.endpoints import leaguegamefinder
         if seasons is None:
             seasons = ['2024-25', '2023-24', '2022-23', '2021-22', '2020-21']
             
@@ -405,6 +443,7 @@ class NBADataFetcher:
         Returns:
             DataFrame with games for the specified date
         """
+        from nba_api.stats.endpoints import scoreboardv2
         try:
             # Convert YYYY-MM-DD to datetime
             date_obj = datetime.strptime(date_str, '%Y-%m-%d')
@@ -419,7 +458,7 @@ class NBADataFetcher:
             target_date_formatted = date_str_api + " 00:00:00"
             try:
                 url = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
-                resp = requests.get(url, timeout=15)
+                resp = http_get(url, timeout=15)
                 resp.raise_for_status()
                 data = resp.json()
                 static_games = []
@@ -631,6 +670,7 @@ class NBADataFetcher:
 
     def get_team_roster(self, team_id: int, season: str = "2024-25") -> pd.DataFrame:
         """Get current roster for a team. Returns empty DataFrame if API fails."""
+        from nba_api.stats.endpoints import commonteamroster
         try:
             roster = self._api_call_with_retry(
                 lambda: commonteamroster.CommonTeamRoster(
@@ -652,6 +692,7 @@ class NBADataFetcher:
         Get a player's recent performance stats.
         Returns empty dict if API fails (graceful degradation).
         """
+        from nba_api.stats.endpoints import playerdashboardbygeneralsplits, playergamelogs
         try:
             player_stats = self._api_call_with_retry(
                 lambda: playerdashboardbygeneralsplits.PlayerDashboardByGeneralSplits(
@@ -707,6 +748,7 @@ class NBADataFetcher:
         Returns a dictionary mapping player_id -> stats dict.
         Returns empty dict if API fails (graceful degradation).
         """
+        from nba_api.stats.endpoints import leaguedashplayerstats
         try:
             # Check cache first (global league stats cache)
             # We use a special key for the whole league
@@ -737,23 +779,23 @@ class NBADataFetcher:
                 return {}
             
             player_stats_map = {}
-            for _, row in df.iterrows():
-                pid = row['PLAYER_ID']
+            cache_entries = []
+            for row in df.itertuples(index=False):
+                pid = int(row.PLAYER_ID)
                 stats = {
-                    'ppg': row['PTS'],
-                    'rpg': row['REB'],
-                    'apg': row['AST'],
-                    'fg_pct': row['FG_PCT'],
-                    'games_played': row['GP'],
-                    'minutes': row['MIN']
+                    'ppg': float(row.PTS),
+                    'rpg': float(row.REB),
+                    'apg': float(row.AST),
+                    'fg_pct': float(row.FG_PCT),
+                    'games_played': int(row.GP),
+                    'minutes': float(row.MIN)
                 }
                 player_stats_map[pid] = stats
-                
-                # Update individual player cache too!
-                # This populates the cache for any subsequent individual lookups
-                self.player_cache.set_player_stats(
-                    pid, row['PLAYER_NAME'], row['TEAM_ID'], stats, ttl_hours=24
-                )
+                cache_entries.append((pid, row.PLAYER_NAME, row.TEAM_ID, stats))
+
+            # Update individual player cache too (one transaction for the whole league)
+            # This populates the cache for any subsequent individual lookups
+            self.player_cache.set_many_player_stats(cache_entries, ttl_hours=24)
                 
             return player_stats_map
             
@@ -761,6 +803,204 @@ class NBADataFetcher:
             print(f"Error fetching league stats: {e}")
             return {}
 
+    def ingest_season_game_logs(self, season: str = None) -> Dict[str, int]:
+        """
+        Bulk-load league-wide team and player box scores for a season.
+
+        Uses one TeamGameLogs and one PlayerGameLogs season-level call
+        (instead of per-player dashboards) and writes the rows with
+        executemany in a single transaction per table.
+
+        Args:
+            season: Season like '2025-26' (default: current season)
+
+        Returns:
+            {'team_rows': int, 'player_rows': int}
+        """
+        from nba_api.stats.endpoints import teamgamelogs, playergamelogs
+        season = season or self.season_for_date()
+        counts = {'team_rows': 0, 'player_rows': 0}
+
+        print(f"Ingesting league game logs for {season}...")
+
+        team_logs = self._api_call_with_retry(
+            lambda: teamgamelogs.TeamGameLogs(season_nullable=season),
+            timeout=60,
+            max_retries=2
+        )
+        if team_logs is not None:
+            counts['team_rows'] = self._save_team_game_logs(team_logs.get_data_frames()[0])
+
+        player_logs = self._api_call_with_retry(
+            lambda: playergamelogs.PlayerGameLogs(season_nullable=season),
+            timeout=90,
+            max_retries=2
+        )
+        if player_logs is not None:
+            counts['player_rows'] = self._save_player_game_logs(player_logs.get_data_frames()[0])
+
+        print(f"  Saved {counts['team_rows']} team rows, {counts['player_rows']} player rows")
+        return counts
+
+    @staticmethod
+    def _log_rows(df: pd.DataFrame, columns: List[str]) -> List[tuple]:
+        """Select API columns (missing ones as NULL) and convert NaN to None."""
+        frame = df.reindex(columns=columns)
+        frame['GAME_DATE'] = pd.to_datetime(frame['GAME_DATE']).dt.strftime('%Y-%m-%d')
+        frame = frame.astype(object).where(pd.notna(frame), None)
+        return list(frame.itertuples(index=False, name=None))
+
+    def _save_team_game_logs(self, df: pd.DataFrame) -> int:
+        """Write a TeamGameLogs frame into team_game_logs."""
+        if df is None or df.empty:
+            return 0
+
+        df = df.copy()
+        df['IS_HOME'] = df['MATCHUP'].str.contains(' vs. ').astype(int)
+        df['WIN'] = (df['WL'] == 'W').astype(int)
+
+        rows = self._log_rows(df, [
+            'GAME_ID', 'TEAM_ID', 'GAME_DATE', 'IS_HOME', 'WIN', 'PTS',
+            'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+            'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PLUS_MINUS'
+        ])
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO team_game_logs
+                (game_id, team_id, game_date, is_home, win, points,
+                 fgm, fga, fg_pct, fg3m, fg3a, fg3_pct, ftm, fta, ft_pct,
+                 oreb, dreb, reb, ast, stl, blk, tov, pf, plus_minus)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        conn.close()
+        return len(rows)
+
+    def _save_player_game_logs(self, df: pd.DataFrame) -> int:
+        """Write a PlayerGameLogs frame into player_game_logs."""
+        if df is None or df.empty:
+            return 0
+
+        rows = self._log_rows(df, [
+            'GAME_ID', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'GAME_DATE', 'MIN',
+            'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FG_PCT', 'FG3_PCT', 'FT_PCT', 'PLUS_MINUS'
+        ])
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO player_game_logs
+                (game_id, player_id, player_name, team_id, game_date, minutes,
+                 points, rebounds, assists, steals, blocks, turnovers,
+                 fg_pct, fg3_pct, ft_pct, plus_minus)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        conn.close()
+        return len(rows)
+
+    # Without a roster, players count for a team only if they played within
+    # this many days of the newest log (drops waived and departed players)
+    ACTIVE_PLAYER_DAYS = 21
+
+    def get_team_player_stats_from_logs(self, team_id: int, season: str,
+                                        before_date: str = None,
+                                        roster_ids: Optional[List[int]] = None) -> Dict:
+        """
+        Player-aggregate team features computed from local player_game_logs.
+
+        With roster_ids, the players are exactly the current roster (as in
+        the roster-based path), averaged over all their games this season.
+        Without one, a player counts for the team whose jersey he wore in his
+        most recent game (handles trades), provided that game is within
+        ACTIVE_PLAYER_DAYS of the newest log. Returns the same keys as
+        get_team_player_aggregated_stats, or {} if no logs are loaded.
+
+        Args:
+            team_id: NBA team ID
+            season: Season like '2025-26'
+            before_date: Only use games strictly before this date (for backfills)
+            roster_ids: Current roster player IDs, if known
+        """
+        season_start, season_end = self._season_date_range(season)
+        if before_date:
+            season_end = min(season_end, before_date)
+            end_op = '<'
+        else:
+            end_op = '<='
+
+        conn = sqlite3.connect(self.db_path)
+        newest = conn.execute(f"""
+            SELECT MAX(game_date) FROM player_game_logs
+            WHERE game_date >= ? AND game_date {end_op} ?
+        """, (season_start, season_end)).fetchone()[0]
+        if not newest:
+            conn.close()
+            return {}
+
+        if roster_ids:
+            player_ids = [int(pid) for pid in roster_ids]
+            rows = conn.execute(f"""
+                SELECT AVG(points), AVG(rebounds), AVG(assists), AVG(fg_pct)
+                FROM player_game_logs
+                WHERE game_date >= ? AND game_date {end_op} ?
+                  AND player_id IN ({','.join('?' * len(player_ids))})
+                GROUP BY player_id
+            """, (season_start, season_end, *player_ids)).fetchall()
+        else:
+            active_since = (datetime.strptime(newest[:10], '%Y-%m-%d')
+                            - timedelta(days=self.ACTIVE_PLAYER_DAYS)).strftime('%Y-%m-%d')
+            rows = conn.execute(f"""
+                WITH season_logs AS (
+                    SELECT * FROM player_game_logs
+                    WHERE game_date >= ? AND game_date {end_op} ?
+                ),
+                latest_team AS (
+                    SELECT player_id, team_id, MAX(game_date) AS last_game
+                    FROM season_logs
+                    GROUP BY player_id
+                )
+                SELECT AVG(s.points), AVG(s.rebounds), AVG(s.assists), AVG(s.fg_pct)
+                FROM season_logs s
+                JOIN latest_team l ON l.player_id = s.player_id
+                WHERE l.team_id = ? AND l.last_game >= ?
+                GROUP BY s.player_id
+            """, (season_start, season_end, team_id, active_since)).fetchall()
+        conn.close()
+
+        if not rows:
+            return {}
+
+        if not before_date:
+            self._report_log_age(season, newest)
+
+        ppg = [r[0] or 0 for r in rows]
+        rpg = [r[1] or 0 for r in rows]
+        apg = [r[2] or 0 for r in rows]
+        fg_pct = [r[3] or 0 for r in rows]
+
+        return {
+            'team_ppg_from_players': float(sum(ppg)),
+            'team_rpg_from_players': float(sum(rpg)),
+            'team_apg_from_players': float(sum(apg)),
+            'avg_fg_pct_from_players': float(sum(fg_pct) / len(rows)),
+            'top_scorer_ppg': float(max(ppg)),
+            'top_playmaker_apg': float(max(apg)),
+            'active_players': len(rows)
+        }
+
+    def _report_log_age(self, season: str, newest: str):
+        """Print how old the player logs are, once per season per fetcher."""
+        if season in self._log_age_reported:
+            return
+        self._log_age_reported.add(season)
+        age_days = (datetime.now() - datetime.strptime(newest[:10], '%Y-%m-%d')).days
+        if age_days > 2:
+            print(f"[WARN] Player aggregates use game logs through {newest[:10]} "
+                  f"({age_days} days old) - run ingest_season_game_logs")
+        else:
+            print(f"Player aggregates use game logs through {newest[:10]} ({age_days} days old)")
+
     def get_team_player_aggregated_stats(self, team_id: int, season: str = "2024-25") -> Dict:
         """
         Get aggregated player statistics for a team with caching.
@@ -774,8 +1014,16 @@ class NBADataFetcher:
             if cached:
                 return cached
 
-            # Get roster (also cached)
+            # Local box scores (see ingest_season_game_logs) - no API calls needed,
+            # limited to the cached roster when there is one
             roster_cached = self.player_cache.get_team_roster(team_id, season)
+            roster_ids = [r.get('PLAYER_ID') for r in roster_cached or [] if r.get('PLAYER_ID')]
+            local_stats = self.get_team_player_stats_from_logs(team_id, season, roster_ids=roster_ids)
+            if local_stats:
+                self.player_cache.set_team_aggregated_stats(team_id, season, local_stats, ttl_hours=24)
+                return local_stats
+
+            # Get roster (also cached)
             if roster_cached:
                 roster = pd.DataFrame(roster_cached)
             else:
@@ -793,11 +1041,9 @@ class NBADataFetcher:
             # This is a heuristic: if we need > 3 players, it's faster to fetch the league (1 call)
             # than 3+ individual calls (3+ calls).
             
-            missing_players = []
-            for _, player in roster.iterrows():
-                pid = player.get('PLAYER_ID')
-                if pid and not self.player_cache.get_player_stats(pid):
-                    missing_players.append(pid)
+            roster_ids = [pid for pid in roster.get('PLAYER_ID', []) if pid]
+            cached_stats = self.player_cache.get_many_player_stats(roster_ids)
+            missing_players = [pid for pid in roster_ids if int(pid) not in cached_stats]
             
             # Try bulk fetch if we need many players, but don't block if it fails
             if len(missing_players) > 2:
@@ -805,6 +1051,11 @@ class NBADataFetcher:
                     league_stats = self.get_league_player_stats(season)
                     if not league_stats:
                         print(f"Bulk fetch failed for team {team_id}, will use cached data only")
+                    else:
+                        cached_stats.update({
+                            int(pid): league_stats[int(pid)]
+                            for pid in missing_players if int(pid) in league_stats
+                        })
                 except Exception as e:
                     print(f"Bulk fetch error (non-fatal): {e}")
             
@@ -823,7 +1074,7 @@ class NBADataFetcher:
 
                 if player_id:
                     # Stats should be in cache now (either from previous runs or bulk fetch)
-                    player_stats = self.player_cache.get_player_stats(player_id)
+                    player_stats = cached_stats.get(int(player_id))
 
                     # Skip individual fetch if bulk fetch failed - use defaults instead
                     # This prevents the 20-40 minute delays from individual timeouts
@@ -1163,9 +1414,20 @@ class FeatureEngineer:
     - Player stats
     """
     
-    def __init__(self, db_path: str = "data/nba_predictor.db"):
+    def __init__(self, db_path: str = "data/nba_predictor.db",
+                 elo_system: Optional[EloRatingSystem] = None,
+                 injury_tracker=None, betting_lines_fetcher=None,
+                 data_fetcher: Optional[NBADataFetcher] = None):
+        """
+        Args:
+            db_path: Path to SQLite database
+            elo_system, injury_tracker, betting_lines_fetcher, data_fetcher:
+                Shared instances (see src.components); built here if omitted
+        """
         self.db_path = Path(db_path)
-        self.elo_system = EloRatingSystem(db_path)
+        self.elo_system = elo_system or EloRatingSystem(db_path)
+        self._data_fetcher = data_fetcher
+        self._data_fetcher_lock = threading.Lock()
         
         # Import new modules
         try:
@@ -1174,12 +1436,21 @@ class FeatureEngineer:
             from src.betting_lines_fetcher import BettingLinesFetcher
             
             self.travel_calculator = get_travel_features
-            self.injury_tracker = InjuryTracker(db_path)
-            self.betting_lines_fetcher = BettingLinesFetcher(db_path)
+            self.injury_tracker = injury_tracker or InjuryTracker(db_path)
+            self.betting_lines_fetcher = betting_lines_fetcher or BettingLinesFetcher(db_path)
             self.enhanced_features_available = True
         except ImportError as e:
             print(f"Warning: Enhanced features not available: {e}")
             self.enhanced_features_available = False
+
+    @property
+    def data_fetcher(self) -> NBADataFetcher:
+        """Data fetcher for player stats (built once, on first use)."""
+        if self._data_fetcher is None:
+            with self._data_fetcher_lock:
+                if self._data_fetcher is None:
+                    self._data_fetcher = NBADataFetcher(self.db_path)
+        return self._data_fetcher
         
     def create_features_for_game(self, home_team_id: int, away_team_id: int,
                                   game_date: str = None, include_player_stats: bool = False) -> Dict:
@@ -1200,10 +1471,12 @@ class FeatureEngineer:
         features = {}
         
         conn = sqlite3.connect(self.db_path)
+        laps = get_telemetry().laps('features')  # Per-group wall time (active runs only)
         
         # ═══════════════════════════════════════════════════════════════
         # 1. ELO RATINGS (4 features)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('elo')
         home_elo = self.elo_system.get_rating(home_team_id)
         away_elo = self.elo_system.get_rating(away_team_id)
 
@@ -1224,6 +1497,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 2. RECENT FORM - Last 10 games (30+ features with advanced metrics)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('last10_form')
         for prefix, team_id in [('home', home_team_id), ('away', away_team_id)]:
             recent = self._get_recent_stats(conn, team_id, game_date, n_games=10)
 
@@ -1250,6 +1524,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 3. LAST 5 GAMES - More recent form (15+ features with advanced metrics)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('last5_form')
         for prefix, team_id in [('home', home_team_id), ('away', away_team_id)]:
             recent5 = self._get_recent_stats(conn, team_id, game_date, n_games=5)
 
@@ -1269,6 +1544,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 3b. ULTRA-RECENT FORM - LAST 3 GAMES (AGGRESSIVE RECENCY)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('recency')
         # These features give MAXIMUM weight to the most recent 3 games
         # Research shows recent form (especially last 3) is a better predictor than season-long stats
         for prefix, team_id in [('home', home_team_id), ('away', away_team_id)]:
@@ -1349,6 +1625,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 3e. STRENGTH OF SCHEDULE (NEW - reduces recency bias)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('strength_of_schedule')
         # A team's recent wins mean less if they beat weak opponents
         # A team's recent losses mean less if they faced strong opponents
         for prefix, team_id in [('home', home_team_id), ('away', away_team_id)]:
@@ -1376,6 +1653,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 4. HOME/AWAY SPLITS (8 features)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('home_away')
         home_at_home = self._get_home_away_split(conn, home_team_id, game_date, is_home=True)
         away_on_road = self._get_home_away_split(conn, away_team_id, game_date, is_home=False)
         
@@ -1392,6 +1670,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 5. HEAD-TO-HEAD (6 features)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('head_to_head')
         h2h = self._get_head_to_head(conn, home_team_id, away_team_id, game_date)
         
         features['h2h_home_win_pct'] = h2h['home_win_pct']
@@ -1404,6 +1683,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 6. REST DAYS & SCHEDULE FEATURES (expanded with special dates)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('rest_schedule')
         home_rest = self._get_rest_days(conn, home_team_id, game_date)
         away_rest = self._get_rest_days(conn, away_team_id, game_date)
 
@@ -1420,6 +1700,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 7. STREAK (4 features)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('streak')
         home_streak = self._get_streak(conn, home_team_id, game_date)
         away_streak = self._get_streak(conn, away_team_id, game_date)
         
@@ -1431,6 +1712,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 8. DIFFERENTIALS (10 features)
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('differentials')
         features['ppg_diff'] = features['home_last10_ppg'] - features['away_last10_ppg']
         features['point_diff_diff'] = features['home_last10_point_diff'] - features['away_last10_point_diff']
         features['fg_pct_diff'] = features['home_last10_fg_pct'] - features['away_last10_fg_pct']
@@ -1445,6 +1727,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 8b. ADVANCED EFFICIENCY METRICS (15+ features) - ENHANCED!
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('derived')
 
         # Legacy net rating (kept for backward compatibility)
         home_off_eff = features['home_last10_ppg'] / 100 if features['home_last10_ppg'] > 0 else 1.1
@@ -1567,19 +1850,22 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 9. PLAYER-LEVEL STATISTICS (14 features) - OPTIONAL
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('player_stats')
         # Only fetch if explicitly enabled (slow due to API rate limiting)
         if include_player_stats:
             try:
                 # Note: This uses NBA API which can be slow
                 # Get aggregated player stats for both teams with timeout protection
-                data_fetcher = NBADataFetcher(self.db_path)
+                data_fetcher = self.data_fetcher
+
+                season = NBADataFetcher.season_for_date(game_date)
 
                 # Use timeout wrapper to prevent hanging
                 def get_home_stats():
-                    return data_fetcher.get_team_player_aggregated_stats(home_team_id)
+                    return data_fetcher.get_team_player_aggregated_stats(home_team_id, season)
                 
                 def get_away_stats():
-                    return data_fetcher.get_team_player_aggregated_stats(away_team_id)
+                    return data_fetcher.get_team_player_aggregated_stats(away_team_id, season)
                 
                 # Fetch with 30 second timeout per team (60 seconds total max)
                 try:
@@ -1641,6 +1927,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 10. TRAVEL & FATIGUE (3 features) - NEW!
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('travel')
         if self.enhanced_features_available:
             try:
                 # Get last game location for away team (simplified - assumes coming from home)
@@ -1662,6 +1949,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 11. INJURIES (4 features) - NEW!
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('injuries')
         if self.enhanced_features_available:
             try:
                 # For predictions (not training), force refresh to get latest injuries
@@ -1709,6 +1997,7 @@ class FeatureEngineer:
         # ═══════════════════════════════════════════════════════════════
         # 12. BETTING LINES - Market Wisdom (5 features) - NEW!
         # ═══════════════════════════════════════════════════════════════
+        laps.lap('betting_lines')
         if self.enhanced_features_available:
             try:
                 # Get team names for betting lines API
@@ -1733,18 +2022,14 @@ class FeatureEngineer:
             features['market_implied_prob'] = 0.5
             features['market_confidence'] = 0.0
 
+        laps.stop()
         conn.close()
 
         return features
         
     def _get_team_name(self, conn, team_id: int) -> str:
         """Get team name from team ID."""
-        from nba_api.stats.static import teams
-        all_teams = teams.get_teams()
-        for team in all_teams:
-            if team['id'] == team_id:
-                return team['full_name']
-        return "Unknown Team"
+        return team_full_name(team_id) or "Unknown Team"
     
     def _get_recent_stats(self, conn, team_id: int, before_date: str,
                           n_games: int = 10) -> Dict:
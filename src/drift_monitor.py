@@ -0,0 +1,404 @@
+"""
+Feature Drift Monitor
+Streaming per-feature sketches of live inputs compared against the training data
+
+Each daily slate is reduced to one sketch per feature (count, mean, M2,
+missing and default-value counts, and a histogram over the training
+quantile edges) and stored per game date. A drift check sums the sketches
+of the last N days and compares them with the training sketch (PSI, binned
+KS, default-value rate) without rescanning any history.
+"""
+
+import json
+import pickle
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from src.model_identity import model_version
+
+
+# Values substituted when a fetch fails (betting lines in create_features_for_game)
+DEFAULT_FEATURE_VALUES = {
+    'market_spread': 0.0,
+    'market_total': 220.0,
+    'market_home_ml': 2.0,
+    'market_implied_prob': 0.5,
+    'market_confidence': 0.0,
+}
+
+N_BINS = 20
+PSI_MODERATE = 0.10
+PSI_HIGH = 0.25
+KS_ALERT = 0.30
+DEFAULT_RATE_ALERT = 0.50
+MIN_SAMPLES = 20
+_EPSILON = 1e-4
+
+
+# ----------------------------------------------------------------------
+# Training (reference) sketch
+# ----------------------------------------------------------------------
+def _bin_counts(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Histogram counts over interior edges (len(edges) + 1 bins)."""
+    return np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+
+
+def build_training_sketch(X, feature_names: Sequence[str], n_bins: int = N_BINS) -> Dict:
+    """
+    Reference sketch of the training matrix (as seen by the scaler).
+
+    Args:
+        X: Training features (DataFrame or 2-D array), NaN already filled
+        feature_names: Column names of X
+        n_bins: Quantile bins per feature
+
+    Returns:
+        {'source': 'training', 'n_bins': n, 'features': {name: {...}}}
+    """
+    matrix = np.asarray(X, dtype=np.float64)
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    features = {}
+    for position, name in enumerate(feature_names):
+        column = matrix[:, position]
+        edges = np.unique(np.quantile(column, quantiles))
+        counts = _bin_counts(column, edges)
+        default = DEFAULT_FEATURE_VALUES.get(name)
+        features[name] = {
+            'edges': edges.tolist(),
+            'proportions': (counts / len(column)).tolist(),
+            'count': int(len(column)),
+            'mean': float(column.mean()),
+            'var': float(column.var()),
+            'default_rate': float(np.mean(column == default)) if default is not None else None,
+        }
+    return {'source': 'training', 'n_bins': n_bins, 'features': features}
+
+
+def sketch_from_scaler(scaler, feature_names: Sequence[str], n_bins: int = N_BINS) -> Dict:
+    """
+    Normal approximation of the training distribution from a fitted StandardScaler.
+
+    Used for models saved before training sketches existed. Only the mean
+    and variance are real: the normal-quantile bins misplace binary and
+    discrete features (rest days, streaks), so checks against this sketch
+    skip PSI/KS and compare moments and default rates only.
+    """
+    z_scores = [NormalDist().inv_cdf(q) for q in np.linspace(0, 1, n_bins + 1)[1:-1]]
+    features = {}
+    for name, mean, var in zip(feature_names, scaler.mean_, scaler.var_):
+        std = float(np.sqrt(var))
+        if std > 0:
+            edges = [float(mean) + std * z for z in z_scores]
+            proportions = [1.0 / n_bins] * n_bins
+        else:
+            edges, proportions = [float(mean)], [0.0, 1.0]
+        features[name] = {
+            'edges': edges,
+            'proportions': proportions,
+            'count': int(getattr(scaler, 'n_samples_seen_', 0)),
+            'mean': float(mean),
+            'var': float(var),
+            'default_rate': None,
+        }
+    return {'source': 'scaler', 'n_bins': n_bins, 'features': features}
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index between two bin-proportion vectors."""
+    expected = np.clip(expected, _EPSILON, None)
+    actual = np.clip(actual, _EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def psi_critical(n_bins: int, n_samples: int, confidence: float = 0.999) -> float:
+    """
+    PSI reachable by sampling noise alone (n * PSI ~ chi-square, n_bins - 1 dof).
+
+    Wilson-Hilferty approximation of the chi-square quantile; the high
+    confidence accounts for ~100 features being tested at once.
+    """
+    dof = max(n_bins - 1, 1)
+    z = NormalDist().inv_cdf(confidence)
+    chi2 = dof * (1 - 2 / (9 * dof) + z * np.sqrt(2 / (9 * dof))) ** 3
+    return float(chi2 / n_samples)
+
+
+def binned_ks(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Kolmogorov-Smirnov statistic on binned CDFs (evaluated at the bin edges)."""
+    return float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+
+
+class DriftMonitor:
+    """
+    Live feature distribution tracking against the training reference.
+
+    Features:
+    - One sketch per feature and game date, replaced when a slate is re-run
+    - Mergeable moments (Chan/Welford) and fixed-edge histograms
+    - PSI / KS / default-rate checks over any window in milliseconds
+    - Alerts stored per check date for the daily log and email
+    """
+
+    def __init__(self, db_path: str = "data/nba_predictor.db", model_dir: str = "models"):
+        self.db_path = Path(db_path)
+        self.model_dir = Path(model_dir)
+        self._reference = None
+        self._init_tables()
+
+    def _init_tables(self):
+        """Initialize drift monitor tables."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feature_sketch_daily (
+                game_date DATE,
+                feature TEXT,
+                reference_version TEXT,
+                count INTEGER,
+                mean REAL,
+                m2 REAL,
+                missing INTEGER,
+                defaults INTEGER,
+                bins BLOB,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (game_date, feature)
+            ) WITHOUT ROWID
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feature_drift_alerts (
+                check_date DATE,
+                feature TEXT,
+                metric TEXT,
+                value REAL,
+                level TEXT,
+                message TEXT,
+                PRIMARY KEY (check_date, feature, metric)
+            ) WITHOUT ROWID
+        """)
+
+        conn.commit()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    # Reference
+    # ------------------------------------------------------------------
+    @property
+    def reference(self) -> Dict:
+        """Training sketch (training_sketch.json, else the scaler approximation)."""
+        if self._reference is None:
+            self._reference = self._load_reference()
+        return self._reference
+
+    def _load_reference(self) -> Dict:
+        sketch_path = self.model_dir / "training_sketch.json"
+        if sketch_path.exists():
+            with open(sketch_path, 'r') as f:
+                reference = json.load(f)
+        else:
+            with open(self.model_dir / "feature_names.json", 'r') as f:
+                feature_names = json.load(f)
+            with open(self.model_dir / "scaler.pkl", 'rb') as f:
+                scaler = pickle.load(f)
+            reference = sketch_from_scaler(scaler, feature_names)
+
+        if not reference.get('version'):
+            reference['version'] = f"{reference['source']}:{model_version(self.model_dir)}"
+
+        for spec in reference['features'].values():
+            spec['edges'] = np.asarray(spec['edges'], dtype=np.float64)
+            spec['proportions'] = np.asarray(spec['proportions'], dtype=np.float64)
+        return reference
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def record_slate(self, game_date: str, feature_rows: List[Dict]) -> int:
+        """
+        Store the sketches of one game date's prediction-time features.
+
+        Re-running a slate replaces that date's sketches, so repeated daily
+        runs do not double count.
+
+        Args:
+            game_date: Game date of the slate (YYYY-MM-DD)
+            feature_rows: Feature dicts, one per prediction
+
+        Returns:
+            Number of feature sketches written
+        """
+        if not feature_rows:
+            return 0
+
+        reference = self.reference
+        names = list(reference['features'])
+        matrix = np.array([
+            [row.get(name, np.nan) if isinstance(row.get(name), (int, float, np.number)) else np.nan
+             for name in names]
+            for row in feature_rows
+        ], dtype=np.float64)
+
+        missing = np.isnan(matrix)
+        # The model sees missing inputs as 0 (fillna(0) before scaling)
+        values = np.where(missing, 0.0, matrix)
+        count = values.shape[0]
+        means = values.mean(axis=0)
+        m2 = ((values - means) ** 2).sum(axis=0)
+
+        now = datetime.now().isoformat()
+        rows = []
+        for position, name in enumerate(names):
+            spec = reference['features'][name]
+            column = values[:, position]
+            default = DEFAULT_FEATURE_VALUES.get(name)
+            rows.append((
+                game_date, name, reference['version'], count,
+                float(means[position]), float(m2[position]),
+                int(missing[:, position].sum()),
+                int(np.sum(column == default)) if default is not None else 0,
+                _bin_counts(column, spec['edges']).astype(np.int64).tobytes(),
+                now
+            ))
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("DELETE FROM feature_sketch_daily WHERE game_date = ?", (game_date,))
+            conn.executemany("""
+                INSERT INTO feature_sketch_daily
+                (game_date, feature, reference_version, count, mean, m2, missing, defaults, bins, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        conn.close()
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+    def check(self, window_days: int = 14, as_of: str = None) -> Dict:
+        """
+        Compare the last window_days of live sketches with the training sketch.
+
+        PSI and KS are only computed against a real training sketch; with the
+        scaler approximation they are None and only default-rate alerts fire.
+
+        Args:
+            window_days: Game dates to include (ending at as_of)
+            as_of: Last game date (YYYY-MM-DD, default today)
+
+        Returns:
+            {'window_start', 'window_end', 'reference', 'features': {name: stats}, 'alerts': [...]}
+        """
+        reference = self.reference
+        as_of = as_of or datetime.now().strftime('%Y-%m-%d')
+        window_start = (datetime.strptime(as_of, '%Y-%m-%d') - timedelta(days=window_days - 1)).strftime('%Y-%m-%d')
+
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("""
+            SELECT feature, count, mean, m2, missing, defaults, bins
+            FROM feature_sketch_daily
+            WHERE game_date BETWEEN ? AND ? AND reference_version = ?
+        """, (window_start, as_of, reference['version'])).fetchall()
+        conn.close()
+
+        merged: Dict[str, Dict] = {}
+        for feature, count, mean, m2, missing, defaults, bins in rows:
+            bins = np.frombuffer(bins, dtype=np.int64)
+            current = merged.get(feature)
+            if current is None:
+                merged[feature] = {'count': count, 'mean': mean, 'm2': m2, 'missing': missing,
+                                   'defaults': defaults, 'bins': bins.copy()}
+                continue
+            # Chan et al. parallel merge of mean / M2
+            total = current['count'] + count
+            delta = mean - current['mean']
+            current['m2'] += m2 + delta * delta * current['count'] * count / total
+            current['mean'] += delta * count / total
+            current['count'] = total
+            current['missing'] += missing
+            current['defaults'] += defaults
+            current['bins'] += bins
+
+        features = {}
+        alerts = []
+        for name, live in merged.items():
+            spec = reference['features'].get(name)
+            if spec is None or live['count'] == 0 or len(live['bins']) != len(spec['proportions']):
+                continue
+            stats = {
+                'count': live['count'],
+                'mean': live['mean'],
+                'std': float(np.sqrt(live['m2'] / live['count'])),
+                'reference_mean': spec['mean'],
+                'reference_std': float(np.sqrt(spec['var'])),
+                'missing_rate': live['missing'] / live['count'],
+                'default_rate': live['defaults'] / live['count'] if name in DEFAULT_FEATURE_VALUES else None,
+                'psi': None,
+                'ks': None,
+                'psi_critical': None,
+            }
+            # Distribution tests need real training bins (not the scaler approximation)
+            if reference['source'] != 'scaler':
+                # Laplace smoothing: empty bins in a small window must not blow up PSI
+                n_bins = len(live['bins'])
+                actual = (live['bins'] + 0.5) / (live['count'] + 0.5 * n_bins)
+                stats['psi'] = psi(spec['proportions'], actual)
+                stats['ks'] = binned_ks(spec['proportions'], live['bins'] / live['count'])
+                stats['psi_critical'] = psi_critical(n_bins, live['count'])
+            features[name] = stats
+            if live['count'] >= MIN_SAMPLES:
+                alerts.extend(self._alerts_for(name, stats, spec))
+
+        alerts.sort(key=lambda alert: (alert['level'] != 'high', -alert['value']))
+        self._save_alerts(as_of, alerts)
+        return {
+            'window_start': window_start,
+            'window_end': as_of,
+            'reference': reference['version'],
+            'features': features,
+            'alerts': alerts,
+        }
+
+    @staticmethod
+    def _alerts_for(name: str, stats: Dict, spec: Dict) -> List[Dict]:
+        alerts = []
+        # Only shifts sampling noise cannot explain at this window size
+        if stats['psi'] is not None and stats['psi'] >= max(PSI_MODERATE, stats['psi_critical']):
+            level = 'high' if stats['psi'] >= PSI_HIGH else 'moderate'
+            alerts.append({
+                'feature': name, 'metric': 'psi', 'value': stats['psi'], 'level': level,
+                'message': f"{name}: PSI {stats['psi']:.2f} (mean {stats['mean']:.3g} vs training {stats['reference_mean']:.3g})"
+            })
+        # 99% KS critical value for this sample size, floored at KS_ALERT
+        if stats['ks'] is not None and stats['ks'] >= max(KS_ALERT, 1.63 / np.sqrt(stats['count'])):
+            alerts.append({
+                'feature': name, 'metric': 'ks', 'value': stats['ks'], 'level': 'moderate',
+                'message': f"{name}: KS {stats['ks']:.2f} vs training distribution"
+            })
+        default_rate = stats['default_rate']
+        if default_rate is not None and default_rate >= DEFAULT_RATE_ALERT \
+                and default_rate > (spec.get('default_rate') or 0.0) + 0.2:
+            alerts.append({
+                'feature': name, 'metric': 'default_rate', 'value': default_rate, 'level': 'high',
+                'message': f"{name}: {default_rate:.0%} of predictions used the fallback value "
+                           f"{DEFAULT_FEATURE_VALUES[name]}"
+            })
+        return alerts
+
+    def _save_alerts(self, check_date: str, alerts: List[Dict]):
+        """Replace the stored alerts of a check date."""
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("DELETE FROM feature_drift_alerts WHERE check_date = ?", (check_date,))
+            conn.executemany("""
+                INSERT OR REPLACE INTO feature_drift_alerts
+                (check_date, feature, metric, value, level, message)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [(check_date, a['feature'], a['metric'], a['value'], a['level'], a['message'])
+                  for a in alerts])
+        conn.close()
@@ -11,23 +11,6 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def _teams_match(pred_home: str, pred_away: str, game_home: str, game_away: str) -> bool:
-    """Return True if (pred_home, pred_away) is the same matchup as (game_home, game_away)."""
-    if not all([pred_home, pred_away, game_home, game_away]):
-        return False
-    ph, pa = pred_home.strip().lower(), pred_away.strip().lower()
-    gh, ga = game_home.strip().lower(), game_away.strip().lower()
-    if (ph == gh and pa == ga) or (ph == ga and pa == gh):
-        return True
-    # Abbrev vs full: "bos" in "boston celtics", or "celtics" in "boston celtics"
-    def pair_matches(a1, a2, b1, b2):
-        return (
-            (a1 in b1 or b1 in a1 or a1 in b2 or b2 in a1)
-            and (a2 in b1 or b1 in a2 or a2 in b2 or b2 in a2)
-        )
-    return pair_matches(ph, pa, gh, ga) or pair_matches(ph, pa, ga, gh)
-
-
 # Try to import win32com for Outlook
 try:
     import win32com.client
@@ -88,7 +71,10 @@ class EmailReporter:
                 actual_away_score,
                 correct,
                 home_odds,
-                away_odds
+                away_odds,
+                home_team_id,
+                away_team_id,
+                game_id
             FROM predictions
             WHERE game_date = ?
             ORDER BY home_team, away_team
@@ -97,7 +83,8 @@ class EmailReporter:
         results = []
         for row in cursor.fetchall():
             game_date, home_team, away_team, predicted_winner, pred_home_prob, pred_away_prob, \
-            confidence, actual_winner, actual_home_score, actual_away_score, correct, home_odds, away_odds = row
+            confidence, actual_winner, actual_home_score, actual_away_score, correct, home_odds, away_odds, \
+            home_team_id, away_team_id, game_id = row
 
             # Use stored odds if available, otherwise calculate from probabilities as fallback
             if home_odds is None:
@@ -118,7 +105,10 @@ class EmailReporter:
                 'actual_winner': actual_winner,
                 'actual_home_score': actual_home_score,
                 'actual_away_score': actual_away_score,
-                'correct': correct
+                'correct': correct,
+                'home_team_id': home_team_id,
+                'away_team_id': away_team_id,
+                'game_id': game_id
             })
         
         conn.close()
@@ -134,6 +124,9 @@ class EmailReporter:
         table has not yet been updated (e.g. the CDN schedule returned
         score=0 at daily update time, but real scores arrived later via the
         NBA API path or the Streamlit "Refresh Game Data" button).
+
+        Games are found by game_id, then by (game_date, home_team_id,
+        away_team_id): both are index lookups, no name matching.
         """
         if not results:
             return results
@@ -153,7 +146,10 @@ class EmailReporter:
             game_date = game.get('game_date')
             home_team = game.get('home_team') or ''
             away_team = game.get('away_team') or ''
-            if not game_date or not home_team or not away_team:
+            home_id = game.get('home_team_id')
+            away_id = game.get('away_team_id')
+            if not game_date or home_id is None or away_id is None:
+                # Team names that never resolved to IDs can't be matched
                 resolved.append(game)
                 continue
             # Normalize date to YYYY-MM-DD for lookup
@@ -167,34 +163,31 @@ class EmailReporter:
                 except Exception:
                     resolved.append(game)
                     continue
-            # Exact match first (home/away or swapped)
-            cursor.execute("""
-                SELECT home_score, away_score, home_team, away_team
-                FROM games
-                WHERE game_date = ?
-                AND home_score IS NOT NULL AND away_score IS NOT NULL
-                AND (home_score > 0 OR away_score > 0)
-                AND (
-                    (home_team = ? AND away_team = ?)
-                    OR (home_team = ? AND away_team = ?)
-                )
-                LIMIT 1
-            """, (game_date, home_team, away_team, away_team, home_team))
-            row = cursor.fetchone()
+            row = None
+            if game.get('game_id'):
+                cursor.execute("""
+                    SELECT home_score, away_score, home_team_id
+                    FROM games
+                    WHERE game_id = ?
+                    AND home_score IS NOT NULL AND away_score IS NOT NULL
+                    AND (home_score > 0 OR away_score > 0)
+                """, (game['game_id'],))
+                row = cursor.fetchone()
             if not row:
-                # Fallback: fetch all games that day and match by team name (handles abbrev vs full)
+                # (game_date, home_team_id, away_team_id) index; either orientation
                 cursor.execute("""
-                    SELECT home_score, away_score, home_team, away_team
+                    SELECT home_score, away_score, home_team_id
                     FROM games
                     WHERE game_date = ?
+                    AND (
+                        (home_team_id = ? AND away_team_id = ?)
+                        OR (home_team_id = ? AND away_team_id = ?)
+                    )
                     AND home_score IS NOT NULL AND away_score IS NOT NULL
                     AND (home_score > 0 OR away_score > 0)
-                """, (game_date,))
-                for g in cursor.fetchall():
-                    hs, aws, g_home, g_away = g
-                    if _teams_match(home_team, away_team, g_home, g_away):
-                        row = (hs, aws, g_home, g_away)
-                        break
+                    LIMIT 1
+                """, (game_date, home_id, away_id, away_id, home_id))
+                row = cursor.fetchone()
             if not row:
                 # Last resort: fetch directly from NBA CDN. This handles the
                 # production case where the CI runner's games table never got
@@ -202,30 +195,17 @@ class EmailReporter:
                 # completed game scores as static JSON so we can always render
                 # yesterday's results even if the local DB is missing them.
                 for cdn_game in self._fetch_cdn_results_for_date(game_date):
-                    if _teams_match(home_team, away_team,
-                                    cdn_game['home_team'], cdn_game['away_team']):
+                    if {cdn_game['home_team_id'], cdn_game['away_team_id']} == {home_id, away_id}:
                         row = (
                             cdn_game['home_score'],
                             cdn_game['away_score'],
-                            cdn_game['home_team'],
-                            cdn_game['away_team'],
+                            cdn_game['home_team_id'],
                         )
                         break
             if row:
                 hs = int(row[0])
                 aws = int(row[1])
-                g_home = row[2] if len(row) >= 3 else home_team
-                g_away = row[3] if len(row) >= 4 else away_team
-                # Align the games-row orientation with the prediction's home/away.
-                # Same-orientation if games.home_team refers to the same team as
-                # prediction.home_team (accounting for abbrev vs full name).
-                def _same(a: str, b: str) -> bool:
-                    if not a or not b:
-                        return False
-                    al, bl = a.strip().lower(), b.strip().lower()
-                    return al == bl or al in bl or bl in al
-                same_orientation = _same(home_team, g_home) and _same(away_team, g_away)
-                if not same_orientation:
+                if row[2] != home_id:
                     # Games row is swapped: games.home_team == prediction.away_team
                     hs, aws = aws, hs
                 game = dict(game)
@@ -245,7 +225,8 @@ class EmailReporter:
         """
         Fetch completed-game results directly from the NBA static CDN for a
         given YYYY-MM-DD date. Returns a list of dicts with keys
-        `home_team`, `away_team` (full names), `home_score`, `away_score`.
+        `home_team`, `away_team` (full names), `home_team_id`, `away_team_id`,
+        `home_score`, `away_score`.
 
         Results are cached per-instance so the CDN is hit at most once per
         date regardless of how many predictions are being backfilled.
@@ -258,21 +239,15 @@ class EmailReporter:
             return self._cdn_results_cache[date_str]
         cached: List[Dict] = []
         try:
-            import requests  # local import to avoid hard dep at module load
+            from src.http_client import http_get  # local import to avoid hard dep at module load
             from datetime import datetime as _dt
+            from src.team_identity import resolve_team_id, to_full_name
             # CDN keys games by the ET calendar date formatted as 'MM/DD/YYYY 00:00:00'
             target_formatted = _dt.strptime(date_str, '%Y-%m-%d').strftime('%m/%d/%Y') + ' 00:00:00'
             url = 'https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json'
-            resp = requests.get(url, timeout=15)
+            resp = http_get(url, timeout=15)
             resp.raise_for_status()
             data = resp.json()
-            # Build tricode -> full name lookup lazily (nba_api is already a
-            # project dependency; fall back to raw tricode if unavailable).
-            try:
-                from nba_api.stats.static import teams as _teams
-                tricode_to_full = {t['abbreviation']: t['full_name'] for t in _teams.get_teams()}
-            except Exception:
-                tricode_to_full = {}
             for entry in data.get('leagueSchedule', {}).get('gameDates', []):
                 if entry.get('gameDate') != target_formatted:
                     continue
@@ -296,11 +271,13 @@ class EmailReporter:
                         continue
                     h_tri = home.get('teamTricode') or ''
                     a_tri = away.get('teamTricode') or ''
-                    h_full = tricode_to_full.get(h_tri, h_tri)
-                    a_full = tricode_to_full.get(a_tri, a_tri)
+                    h_full = to_full_name(h_tri)
+                    a_full = to_full_name(a_tri)
                     cached.append({
                         'home_team': h_full,
                         'away_team': a_full,
+                        'home_team_id': resolve_team_id(h_tri),
+                        'away_team_id': resolve_team_id(a_tri),
                         'home_score': hs,
                         'away_score': aws,
                     })
@@ -490,7 +467,38 @@ class EmailReporter:
         html += self._format_predictions_table(predictions, header_bg='#1e3a5f')
         return html
 
-    def create_email_html(self, yesterday_results: List[Dict], today_predictions: List[Dict]) -> str:
+    def get_drift_alerts(self) -> List[Dict]:
+        """Feature drift alerts from the latest check (written by the daily run's DriftMonitor)."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute("""
+                SELECT feature, metric, value, level, message
+                FROM feature_drift_alerts
+                WHERE check_date = (
+                    SELECT MAX(check_date) FROM feature_drift_alerts WHERE check_date >= ?
+                )
+                ORDER BY level = 'high' DESC, value DESC
+            """, ((datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),)).fetchall()
+        except sqlite3.OperationalError:
+            rows = []  # Drift monitor never ran on this database
+        finally:
+            conn.close()
+        return [dict(zip(('feature', 'metric', 'value', 'level', 'message'), row)) for row in rows]
+
+    def format_drift_alerts(self, alerts: List[Dict]) -> str:
+        """Format feature drift alerts as HTML (empty when there are none)."""
+        if not alerts:
+            return ""
+
+        html = "<h2>⚠️ Derive des features</h2><ul>"
+        for alert in alerts:
+            color = "#dc2626" if alert['level'] == 'high' else "#d97706"
+            html += f"<li style='color: {color};'>{alert['message']}</li>"
+        html += "</ul>"
+        return html
+
+    def create_email_html(self, yesterday_results: List[Dict], today_predictions: List[Dict],
+                          drift_alerts: Optional[List[Dict]] = None) -> str:
         """Create HTML email content with yesterday results and today's predictions."""
         date_str = datetime.now().strftime('%d/%m/%Y')
 
@@ -516,6 +524,8 @@ class EmailReporter:
 
                 {self.format_today_predictions(today_predictions)}
 
+                {self.format_drift_alerts(drift_alerts or [])}
+
                 <div style='margin-top: 30px; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 12px;'>
                     <h3 style='color: white; margin-top: 0;'>Publier sur Twitter</h3>
                     <p style='color: white; margin-bottom: 15px;'>
@@ -870,9 +880,14 @@ class EmailReporter:
             today_predictions = self.get_today_predictions()
             logger.info(f"Found {len(today_predictions)} predictions for today")
 
+            # Feature drift alerts from the latest daily check
+            drift_alerts = self.get_drift_alerts()
+            if drift_alerts:
+                logger.info(f"Including {len(drift_alerts)} feature drift alerts")
+
             # Create HTML email with yesterday results and today's predictions
             html_content = self.create_email_html(
-                yesterday_results, today_predictions
+                yesterday_results, today_predictions, drift_alerts
             )
 
             # Send email
@@ -0,0 +1,254 @@
+"""
+Feature Log
+Columnar float32 log of prediction-time features with a NumPy loader
+
+Each prediction's feature vector is stored as one packed float32 array
+keyed by (game_date, home_team_id, away_team_id), next to a schema version
+naming its columns. Loading any date range is a single indexed scan plus
+np.frombuffer, so drift checks, error analysis and rule mining no longer
+json.loads every features_json blob.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.team_identity import resolve_team_id
+
+
+FEATURE_DTYPE = np.float32
+
+
+def _to_float(value) -> float:
+    """Numeric feature value, NaN for anything else (strings, None, lists)."""
+    if isinstance(value, (bool, np.bool_)):
+        return float(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return np.nan
+
+
+def pack_features(features: Dict, feature_names: Sequence[str]) -> bytes:
+    """Pack a feature dict into float32 bytes in feature_names order."""
+    return np.fromiter(
+        (_to_float(features.get(name)) for name in feature_names),
+        dtype=FEATURE_DTYPE, count=len(feature_names)
+    ).tobytes()
+
+
+class FeatureLog:
+    """
+    Prediction-time feature matrix store.
+
+    Features:
+    - One packed float32 row per prediction (~400 bytes for 100 features)
+    - Schema versions: column names stored once per distinct feature set
+    - Bulk writes (one executemany per slate)
+    - load_matrix(): (n_predictions, n_features) array for any date range
+    - One-time import of existing predictions.features_json rows
+    """
+
+    def __init__(self, db_path: str = "data/nba_predictor.db", backfill: bool = True):
+        self.db_path = Path(db_path)
+        self._schema_ids: Dict[Tuple[str, ...], int] = {}
+        self._init_tables()
+        if backfill:
+            self.import_features_json()
+
+    def _init_tables(self):
+        """Initialize feature log tables."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feature_log_schemas (
+                schema_version INTEGER PRIMARY KEY AUTOINCREMENT,
+                feature_names TEXT UNIQUE,
+                n_features INTEGER,
+                created_at TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feature_log (
+                game_date DATE,
+                home_team_id INTEGER,
+                away_team_id INTEGER,
+                schema_version INTEGER,
+                model_version TEXT,
+                features BLOB,
+                logged_at TIMESTAMP,
+                PRIMARY KEY (game_date, home_team_id, away_team_id)
+            ) WITHOUT ROWID
+        """)
+
+        conn.commit()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _schema_version(self, conn: sqlite3.Connection, feature_names: Tuple[str, ...]) -> int:
+        """Schema version for an ordered feature-name tuple (created on first use)."""
+        schema_id = self._schema_ids.get(feature_names)
+        if schema_id is not None:
+            return schema_id
+
+        names_json = json.dumps(list(feature_names), separators=(',', ':'))
+        conn.execute("""
+            INSERT OR IGNORE INTO feature_log_schemas (feature_names, n_features, created_at)
+            VALUES (?, ?, ?)
+        """, (names_json, len(feature_names), datetime.now().isoformat()))
+        schema_id = conn.execute(
+            "SELECT schema_version FROM feature_log_schemas WHERE feature_names = ?", (names_json,)
+        ).fetchone()[0]
+        self._schema_ids[feature_names] = schema_id
+        return schema_id
+
+    def log_predictions(self, records: Iterable[Dict]) -> int:
+        """
+        Store the feature vectors of a batch of predictions in one transaction.
+
+        Args:
+            records: Dicts with game_date, home_team, away_team (names or IDs),
+                     features and optionally model_version
+
+        Returns:
+            Number of rows written
+        """
+        logged_at = datetime.now().isoformat()
+        conn = sqlite3.connect(self.db_path)
+        rows = []
+        with conn:
+            for record in records:
+                features = record.get('features') or {}
+                home_id = resolve_team_id(record.get('home_team'))
+                away_id = resolve_team_id(record.get('away_team'))
+                if not features or home_id is None or away_id is None or not record.get('game_date'):
+                    continue
+                feature_names = tuple(sorted(features))
+                rows.append((
+                    record['game_date'], home_id, away_id,
+                    self._schema_version(conn, feature_names),
+                    record.get('model_version'),
+                    pack_features(features, feature_names),
+                    logged_at
+                ))
+            conn.executemany("""
+                INSERT OR REPLACE INTO feature_log
+                (game_date, home_team_id, away_team_id, schema_version, model_version, features, logged_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        conn.close()
+        return len(rows)
+
+    def import_features_json(self) -> int:
+        """
+        Import predictions.features_json once (only into an empty log).
+
+        Returns:
+            Number of predictions imported
+        """
+        conn = sqlite3.connect(self.db_path)
+        has_rows = conn.execute("SELECT 1 FROM feature_log LIMIT 1").fetchone()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(predictions)")}
+        if has_rows or 'features_json' not in columns:
+            conn.close()
+            return 0
+
+        has_ids = 'home_team_id' in columns
+        rows = conn.execute(f"""
+            SELECT game_date,
+                   {'COALESCE(home_team_id, home_team)' if has_ids else 'home_team'},
+                   {'COALESCE(away_team_id, away_team)' if has_ids else 'away_team'},
+                   {'model_version' if 'model_version' in columns else 'NULL'},
+                   features_json
+            FROM predictions
+            WHERE features_json IS NOT NULL AND features_json NOT IN ('', '{{}}')
+            ORDER BY prediction_date
+        """).fetchall()
+        conn.close()
+
+        records = []
+        for game_date, home_team, away_team, model_version, features_json in rows:
+            try:
+                features = json.loads(features_json)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(features, dict):
+                records.append({
+                    'game_date': game_date, 'home_team': home_team, 'away_team': away_team,
+                    'model_version': model_version, 'features': features
+                })
+
+        imported = self.log_predictions(records) if records else 0
+        if imported:
+            print(f"Imported {imported} feature vectors from predictions.features_json")
+        return imported
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def load_matrix(self, start_date: str = None, end_date: str = None,
+                    feature_names: Optional[Sequence[str]] = None
+                    ) -> Tuple[np.ndarray, List[str], List[Tuple[str, int, int]]]:
+        """
+        Prediction-time feature matrix for a date range.
+
+        Args:
+            start_date: First game date (YYYY-MM-DD, inclusive; None = no bound)
+            end_date: Last game date (YYYY-MM-DD, inclusive; None = no bound)
+            feature_names: Columns to return, in this order (None = union of
+                           all logged columns, sorted). Missing values are NaN.
+
+        Returns:
+            (matrix float32 [n_predictions, n_features], feature_names,
+             row keys [(game_date, home_team_id, away_team_id), ...])
+        """
+        conn = sqlite3.connect(self.db_path)
+        schemas = {
+            version: json.loads(names)
+            for version, names in conn.execute(
+                "SELECT schema_version, feature_names FROM feature_log_schemas"
+            )
+        }
+        rows = conn.execute("""
+            SELECT game_date, home_team_id, away_team_id, schema_version, features
+            FROM feature_log
+            WHERE game_date >= ? AND game_date <= ?
+            ORDER BY game_date, home_team_id, away_team_id
+        """, (start_date or '', end_date or '9999-12-31')).fetchall()
+        conn.close()
+
+        keys = [(row[0], row[1], row[2]) for row in rows]
+        used_versions = sorted({row[3] for row in rows})
+
+        if feature_names is None:
+            feature_names = sorted({name for version in used_versions for name in schemas[version]})
+        feature_names = list(feature_names)
+
+        matrix = np.full((len(rows), len(feature_names)), np.nan, dtype=FEATURE_DTYPE)
+        if not rows:
+            return matrix, feature_names, keys
+
+        column_of = {name: position for position, name in enumerate(feature_names)}
+        versions = np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows))
+
+        # One frombuffer + column scatter per schema version
+        for version in used_versions:
+            names = schemas[version]
+            row_positions = np.flatnonzero(versions == version)
+            block = np.frombuffer(
+                b''.join(rows[i][4] for i in row_positions), dtype=FEATURE_DTYPE
+            ).reshape(len(row_positions), len(names))
+
+            source = [i for i, name in enumerate(names) if name in column_of]
+            target = [column_of[names[i]] for i in source]
+            if source:
+                matrix[np.ix_(row_positions, target)] = block[:, source]
+
+        return matrix, feature_names, keys
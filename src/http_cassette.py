@@ -0,0 +1,225 @@
+"""
+HTTP Record/Replay Cassettes
+Capture every outbound response of a run and serve it back offline
+
+All HTTP traffic in the project goes through requests (src/http_client.py,
+nba_api's stats.nba.com calls, tweepy), so the cassette hooks
+requests.Session.send once and sees everything.
+
+Usage:
+    # Record a live daily run
+    python daily_auto_prediction.py --dry-run --date 2026-01-05 --record data/cassettes/20260105
+
+    # Replay it with no network (optionally with injected latency)
+    python daily_auto_prediction.py --dry-run --date 2026-01-05 --replay data/cassettes/20260105 --replay-latency-ms 80
+
+Replay against a copy of the database recorded alongside the cassette,
+otherwise local TTL caches (injuries, odds, player stats) change which
+requests are made.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# Query parameters that carry credentials: never part of the key, never written to disk
+SECRET_PARAMS = {'apikey', 'api_key', 'key', 'token', 'access_token'}
+
+# Headers that no longer describe the stored (already decoded) body
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+class HTTPCassette:
+    """
+    Records or replays HTTP responses for every requests.Session in the process.
+
+    Each request is keyed by method, URL (query sorted, secrets stripped) and body.
+    Entries are stored as one JSON file per request under <directory>/<host>/.
+    """
+
+    MODES = ('record', 'replay')
+
+    def __init__(self, directory: str, mode: str = 'replay', latency_ms: float = 0.0,
+                 strict: bool = True):
+        """
+        Initialize a cassette.
+
+        Args:
+            directory: Cassette directory (created in record mode)
+            mode: 'record' (live + save) or 'replay' (serve from disk, no network)
+            latency_ms: Delay added to every replayed response
+            strict: In replay mode, fail requests that were never recorded
+                    instead of letting them through to the network
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cassette mode: {mode} (expected one of {self.MODES})")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.strict = strict
+        self.stats = {'recorded': 0, 'replayed': 0, 'missed': 0}
+        self._lock = threading.Lock()
+        self._original_send = None
+
+        if mode == 'record':
+            self.directory.mkdir(parents=True, exist_ok=True)
+        elif not self.directory.exists():
+            raise FileNotFoundError(f"Cassette directory not found: {self.directory}")
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _redact_url(url: str) -> str:
+        """Sort the query string and drop credential parameters."""
+        parsed = urlparse(url)
+        query = sorted(
+            (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+            if k.lower() not in SECRET_PARAMS
+        )
+        return urlunparse(parsed._replace(query=urlencode(query)))
+
+    def _entry_path(self, request: requests.PreparedRequest) -> Path:
+        """File holding the response for a prepared request."""
+        url = self._redact_url(request.url)
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha1(request.method.encode() + b' ' + url.encode() + b'\n' + body).hexdigest()
+        host = urlparse(url).netloc.replace(':', '_') or 'unknown'
+        return self.directory / host / f"{digest[:20]}.json"
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _save(self, request: requests.PreparedRequest, response: requests.Response):
+        """Write a live response to the cassette."""
+        path = self._entry_path(request)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'method': request.method,
+            'url': self._redact_url(request.url),
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            'encoding': response.encoding,
+            'body_b64': base64.b64encode(response.content or b'').decode('ascii'),
+            'elapsed_ms': round(response.elapsed.total_seconds() * 1000, 1),
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.stats['recorded'] += 1
+
+    def _load(self, request: requests.PreparedRequest) -> Optional[requests.Response]:
+        """Build a Response from the cassette, or None if not recorded."""
+        path = self._entry_path(request)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response.reason = entry.get('reason')
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.encoding = entry.get('encoding')
+        response._content = base64.b64decode(entry.get('body_b64', ''))
+        response.url = request.url
+        response.request = request
+        return response
+
+    # ------------------------------------------------------------------
+    # Hook
+    # ------------------------------------------------------------------
+    def _send(self, session: requests.Session, request: requests.PreparedRequest, **kwargs):
+        """Replacement for requests.Session.send."""
+        if self.mode == 'replay':
+            start = time.perf_counter()
+            response = self._load(request)
+            if response is None:
+                with self._lock:
+                    self.stats['missed'] += 1
+                if self.strict:
+                    raise CassetteMissError(
+                        f"No cassette entry for {request.method} {self._redact_url(request.url)}",
+                        request=request
+                    )
+                return self._original_send(session, request, **kwargs)
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000.0)
+            response.elapsed = timedelta(seconds=time.perf_counter() - start)
+            with self._lock:
+                self.stats['replayed'] += 1
+            return response
+
+        response = self._original_send(session, request, **kwargs)
+        try:
+            self._save(request, response)
+        except Exception as e:
+            print(f"[WARN] Could not record {request.method} {self._redact_url(request.url)}: {e}")
+        return response
+
+    def install(self) -> 'HTTPCassette':
+        """Patch requests.Session.send for the whole process."""
+        if self._original_send is not None:
+            return self
+        self._original_send = requests.Session.send
+        cassette = self
+
+        def send(session, request, **kwargs):
+            return cassette._send(session, request, **kwargs)
+
+        requests.Session.send = send
+        return self
+
+    def uninstall(self):
+        """Restore the original requests.Session.send."""
+        if self._original_send is not None:
+            requests.Session.send = self._original_send
+            self._original_send = None
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.uninstall()
+
+    def summary(self) -> Dict:
+        """Counters plus cassette location, for logging."""
+        with self._lock:
+            return {'mode': self.mode, 'directory': str(self.directory), **self.stats}
+
+
+def install_from_env() -> Optional[HTTPCassette]:
+    """
+    Install a cassette configured by environment variables, if any.
+
+    HTTP_CASSETTE_MODE: 'record' or 'replay' (unset/'off' = live network)
+    HTTP_CASSETTE_DIR: cassette directory
+    HTTP_REPLAY_LATENCY_MS: latency injected per replayed response
+    """
+    mode = os.getenv('HTTP_CASSETTE_MODE', '').strip().lower()
+    if mode in ('', 'off', 'none'):
+        return None
+    directory = os.getenv('HTTP_CASSETTE_DIR', 'data/http_cassettes')
+    latency_ms = float(os.getenv('HTTP_REPLAY_LATENCY_MS', '0') or 0)
+    return HTTPCassette(directory, mode=mode, latency_ms=latency_ms).install()
@@ -0,0 +1,200 @@
+"""
+Shared HTTP Client
+Pooled keep-alive sessions with retries, timeouts and per-host transfer stats
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '15'))
+DEFAULT_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+DEFAULT_BACKOFF = float(os.getenv('HTTP_BACKOFF', '0.5'))
+DEFAULT_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+
+
+class HTTPClient:
+    """
+    Shared HTTP layer for all outbound fetchers.
+
+    Features:
+    - One keep-alive session per host (TCP/TLS handshake paid once per run)
+    - Configurable retries (5xx / connection errors) and default timeout
+    - gzip/deflate negotiation on every request
+    - Per-host request counts, bytes transferred and latency
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF, pool_maxsize: int = DEFAULT_POOL_SIZE,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the client.
+
+        Args:
+            timeout: Default timeout in seconds when a call doesn't pass one
+            retries: Retries on connection errors and 500/502/503/504 responses
+            backoff_factor: Exponential backoff factor between retries
+            pool_maxsize: Keep-alive connections kept per host
+            headers: Extra default headers sent with every request
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.default_headers = {'Accept-Encoding': 'gzip, deflate'}
+        if headers:
+            self.default_headers.update(headers)
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _build_session(self) -> requests.Session:
+        """Create a session with a pooled, retrying adapter."""
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False  # Callers inspect status codes (401/429) themselves
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.headers.update(self.default_headers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        """Get (or lazily create) the keep-alive session for a URL's host."""
+        host = urlparse(url).netloc
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._build_session()
+                    self._sessions[host] = session
+        return session
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None,
+                **kwargs) -> requests.Response:
+        """
+        Send a request through the host's pooled session.
+
+        Accepts the same keyword arguments as requests.request().
+        Raises requests.exceptions.RequestException on network failure.
+        """
+        host = urlparse(url).netloc
+        session = self.session_for(url)
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.exceptions.RequestException:
+            self._record(host, time.perf_counter() - start, error=True)
+            raise
+        self._record(host, time.perf_counter() - start, response=response)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET a URL (see request())."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST to a URL (see request())."""
+        return self.request('POST', url, **kwargs)
+
+    def _record(self, host: str, elapsed: float, response: Optional[requests.Response] = None,
+                error: bool = False):
+        """Update per-host counters."""
+        wire_bytes = 0
+        decoded_bytes = 0
+        if response is not None:
+            decoded_bytes = len(response.content or b'')
+            # raw.tell() counts bytes read off the socket, i.e. before gzip decoding
+            try:
+                wire_bytes = int(response.raw.tell())
+            except Exception:
+                wire_bytes = 0
+            if not wire_bytes:
+                wire_bytes = int(response.headers.get('Content-Length') or decoded_bytes)
+
+        with self._lock:
+            stats = self._stats.setdefault(host, {
+                'requests': 0,
+                'errors': 0,
+                'bytes': 0,
+                'decoded_bytes': 0,
+                'elapsed_seconds': 0.0
+            })
+            stats['requests'] += 1
+            stats['elapsed_seconds'] += elapsed
+            stats['bytes'] += wire_bytes
+            stats['decoded_bytes'] += decoded_bytes
+            if error or (response is not None and response.status_code >= 400):
+                stats['errors'] += 1
+
+    def get_host_stats(self) -> Dict[str, Dict]:
+        """Get a copy of the per-host counters."""
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._stats.items()}
+
+    def reset_stats(self):
+        """Clear per-host counters (sessions stay open)."""
+        with self._lock:
+            self._stats.clear()
+
+    def log_host_stats(self, log: Callable[[str], None] = print):
+        """Write one summary line per host to the given log function."""
+        stats = self.get_host_stats()
+        if not stats:
+            log("HTTP: no outbound requests")
+            return
+        total_requests = sum(s['requests'] for s in stats.values())
+        total_bytes = sum(s['bytes'] for s in stats.values())
+        log(f"HTTP: {total_requests} requests, {total_bytes / 1024:.1f} KB across {len(stats)} hosts")
+        for host, s in sorted(stats.items(), key=lambda item: -item[1]['requests']):
+            log(
+                f"  {host}: {s['requests']} requests ({s['errors']} errors), "
+                f"{s['bytes'] / 1024:.1f} KB wire / {s['decoded_bytes'] / 1024:.1f} KB decoded, "
+                f"{s['elapsed_seconds']:.2f}s"
+            )
+
+    def close(self):
+        """Close all pooled sessions."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Get the process-wide shared HTTP client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared client. Drop-in for requests.get()."""
+    return get_http_client().get(url, **kwargs)
@@ -0,0 +1,243 @@
+"""
+Injury Page Parsers
+Targeted extraction of injury rows from the league-wide source pages
+
+Only the nodes that carry injury data are touched: the report tables on
+Hashtag Basketball and the lineup cards on Rotowire. lxml is used when
+available; otherwise BeautifulSoup builds a partial tree limited by a
+SoupStrainer.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+_SUFFIX_RE = re.compile(r'\b(jr|sr|ii|iii|iv)\b')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9 ]+')
+_SPACES_RE = re.compile(r'\s+')
+_LINK_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize_player_name(name: str) -> str:
+    """
+    Normalize a player name for set lookups.
+
+    Strips accents, punctuation and generational suffixes:
+    "Luka Dončić" -> "luka doncic", "Jaren Jackson Jr." -> "jaren jackson",
+    "De'Aaron Fox" -> "deaaron fox"
+    """
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    name = _NON_ALNUM_RE.sub('', name.lower().replace('-', ' '))
+    name = _SUFFIX_RE.sub('', name)
+    return _SPACES_RE.sub(' ', name).strip()
+
+
+def build_star_set(star_names: Iterable[str]) -> frozenset:
+    """Precompute the normalized All-Star name set."""
+    return frozenset(normalize_player_name(name) for name in star_names)
+
+
+def _injury(player: str, injury: str, status: str, is_starter: bool,
+            star_set: frozenset) -> Dict:
+    return {
+        'player': player,
+        'position': '',
+        'injury': injury,
+        'status': status,
+        'is_starter': is_starter,
+        'is_star': normalize_player_name(player) in star_set
+    }
+
+
+def _match_team(team_text: str, row_text: str, team_terms: List[Tuple[str, str]]):
+    """Team abbreviation for a row: team column first, whole row as fallback."""
+    for term, abbrev in team_terms:
+        if term in team_text:
+            return abbrev
+    for term, abbrev in team_terms:
+        if term in row_text:
+            return abbrev
+    return None
+
+
+def _clean(text: str) -> str:
+    return _SPACES_RE.sub(' ', text).strip()
+
+
+# ----------------------------------------------------------------------
+# Hashtag Basketball injury report
+# ----------------------------------------------------------------------
+def parse_hashtag_report(content: bytes, team_names: Dict[str, str],
+                         star_set: frozenset) -> Dict[str, List[Dict]]:
+    """
+    Parse the Hashtag Basketball league injury report.
+
+    Args:
+        content: Raw page bytes
+        team_names: team_abbrev -> name fragment used in the report
+        star_set: Normalized star names (see build_star_set)
+
+    Returns:
+        team_abbrev -> injuries
+    """
+    team_terms = [(name.lower(), abbrev) for abbrev, name in team_names.items()]
+    injuries: Dict[str, List[Dict]] = {}
+
+    for cells in _hashtag_rows(content):
+        if len(cells) < 4:
+            continue
+        team_abbrev = _match_team(cells[1].lower(), ' '.join(cells).lower(), team_terms)
+        if not team_abbrev:
+            continue
+        injuries.setdefault(team_abbrev, []).append(
+            _injury(cells[0], cells[2], cells[3] or 'Out', False, star_set)
+        )
+
+    return injuries
+
+
+def _hashtag_rows(content: bytes) -> List[List[str]]:
+    """Cell texts of every table row that has <td> cells."""
+    if LXML_AVAILABLE:
+        doc = lxml_html.fromstring(content)
+        return [
+            [_clean(td.text_content()) for td in tr.xpath('./td')]
+            for tr in doc.xpath('//table//tr[td]')
+        ]
+
+    soup = BeautifulSoup(content, 'html.parser', parse_only=SoupStrainer('table'))
+    return [
+        [_clean(td.get_text()) for td in tr.find_all('td')]
+        for tr in soup.find_all('tr')
+    ]
+
+
+# ----------------------------------------------------------------------
+# Rotowire lineups
+# ----------------------------------------------------------------------
+def _status_from_span(injury_text: str, injury_classes: str) -> str:
+    """Map a Rotowire injury badge to a status string."""
+    upper = injury_text.upper()
+    if 'is-out' in injury_classes or upper.startswith('O'):
+        return 'Out'
+    if 'is-gtd' in injury_classes or upper.startswith('GTD'):
+        return 'Game-Time-Decision'
+    if 'is-questionable' in injury_classes or upper.startswith('Q'):
+        return 'Questionable'
+    if 'is-doubtful' in injury_classes or upper.startswith('D'):
+        return 'Doubtful'
+    return 'Day-To-Day'
+
+
+def parse_rotowire_lineups(content: bytes, team_slugs: Dict[str, str],
+                           star_set: frozenset) -> Dict[str, List[Dict]]:
+    """
+    Parse injured players from the Rotowire lineups page.
+
+    Args:
+        content: Raw page bytes
+        team_slugs: team_abbrev -> slug used in the team link (e.g. 'lakers')
+        star_set: Normalized star names (see build_star_set)
+
+    Returns:
+        team_abbrev -> injuries (teams with a card but no injuries map to [])
+    """
+    link_tokens = _rotowire_link_tokens(team_slugs)
+    injuries: Dict[str, List[Dict]] = {}
+
+    for team_link, players in _rotowire_cards(content):
+        team_abbrev = _match_rotowire_team(team_link, link_tokens)
+        if not team_abbrev or team_abbrev in injuries:
+            continue
+
+        team_injuries = injuries.setdefault(team_abbrev, [])
+        for player_name, player_classes, title, span in players:
+            if span is None and 'injured' not in player_classes.lower() and 'out' not in title.lower():
+                continue
+
+            injury_text = ''
+            status = 'Day-To-Day'
+            if span is not None:
+                injury_text, injury_classes = span
+                status = _status_from_span(injury_text, injury_classes)
+
+            team_injuries.append(_injury(player_name, injury_text, status, True, star_set))
+
+    return injuries
+
+
+def _rotowire_link_tokens(team_slugs: Dict[str, str]) -> Dict[str, str]:
+    """Whole link token (lowercase tricode or slug) -> team_abbrev."""
+    tokens = {slug.lower(): abbrev for abbrev, slug in team_slugs.items()}
+    tokens.update((abbrev.lower(), abbrev) for abbrev in team_slugs)
+    return tokens
+
+
+def _match_rotowire_team(team_link: str, link_tokens: Dict[str, str]):
+    """
+    Team abbreviation for a lineup card link such as
+    "/basketball/team/golden-state-warriors-gsw".
+
+    Tokens are compared whole, trailing tricode first, so "charlotte-hornets"
+    never matches the "nets" slug nor "golden-state" the "den" tricode.
+    """
+    for token in reversed(_LINK_TOKEN_RE.findall(team_link.lower())):
+        if token in link_tokens:
+            return link_tokens[token]
+    return None
+
+
+def _rotowire_cards(content: bytes):
+    """
+    Yield (team_link, players) per lineup card, where players is a list of
+    (name, li_classes, li_title, (injury_text, injury_classes) or None).
+    """
+    if LXML_AVAILABLE:
+        doc = lxml_html.fromstring(content)
+        for card in doc.find_class('lineup__box'):
+            header = card.xpath(".//a[contains(concat(' ', normalize-space(@class), ' '), ' lineup__team ')]")
+            if not header:
+                continue
+            players = []
+            for li in card.xpath(".//li[contains(concat(' ', normalize-space(@class), ' '), ' lineup__player ')]"):
+                link = li.find('.//a')
+                if link is None:
+                    continue
+                span = li.xpath(".//span[contains(concat(' ', normalize-space(@class), ' '), ' lineup__inj ')]")
+                span_info = None
+                if span:
+                    span_info = (span[0].get('title', '') or _clean(span[0].text_content()),
+                                 span[0].get('class', ''))
+                players.append((_clean(link.text_content()), li.get('class', ''),
+                                li.get('title', ''), span_info))
+            yield header[0].get('href', ''), players
+        return
+
+    strainer = SoupStrainer('div', class_='lineup__box')
+    soup = BeautifulSoup(content, 'html.parser', parse_only=strainer)
+    for card in soup.find_all('div', class_='lineup__box'):
+        header = card.find('a', class_='lineup__team')
+        if not header:
+            continue
+        players = []
+        for li in card.find_all('li', class_='lineup__player'):
+            link = li.find('a')
+            if not link:
+                continue
+            span = li.find('span', class_='lineup__inj')
+            span_info = None
+            if span:
+                span_info = (span.get('title', '') or span.get_text().strip(),
+                             ' '.join(span.get('class', [])))
+            players.append((link.get_text().strip(), ' '.join(li.get('class', [])),
+                            li.get('title', ''), span_info))
+        yield header.get('href', ''), players
@@ -3,13 +3,22 @@ NBA Injury Tracker
 Fetches and caches injury information for NBA teams
 """
 
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
+from src.http_client import http_get
+from src.injury_parsers import (
+    build_star_set,
+    normalize_player_name,
+    parse_hashtag_report,
+    parse_rotowire_lineups
+)
+
 class InjuryTracker:
     """
     Tracks NBA player injuries using ESPN's injury report.
@@ -19,7 +28,13 @@ class InjuryTracker:
     def __init__(self, db_path: str = "data/nba_predictor.db"):
         self.db_path = Path(db_path)
         self.cache_duration_hours = 6  # Refresh every 6 hours
-        self._init_injury_table()
+        self.fetch_deadline_seconds = 12  # All sources share one deadline per refresh
+        
+        # League-wide snapshot shared by every team lookup (team_id -> injuries)
+        self._snapshot: Optional[Dict[int, List[Dict]]] = None
+        self._snapshot_time: Optional[datetime] = None
+        self._snapshot_lock = threading.Lock()
+        self._failed_at: Optional[datetime] = None
         
         # NBA team abbreviations mapping
         self.team_abbrev_map = {
@@ -42,9 +57,20 @@ class InjuryTracker:
             'Jaylen Brown', 'Anthony Edwards', 'Tyrese Haliburton', 'Shai Gilgeous-Alexander',
             'Paolo Banchero', 'Lauri Markkanen', 'De\'Aaron Fox', 'Domantas Sabonis',
         }
+        
+        # Normalized names, so star checks are one set lookup per player
+        self._star_set = build_star_set(self.all_stars)
+        
+        # After the team maps: legacy-row migration needs team_abbrev_map
+        self._init_injury_table()
     
     def _init_injury_table(self):
-        """Initialize injury tracking table in database."""
+        """
+        Initialize injury tracking tables in database.
+        
+        `injuries` is the legacy append-only table (one full copy per fetch);
+        its rows are migrated into injury_versions on startup.
+        """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -64,13 +90,119 @@ class InjuryTracker:
             )
         """)
         
+        # One header row per league-wide scrape
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS injury_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fetched_at TIMESTAMP UNIQUE,
+                sources TEXT,
+                teams_reported INTEGER,
+                total_rows INTEGER,
+                changed_rows INTEGER
+            )
+        """)
+        
+        # Versioned injury rows: a row is valid from the snapshot where its
+        # status first appeared until (excluding) the snapshot where it changed.
+        # valid_to_snapshot IS NULL means the row is still current.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS injury_versions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                team_id INTEGER,
+                team_abbrev TEXT,
+                player_name TEXT,
+                position TEXT,
+                status TEXT,
+                injury_type TEXT,
+                is_starter BOOLEAN,
+                is_star BOOLEAN,
+                valid_from_snapshot INTEGER,
+                valid_to_snapshot INTEGER
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_injury_versions_team_snapshot
+            ON injury_versions(team_id, valid_from_snapshot)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_injury_versions_open
+            ON injury_versions(valid_to_snapshot)
+        """)
+        
+        # One row per source fetch attempt (latency / success tracking)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS injury_source_fetches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT,
+                fetched_at TIMESTAMP,
+                outcome TEXT,
+                latency_ms REAL,
+                teams_reported INTEGER,
+                error TEXT
+            )
+        """)
+        
+        # Add missing columns for existing DBs
+        try:
+            cursor.execute("ALTER TABLE injury_snapshots ADD COLUMN changed_rows INTEGER")
+        except sqlite3.OperationalError:
+            pass
+        
         conn.commit()
+        
+        # Fold legacy rows in before this process writes any new snapshot,
+        # so snapshot ids stay in fetch-time order
+        with conn:
+            self._migrate_legacy_rows(conn)
         conn.close()
     
+    # Injury sources, highest priority first: (name, scraper method name).
+    # All are fetched concurrently; for each team the first source in this
+    # list that reports injuries wins.
+    INJURY_SOURCES = [
+        ('hashtagbasketball', '_scrape_cbs_injuries'),
+        ('rotowire', '_scrape_rotowire_injuries'),
+    ]
+
+    # Sources that list every injured player in the league; a team they omit
+    # has no injuries. Other sources only cover the teams on their page.
+    LEAGUE_WIDE_SOURCES = {'hashtagbasketball'}
+
+    # Wait this long before re-scraping after every source failed
+    FAILURE_BACKOFF = timedelta(minutes=10)
+
+    # Team name fragments used by the Hashtag Basketball injury table
+    CBS_TEAM_NAMES = {
+        'ATL': 'Atlanta', 'BOS': 'Boston', 'BKN': 'Brooklyn', 'CHA': 'Charlotte',
+        'CHI': 'Chicago', 'CLE': 'Cleveland', 'DAL': 'Dallas', 'DEN': 'Denver',
+        'DET': 'Detroit', 'GSW': 'Golden State', 'HOU': 'Houston', 'IND': 'Indiana',
+        'LAC': 'Clippers', 'LAL': 'Lakers', 'MEM': 'Memphis', 'MIA': 'Miami',
+        'MIL': 'Milwaukee', 'MIN': 'Minnesota', 'NOP': 'New Orleans', 'NYK': 'Knicks',
+        'OKC': 'Oklahoma', 'ORL': 'Orlando', 'PHI': 'Philadelphia', 'PHX': 'Phoenix',
+        'POR': 'Portland', 'SAC': 'Sacramento', 'SAS': 'San Antonio', 'TOR': 'Toronto',
+        'UTA': 'Utah', 'WAS': 'Washington'
+    }
+
+    # Team slugs used in Rotowire lineup card links
+    ROTOWIRE_TEAM_SLUGS = {
+        'ATL': 'hawks', 'BOS': 'celtics', 'BKN': 'nets', 'CHA': 'hornets',
+        'CHI': 'bulls', 'CLE': 'cavaliers', 'DAL': 'mavericks', 'DEN': 'nuggets',
+        'DET': 'pistons', 'GSW': 'warriors', 'HOU': 'rockets', 'IND': 'pacers',
+        'LAC': 'clippers', 'LAL': 'lakers', 'MEM': 'grizzlies', 'MIA': 'heat',
+        'MIL': 'bucks', 'MIN': 'timberwolves', 'NOP': 'pelicans', 'NYK': 'knicks',
+        'OKC': 'thunder', 'ORL': 'magic', 'PHI': '76ers', 'PHX': 'suns',
+        'POR': 'blazers', 'SAC': 'kings', 'SAS': 'spurs', 'TOR': 'raptors',
+        'UTA': 'jazz', 'WAS': 'wizards'
+    }
+
     def get_team_injuries(self, team_id: int, force_refresh: bool = False) -> Dict:
         """
         Get injury information for a team.
         
+        Reads the league-wide injury snapshot (see refresh_snapshot), so a
+        whole slate costs one download per source per refresh window.
+        
         Args:
             team_id: NBA team ID
             force_refresh: If True, bypass cache and fetch fresh data
@@ -82,259 +214,500 @@ class InjuryTracker:
             - total_injured: Total number of injured players
             - injuries: List of injury details
         """
-        # Check cache first
-        if not force_refresh:
-            cached = self._get_cached_injuries(team_id)
-            if cached is not None:
-                return cached
-        
-        # Fetch fresh data
-        team_abbrev = self.team_abbrev_map.get(team_id)
-        if not team_abbrev:
+        if team_id not in self.team_abbrev_map:
             return self._empty_injury_dict()
         
         try:
-            injuries = self._scrape_espn_injuries(team_abbrev)
-            
-            # Save to cache
-            self._cache_injuries(team_id, team_abbrev, injuries)
-            
-            # Calculate stats
-            return self._calculate_injury_stats(injuries)
-            
+            snapshot = self.get_snapshot(force_refresh=force_refresh)
         except Exception as e:
             print(f"Error fetching injuries for team {team_id}: {e}")
             return self._empty_injury_dict()
+        
+        return self._calculate_injury_stats(snapshot.get(team_id, []))
     
-    def _get_cached_injuries(self, team_id: int) -> Optional[Dict]:
-        """Get injuries from cache if recent enough."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_snapshot(self, force_refresh: bool = False) -> Dict[int, List[Dict]]:
+        """
+        Get the current league-wide injury snapshot (team_id -> injuries).
         
-        cutoff_time = datetime.now() - timedelta(hours=self.cache_duration_hours)
+        Served from memory, then from the latest snapshot in the database,
+        and only re-scraped once it is older than cache_duration_hours.
+        """
+        with self._snapshot_lock:
+            cutoff_time = datetime.now() - timedelta(hours=self.cache_duration_hours)
+            
+            if not force_refresh:
+                if self._snapshot is not None and self._snapshot_time > cutoff_time:
+                    return self._snapshot
+                
+                cached = self._load_latest_snapshot(cutoff_time)
+                if cached is not None:
+                    self._snapshot_time, self._snapshot = cached
+                    return self._snapshot
+                
+                # Sources were down moments ago - don't hammer them once per team
+                if self._failed_at and datetime.now() - self._failed_at < self.FAILURE_BACKOFF:
+                    return {}
+            
+            return self.refresh_snapshot()
+    
+    def refresh_snapshot(self) -> Dict[int, List[Dict]]:
+        """
+        Scrape every source page once, parse all teams in one pass and
+        persist the snapshot in a single transaction.
         
-        cursor.execute("""
-            SELECT player_name, position, status, injury_type, is_starter, is_star
-            FROM injuries
-            WHERE team_id = ? AND fetched_at > ?
-        """, (team_id, cutoff_time.isoformat()))
+        Sources are fetched concurrently under fetch_deadline_seconds; a slow
+        or failing source is dropped rather than blocking the slate. Results
+        are merged by INJURY_SOURCES priority.
+        """
+        results = self._fetch_sources()
         
-        rows = cursor.fetchall()
-        conn.close()
+        by_abbrev: Dict[str, List[Dict]] = {}
+        sources = []
+        covered_abbrevs = set()
+        for name, _ in self.INJURY_SOURCES:
+            if name not in results:
+                continue
+            source_injuries, source_covered = results[name]
+            sources.append(name)
+            covered_abbrevs |= source_covered
+            for abbrev, injuries in source_injuries.items():
+                if injuries and not by_abbrev.get(abbrev):
+                    by_abbrev[abbrev] = injuries
         
-        if not rows:
-            return None
+        abbrev_to_id = {abbrev: team_id for team_id, abbrev in self.team_abbrev_map.items()}
+        snapshot = {
+            abbrev_to_id[abbrev]: injuries
+            for abbrev, injuries in by_abbrev.items()
+            if abbrev in abbrev_to_id
+        }
         
-        injuries = [
-            {
-                'player': row[0],
-                'position': row[1],
-                'status': row[2],
-                'injury': row[3],
-                'is_starter': bool(row[4]),
-                'is_star': bool(row[5])
-            }
-            for row in rows
-        ]
+        fetched_at = datetime.now()
+        if not sources:
+            # Every source failed: don't cache the empty result, just back off
+            self._failed_at = fetched_at
+            return {}
         
-        return self._calculate_injury_stats(injuries)
+        # Only teams a finished source covered are diffed: if the league-wide
+        # report missed the deadline, the other teams keep their last state
+        covered = {abbrev_to_id[abbrev] for abbrev in covered_abbrevs if abbrev in abbrev_to_id}
+        snapshot = self._save_snapshot(snapshot, fetched_at, sources, covered)
+        self._snapshot = snapshot
+        self._snapshot_time = fetched_at
+        return snapshot
     
-    def _scrape_espn_injuries(self, team_abbrev: str) -> List[Dict]:
+    def _fetch_sources(self) -> Dict[str, Tuple[Dict[str, List[Dict]], Set[str]]]:
         """
-        Scrape injury data from CBS Sports (more reliable than ESPN JS-rendered pages).
-        Falls back to Rotowire lineups if CBS fails.
+        Run every injury source concurrently under one deadline.
+        
+        Returns:
+            source name -> ({team_abbrev: injuries}, covered team abbrevs) for
+            sources that finished successfully with data; failed/late/empty
+            sources are omitted. League-wide sources cover every team, the
+            others only the teams they list.
         """
-        injuries = []
-
-        # Try CBS Sports first (server-rendered HTML)
-        try:
-            injuries = self._scrape_cbs_injuries(team_abbrev)
+        started_at = datetime.now()
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=len(self.INJURY_SOURCES),
+                                      thread_name_prefix='injury-source')
+        
+        def timed(method_name):
+            t0 = time.perf_counter()
+            result = getattr(self, method_name)()
+            return result, (time.perf_counter() - t0) * 1000
+        
+        futures = {
+            executor.submit(timed, method_name): name
+            for name, method_name in self.INJURY_SOURCES
+        }
+        done, _ = wait(futures, timeout=self.fetch_deadline_seconds)
+        # Don't wait for stragglers - their results are discarded
+        executor.shutdown(wait=False)
+        
+        results = {}
+        fetch_log = []
+        for future, name in futures.items():
+            if future not in done:
+                print(f"Injury source {name} missed the {self.fetch_deadline_seconds}s deadline")
+                fetch_log.append((name, 'timeout', (time.perf_counter() - start) * 1000, 0, None))
+                continue
+            try:
+                injuries, latency_ms = future.result()
+            except Exception as e:
+                print(f"Injury source {name} failed: {e}")
+                fetch_log.append((name, 'error', (time.perf_counter() - start) * 1000, 0, str(e)[:200]))
+                continue
+            
             if injuries:
-                return injuries
-        except Exception as e:
-            print(f"CBS scrape failed for {team_abbrev}: {e}")
-
-        # Fallback to Rotowire lineups page
+                if name in self.LEAGUE_WIDE_SOURCES:
+                    covered = set(self.team_abbrev_map.values())
+                else:
+                    covered = set(injuries)
+                results[name] = (injuries, covered)
+                fetch_log.append((name, 'ok', latency_ms, len(injuries), None))
+            else:
+                fetch_log.append((name, 'empty', latency_ms, 0, None))
+        
+        self._record_source_fetches(started_at, fetch_log)
+        return results
+    
+    def _record_source_fetches(self, fetched_at: datetime, fetch_log: List[tuple]):
+        """Persist per-source outcomes and latency for get_source_stats()."""
         try:
-            injuries = self._scrape_rotowire_injuries(team_abbrev)
-        except Exception as e:
-            print(f"Rotowire scrape failed for {team_abbrev}: {e}")
-
-        return injuries
+            conn = sqlite3.connect(self.db_path)
+            with conn:
+                conn.executemany("""
+                    INSERT INTO injury_source_fetches
+                    (source, fetched_at, outcome, latency_ms, teams_reported, error)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [
+                    (name, fetched_at.isoformat(), outcome, round(latency_ms, 1), teams, error)
+                    for name, outcome, latency_ms, teams, error in fetch_log
+                ])
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error recording injury source stats: {e}")
+    
+    def get_source_stats(self, days: int = 30) -> Dict[str, Dict]:
+        """
+        Per-source success rate and latency over the last `days`.
+        
+        Returns:
+            source -> {attempts, ok, empty, errors, timeouts, success_rate,
+                       avg_latency_ms, max_latency_ms}
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("""
+            SELECT source,
+                   COUNT(*),
+                   SUM(outcome = 'ok'),
+                   SUM(outcome = 'empty'),
+                   SUM(outcome = 'error'),
+                   SUM(outcome = 'timeout'),
+                   AVG(latency_ms),
+                   MAX(latency_ms)
+            FROM injury_source_fetches
+            WHERE fetched_at > ?
+            GROUP BY source
+        """, (cutoff,)).fetchall()
+        conn.close()
+        
+        return {
+            row[0]: {
+                'attempts': row[1],
+                'ok': row[2],
+                'empty': row[3],
+                'errors': row[4],
+                'timeouts': row[5],
+                'success_rate': row[2] / row[1] if row[1] else 0.0,
+                'avg_latency_ms': round(row[6] or 0, 1),
+                'max_latency_ms': round(row[7] or 0, 1)
+            }
+            for row in rows
+        }
+    
+    def _load_latest_snapshot(self, cutoff_time: datetime):
+        """Load the newest stored snapshot newer than cutoff_time, or None."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT id, fetched_at FROM injury_snapshots
+            WHERE fetched_at > ?
+            ORDER BY id DESC
+            LIMIT 1
+        """, (cutoff_time.isoformat(),))
+        header = cursor.fetchone()
+        
+        if not header:
+            conn.close()
+            return None
+        
+        snapshot = self._read_snapshot(conn, header[0])
+        conn.close()
+        
+        return datetime.fromisoformat(header[1]), snapshot
+    
+    def _read_snapshot(self, conn: sqlite3.Connection, snapshot_id: int,
+                       team_id: Optional[int] = None) -> Dict[int, List[Dict]]:
+        """Rebuild team_id -> injuries as they were at a snapshot."""
+        query = """
+            SELECT team_id, player_name, position, status, injury_type, is_starter, is_star
+            FROM injury_versions
+            WHERE valid_from_snapshot <= ?
+              AND (valid_to_snapshot IS NULL OR valid_to_snapshot > ?)
+        """
+        params = [snapshot_id, snapshot_id]
+        if team_id is not None:
+            query += " AND team_id = ?"
+            params.append(team_id)
+        
+        snapshot: Dict[int, List[Dict]] = {}
+        for row in conn.execute(query, params):
+            snapshot.setdefault(row[0], []).append({
+                'player': row[1],
+                'position': row[2],
+                'status': row[3],
+                'injury': row[4],
+                'is_starter': bool(row[5]),
+                'is_star': bool(row[6])
+            })
+        return snapshot
+    
+    def get_snapshot_as_of(self, as_of) -> Dict[int, List[Dict]]:
+        """
+        Point-in-time lookup: the injury snapshot that was current at `as_of`.
+        
+        Intended for training backfills, so features only see injuries
+        known before tip-off.
+        
+        Args:
+            as_of: datetime or ISO date/time string
+            
+        Returns:
+            team_id -> injuries, or {} if no snapshot precedes as_of
+        """
+        as_of_str = as_of.isoformat() if isinstance(as_of, datetime) else str(as_of)
+        
+        conn = sqlite3.connect(self.db_path)
+        header = conn.execute("""
+            SELECT id FROM injury_snapshots
+            WHERE fetched_at <= ?
+            ORDER BY fetched_at DESC
+            LIMIT 1
+        """, (as_of_str,)).fetchone()
+        
+        snapshot = self._read_snapshot(conn, header[0]) if header else {}
+        conn.close()
+        return snapshot
+    
+    def get_injury_features_as_of(self, home_team_id: int, away_team_id: int,
+                                  as_of) -> Dict[str, float]:
+        """Same as get_injury_features, but from the snapshot current at `as_of`."""
+        snapshot = self.get_snapshot_as_of(as_of)
+        home_injuries = self._calculate_injury_stats(snapshot.get(home_team_id, []))
+        away_injuries = self._calculate_injury_stats(snapshot.get(away_team_id, []))
+        
+        return {
+            'home_injured_starters': home_injuries['injured_starters'],
+            'away_injured_starters': away_injuries['injured_starters'],
+            'home_star_injured': home_injuries['star_injured'],
+            'away_star_injured': away_injuries['star_injured'],
+        }
+    
+    def _is_star(self, player_name: str) -> bool:
+        """Check a player name against the All-Star list."""
+        return normalize_player_name(player_name) in self._star_set
 
-    def _scrape_cbs_injuries(self, team_abbrev: str) -> List[Dict]:
-        """Scrape injuries from Hashtag Basketball (reliable, regularly updated)."""
+    def _scrape_cbs_injuries(self) -> Dict[str, List[Dict]]:
+        """
+        Scrape the league injury report from Hashtag Basketball (reliable,
+        regularly updated) and group rows by team abbreviation.
+        """
         url = "https://hashtagbasketball.com/nba-injury-report"
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         }
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        injuries = []
-
-        # Team name mapping for matching
-        team_name_map = {
-            'ATL': 'Atlanta', 'BOS': 'Boston', 'BKN': 'Brooklyn', 'CHA': 'Charlotte',
-            'CHI': 'Chicago', 'CLE': 'Cleveland', 'DAL': 'Dallas', 'DEN': 'Denver',
-            'DET': 'Detroit', 'GSW': 'Golden State', 'HOU': 'Houston', 'IND': 'Indiana',
-            'LAC': 'Clippers', 'LAL': 'Lakers', 'MEM': 'Memphis', 'MIA': 'Miami',
-            'MIL': 'Milwaukee', 'MIN': 'Minnesota', 'NOP': 'New Orleans', 'NYK': 'Knicks',
-            'OKC': 'Oklahoma', 'ORL': 'Orlando', 'PHI': 'Philadelphia', 'PHX': 'Phoenix',
-            'POR': 'Portland', 'SAC': 'Sacramento', 'SAS': 'San Antonio', 'TOR': 'Toronto',
-            'UTA': 'Utah', 'WAS': 'Washington'
-        }
-        team_search = team_name_map.get(team_abbrev, team_abbrev)
+        return parse_hashtag_report(response.content, self.CBS_TEAM_NAMES, self._star_set)
 
-        # Find injury table rows
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 4:
-                    # Check if this row is for our team
-                    row_text = row.get_text().lower()
-                    if team_search.lower() in row_text:
-                        player_name = cells[0].get_text().strip()
-                        team = cells[1].get_text().strip() if len(cells) > 1 else ''
-                        injury_type = cells[2].get_text().strip() if len(cells) > 2 else ''
-                        status = cells[3].get_text().strip() if len(cells) > 3 else 'Out'
-
-                        is_star = any(star.lower() in player_name.lower() for star in self.all_stars)
-
-                        injuries.append({
-                            'player': player_name,
-                            'position': '',
-                            'injury': injury_type,
-                            'status': status,
-                            'is_starter': False,
-                            'is_star': is_star
-                        })
-
-        return injuries
-
-    def _scrape_rotowire_injuries(self, team_abbrev: str) -> List[Dict]:
-        """Scrape injuries from Rotowire NBA lineups page."""
+    def _scrape_rotowire_injuries(self) -> Dict[str, List[Dict]]:
+        """Scrape injuries for every team on the Rotowire NBA lineups page."""
         url = "https://www.rotowire.com/basketball/nba-lineups.php"
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
         }
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        injuries = []
-
-        # Map team abbreviations to Rotowire URL patterns
-        team_url_map = {
-            'ATL': 'hawks', 'BOS': 'celtics', 'BKN': 'nets', 'CHA': 'hornets',
-            'CHI': 'bulls', 'CLE': 'cavaliers', 'DAL': 'mavericks', 'DEN': 'nuggets',
-            'DET': 'pistons', 'GSW': 'warriors', 'HOU': 'rockets', 'IND': 'pacers',
-            'LAC': 'clippers', 'LAL': 'lakers', 'MEM': 'grizzlies', 'MIA': 'heat',
-            'MIL': 'bucks', 'MIN': 'timberwolves', 'NOP': 'pelicans', 'NYK': 'knicks',
-            'OKC': 'thunder', 'ORL': 'magic', 'PHI': '76ers', 'PHX': 'suns',
-            'POR': 'blazers', 'SAC': 'kings', 'SAS': 'spurs', 'TOR': 'raptors',
-            'UTA': 'jazz', 'WAS': 'wizards'
+        return parse_rotowire_lineups(response.content, self.ROTOWIRE_TEAM_SLUGS, self._star_set)
+    
+    @staticmethod
+    def _version_key(injury: Dict) -> tuple:
+        """Fields whose change opens a new version of a player's row."""
+        return (
+            injury['status'], injury['injury'], injury['position'],
+            bool(injury['is_starter']), bool(injury['is_star'])
+        )
+    
+    def _apply_snapshot(self, conn: sqlite3.Connection, snapshot_id: int,
+                        snapshot: Dict[int, List[Dict]], team_ids) -> int:
+        """
+        Diff a snapshot against the open versions of the given teams.
+        
+        Unchanged rows stay open, changed or cleared rows are closed at
+        snapshot_id, and new/changed rows are inserted. Returns the number
+        of rows inserted or closed.
+        """
+        team_ids = list(team_ids)
+        if not team_ids:
+            return 0
+        
+        placeholders = ','.join('?' * len(team_ids))
+        open_rows = conn.execute(f"""
+            SELECT id, team_id, player_name, status, injury_type, position, is_starter, is_star
+            FROM injury_versions
+            WHERE valid_to_snapshot IS NULL AND team_id IN ({placeholders})
+        """, team_ids).fetchall()
+        current = {
+            (row[1], row[2]): (row[0], (row[3], row[4], row[5], bool(row[6]), bool(row[7])))
+            for row in open_rows
         }
-
-        team_pattern = team_url_map.get(team_abbrev, team_abbrev.lower())
-
-        # Find the team's lineup card
-        team_cards = soup.find_all('div', class_='lineup__box')
-
-        for card in team_cards:
-            # Check if this is the right team
-            team_header = card.find('a', class_='lineup__team')
-            if not team_header:
-                continue
-
-            team_link = team_header.get('href', '').lower()
-            # Match team pattern in the link
-            if team_pattern not in team_link and team_abbrev.lower() not in team_link:
-                continue
-
-            # Find all players and check for injury indicators
-            all_players = card.find_all('li', class_='lineup__player')
-
-            for player_li in all_players:
-                # Check for any injury-related classes or elements
-                player_classes = ' '.join(player_li.get('class', []))
-                injury_span = player_li.find('span', class_='lineup__inj')
-
-                # Also look for injury status in title attributes
-                title = player_li.get('title', '')
-
-                player_link = player_li.find('a')
-                if not player_link:
+        
+        to_insert = []
+        seen = set()
+        for team_id in team_ids:
+            for injury in snapshot.get(team_id, []):
+                key = (team_id, injury['player'])
+                if key in seen:
                     continue
-
-                player_name = player_link.get_text().strip()
-
-                # Check if player has injury indicator
-                if injury_span or 'injured' in player_classes.lower() or 'out' in title.lower():
-                    injury_text = ''
-                    status = 'Day-To-Day'
-
-                    if injury_span:
-                        injury_text = injury_span.get('title', '') or injury_span.get_text().strip()
-                        injury_classes = ' '.join(injury_span.get('class', []))
-
-                        # Determine status
-                        if 'is-out' in injury_classes or injury_text.upper().startswith('O'):
-                            status = 'Out'
-                        elif 'is-gtd' in injury_classes or injury_text.upper().startswith('GTD'):
-                            status = 'Game-Time-Decision'
-                        elif 'is-questionable' in injury_classes or injury_text.upper().startswith('Q'):
-                            status = 'Questionable'
-                        elif 'is-doubtful' in injury_classes or injury_text.upper().startswith('D'):
-                            status = 'Doubtful'
-
-                    is_star = any(star.lower() in player_name.lower() for star in self.all_stars)
-
-                    injuries.append({
-                        'player': player_name,
-                        'position': '',
-                        'injury': injury_text,
-                        'status': status,
-                        'is_starter': True,
-                        'is_star': is_star
-                    })
-
-            # We found the team, no need to check other cards
-            break
-
-        return injuries
+                seen.add(key)
+                existing = current.get(key)
+                if existing and existing[1] == self._version_key(injury):
+                    continue
+                to_insert.append((
+                    team_id, self.team_abbrev_map.get(team_id), injury['player'],
+                    injury['position'], injury['status'], injury['injury'],
+                    injury['is_starter'], injury['is_star'], snapshot_id
+                ))
+        
+        inserted_keys = {(row[0], row[2]) for row in to_insert}
+        to_close = [
+            (snapshot_id, row_id)
+            for key, (row_id, _) in current.items()
+            if key not in seen or key in inserted_keys
+        ]
+        
+        conn.executemany(
+            "UPDATE injury_versions SET valid_to_snapshot = ? WHERE id = ?",
+            to_close
+        )
+        conn.executemany("""
+            INSERT INTO injury_versions
+            (team_id, team_abbrev, player_name, position, status, injury_type,
+             is_starter, is_star, valid_from_snapshot)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, to_insert)
+        
+        return len(to_insert) + len(to_close)
     
-    def _cache_injuries(self, team_id: int, team_abbrev: str, injuries: List[Dict]):
-        """Save injuries to database cache."""
+    def _save_snapshot(self, snapshot: Dict[int, List[Dict]], fetched_at: datetime,
+                       sources: List[str], team_ids) -> Dict[int, List[Dict]]:
+        """
+        Save a snapshot in one transaction.
+        
+        Writes a header row, then only the rows whose status changed since
+        the previous snapshot. Only the teams in team_ids (those the sources
+        covered) are diffed: a covered team absent from the snapshot has no
+        injuries, an uncovered team keeps its open versions.
+        
+        Returns:
+            The full league state as of the new snapshot (team_id -> injuries)
+        """
+        total_rows = sum(len(injuries) for injuries in snapshot.values())
+        
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with conn:
+            cursor = conn.execute("""
+                INSERT INTO injury_snapshots (fetched_at, sources, teams_reported, total_rows)
+                VALUES (?, ?, ?, ?)
+            """, (fetched_at.isoformat(), ','.join(sources), len(snapshot), total_rows))
+            snapshot_id = cursor.lastrowid
+            changed = self._apply_snapshot(conn, snapshot_id, snapshot, team_ids)
+            conn.execute(
+                "UPDATE injury_snapshots SET changed_rows = ? WHERE id = ?",
+                (changed, snapshot_id)
+            )
+        league = self._read_snapshot(conn, snapshot_id)
+        conn.close()
+        return league
+    
+    def _migrate_legacy_rows(self, conn: sqlite3.Connection) -> int:
+        """
+        Replay rows of the legacy `injuries` table as versioned snapshots
+        (each legacy fetch covers only the teams it contains), then empty it.
+        """
+        legacy = conn.execute("""
+            SELECT team_id, player_name, position, status, injury_type,
+                   is_starter, is_star, fetched_at
+            FROM injuries
+            ORDER BY fetched_at
+        """).fetchall()
+        if not legacy:
+            return 0
         
-        now = datetime.now().isoformat()
+        groups: Dict[str, Dict[int, List[Dict]]] = {}
+        for row in legacy:
+            groups.setdefault(row[7], {}).setdefault(row[0], []).append({
+                'player': row[1],
+                'position': row[2],
+                'status': row[3],
+                'injury': row[4],
+                'is_starter': bool(row[5]),
+                'is_star': bool(row[6])
+            })
         
-        for injury in injuries:
-            try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO injuries 
-                    (team_id, team_abbrev, player_name, position, status, injury_type, 
-                     is_starter, is_star, fetched_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    team_id, team_abbrev, injury['player'], injury['position'],
-                    injury['status'], injury['injury'], injury['is_starter'],
-                    injury['is_star'], now
-                ))
-            except Exception as e:
-                print(f"Error caching injury: {e}")
-                continue
+        for fetched_at, snapshot in groups.items():
+            conn.execute("""
+                INSERT OR IGNORE INTO injury_snapshots
+                (fetched_at, sources, teams_reported, total_rows)
+                VALUES (?, 'legacy', ?, ?)
+            """, (fetched_at, len(snapshot), sum(len(v) for v in snapshot.values())))
+            snapshot_id = conn.execute(
+                "SELECT id FROM injury_snapshots WHERE fetched_at = ?", (fetched_at,)
+            ).fetchone()[0]
+            self._apply_snapshot(conn, snapshot_id, snapshot, snapshot.keys())
         
-        conn.commit()
+        conn.execute("DELETE FROM injuries")
+        return len(legacy)
+    
+    def compact_history(self, retention_days: int = 120) -> Dict[str, int]:
+        """
+        Retention/compaction job for injury history.
+        
+        1. Migrates any remaining rows from the legacy `injuries` table
+        2. Drops snapshots older than retention_days and version rows that
+           closed before the oldest retained snapshot
+        
+        Args:
+            retention_days: Days of history to keep for point-in-time lookups
+            
+        Returns:
+            Counts of migrated legacy rows and deleted snapshots/versions
+        """
+        stats = {'legacy_rows_migrated': 0, 'snapshots_deleted': 0, 'versions_deleted': 0}
+        
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            stats['legacy_rows_migrated'] = self._migrate_legacy_rows(conn)
+            
+            cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+            
+            # Always keep the newest snapshot, however old
+            cursor = conn.execute("""
+                DELETE FROM injury_snapshots
+                WHERE fetched_at < ?
+                  AND id < (SELECT MAX(id) FROM injury_snapshots)
+            """, (cutoff,))
+            stats['snapshots_deleted'] = cursor.rowcount
+            
+            cursor = conn.execute("""
+                DELETE FROM injury_versions
+                WHERE valid_to_snapshot IS NOT NULL
+                  AND valid_to_snapshot <= (SELECT MIN(id) FROM injury_snapshots)
+            """)
+            stats['versions_deleted'] = cursor.rowcount
+            
+            conn.execute("DELETE FROM injury_source_fetches WHERE fetched_at < ?", (cutoff,))
         conn.close()
+        
+        return stats
     
     def _calculate_injury_stats(self, injuries: List[Dict]) -> Dict:
         """Calculate injury statistics from injury list."""
@@ -9,9 +9,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import numpy as np
-from nba_api.stats.endpoints import scoreboardv2, leaguegamefinder
 import time
-from nba_api.stats.static import teams
+from src.prediction_schema import backfill_game_ids, migrate_predictions_table, prediction_keys
+from src.team_identity import TEAMS_BY_ID, resolve_team_id, team_full_name, team_tricode, teams_match
 
 
 class ModelFeedbackSystem:
@@ -24,26 +24,6 @@ class ModelFeedbackSystem:
         self.db_path = Path(db_path)
         self.conn = sqlite3.connect(self.db_path)
         self._ensure_schema()
-        
-        # Create team name normalization maps (full name <-> abbreviation)
-        all_teams = teams.get_teams()
-        self.team_full_to_abbrev = {t['full_name']: t['abbreviation'] for t in all_teams}
-        self.team_abbrev_to_full = {t['abbreviation']: t['full_name'] for t in all_teams}
-        self.team_name_variations = {}
-        for t in all_teams:
-            # Create variations: full name, abbreviation, lowercase versions
-            full = t['full_name']
-            abbrev = t['abbreviation']
-            self.team_name_variations[full.lower()] = full
-            self.team_name_variations[abbrev.lower()] = full
-            self.team_name_variations[full] = full
-            self.team_name_variations[abbrev] = full
-
-            # Add common alternative names (e.g., "LA Clippers" for "Los Angeles Clippers")
-            if 'Los Angeles' in full:
-                la_short = full.replace('Los Angeles', 'LA')
-                self.team_name_variations[la_short.lower()] = full
-                self.team_name_variations[la_short] = full
 
     def _ensure_schema(self):
         """Ensure predictions table has all necessary columns"""
@@ -94,8 +74,52 @@ class ModelFeedbackSystem:
             )
         ''')
 
+        # Per-day sufficient statistics of verified predictions; any window
+        # (7/30/90 days, season) is answered by summing rows
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS prediction_metrics_daily (
+                game_date TEXT PRIMARY KEY,
+                total_predictions INTEGER,
+                graded INTEGER,
+                correct INTEGER,
+                error_count INTEGER,
+                sum_squared_error REAL,
+                sum_calibration_error REAL,
+                confidence_count INTEGER,
+                sum_confidence REAL,
+                high_conf_graded INTEGER,
+                high_conf_correct INTEGER,
+                low_conf_graded INTEGER,
+                low_conf_correct INTEGER,
+                home_pick_graded INTEGER,
+                home_pick_correct INTEGER,
+                favorite_graded INTEGER,
+                favorite_correct INTEGER,
+                updated_at TEXT
+            ) WITHOUT ROWID
+        ''')
+
+        # Calibration buckets (by predicted winner probability) per day
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS prediction_calibration_daily (
+                game_date TEXT,
+                bucket REAL,
+                predictions INTEGER,
+                hits INTEGER,
+                sum_probability REAL,
+                PRIMARY KEY (game_date, bucket)
+            ) WITHOUT ROWID
+        ''')
+
         self.conn.commit()
 
+        # Team IDs / game_id / model_version (added and backfilled for older DBs)
+        migrate_predictions_table(self.conn)
+
+        # First run on an existing DB: build the rollup once from history
+        if cursor.execute('SELECT 1 FROM prediction_metrics_daily LIMIT 1').fetchone() is None:
+            self.refresh_daily_metrics()
+
     def save_prediction(self, prediction_data: Dict):
         """
         Save a prediction to the database
@@ -105,24 +129,34 @@ class ModelFeedbackSystem:
                 - game_date, game_id, home_team, away_team
                 - predicted_winner, predicted_home_prob, predicted_away_prob
                 - confidence
+                - model_version (optional)
         """
         cursor = self.conn.cursor()
 
+        home_team_id, away_team_id, game_id = prediction_keys(
+            self.conn, prediction_data['game_date'], prediction_data['home_team'],
+            prediction_data['away_team'], prediction_data.get('game_id')
+        )
+
         cursor.execute('''
             INSERT INTO predictions (
                 prediction_date, game_date, game_id, home_team, away_team,
-                predicted_winner, predicted_home_prob, predicted_away_prob, confidence
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                predicted_winner, predicted_home_prob, predicted_away_prob, confidence,
+                home_team_id, away_team_id, model_version
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             prediction_data['game_date'],
-            prediction_data.get('game_id', ''),
+            game_id or '',
             prediction_data['home_team'],
             prediction_data['away_team'],
             prediction_data['predicted_winner'],
             prediction_data['predicted_home_prob'],
             prediction_data['predicted_away_prob'],
-            prediction_data['confidence']
+            prediction_data['confidence'],
+            home_team_id,
+            away_team_id,
+            prediction_data.get('model_version')
         ))
 
         self.conn.commit()
@@ -131,10 +165,12 @@ class ModelFeedbackSystem:
     def update_predictions_with_results(self, lookback_days: int = 30, use_api: bool = False) -> int:
         """
         Fetch actual game results and update predictions.
-        First checks database, then NBA API if needed.
+        Results already in the games table are applied in one set-based UPDATE;
+        the NBA API is only tried (per game) for what remains, if enabled.
 
         Args:
             lookback_days: How many days back to check for results (default: 30)
+            use_api: Query the NBA API for predictions not matched in the database
 
         Returns:
             Number of predictions updated
@@ -146,8 +182,7 @@ class ModelFeedbackSystem:
         today = datetime.now().strftime('%Y-%m-%d')
 
         cursor.execute('''
-            SELECT id, game_date, home_team, away_team,
-                   predicted_home_prob, predicted_away_prob
+            SELECT id, game_date, home_team, away_team, home_team_id, away_team_id
             FROM predictions
             WHERE actual_winner IS NULL
             AND game_date >= ?
@@ -168,132 +203,234 @@ class ModelFeedbackSystem:
                     print(f"  Note: There are {total_pending} pending predictions total (dates: {min_date} to {max_date})")
                     if max_date and max_date > today:
                         print(f"  [WARN]  Some predictions are in the future (max: {max_date}, today: {today})")
-        updated_count = 0
-        db_updated = 0
+            return 0
+
+        # Step 1: resolve every pending prediction to (game_date, home_team_id, away_team_id)
+        skipped_future = self._stage_pending_predictions(pending_predictions)
+
+        # Step 2: one join against games for everything that already has a final score
+        db_updated = self._apply_results_from_games()
+        # Predictions written before their game was in the games table get its game_id now
+        backfill_game_ids(self.conn, since=cutoff_date)
+
+        # Step 3: what is left goes to the NBA API (per game, rate limited) or diagnostics
         api_updated = 0
-        skipped_future = 0
         skipped_not_found = 0
-
-        for pred_id, game_date, home_team, away_team, pred_home_prob, pred_away_prob in pending_predictions:
-            # Normalize game_date format (handle different formats)
-            try:
-                # Try to parse and reformat date
-                if isinstance(game_date, str):
-                    # Handle different date formats
-                    for fmt in ['%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%d/%m/%Y']:
-                        try:
-                            date_obj = datetime.strptime(game_date, fmt).date()
-                            game_date = date_obj.strftime('%Y-%m-%d')  # Normalize to YYYY-MM-DD
-                            break
-                        except:
-                            continue
-                    else:
-                        # If no format matched, try to parse as date object
-                        date_obj = pd.to_datetime(game_date).date()
-                        game_date = date_obj.strftime('%Y-%m-%d')
+        unmatched = cursor.execute('''
+            SELECT p.id, s.game_date, p.home_team, p.away_team,
+                   p.predicted_home_prob, p.predicted_away_prob,
+                   s.home_team_id, s.away_team_id
+            FROM temp.pending_results s
+            JOIN predictions p ON p.id = s.prediction_id
+            WHERE p.actual_winner IS NULL
+            ORDER BY s.game_date
+        ''').fetchall()
+
+        games_per_date = {}
+        if unmatched and not use_api:
+            games_per_date = dict(cursor.execute('''
+                SELECT game_date, COUNT(*) FROM games
+                WHERE game_date IN (SELECT DISTINCT game_date FROM temp.pending_results)
+                GROUP BY game_date
+            ''').fetchall())
+
+        for pred_id, game_date, home_team, away_team, pred_home_prob, pred_away_prob, home_id, away_id in unmatched:
+            if home_id is None or away_id is None:
+                print(f"  [WARN] Unknown team name: {home_team} vs {away_team} on {game_date}")
+
+            if not use_api:
+                skipped_not_found += 1
+                games_on_date = games_per_date.get(game_date, 0)
+                if games_on_date > 0:
+                    print(f"  [MISS] No match in DB for {home_team} vs {away_team} on {game_date} ({games_on_date} games exist)")
                 else:
-                    date_obj = pd.to_datetime(game_date).date()
-                    game_date = date_obj.strftime('%Y-%m-%d')
-            except Exception as e:
-                print(f"  [WARN]  Warning: Could not parse game_date {game_date}: {e}")
-                continue
-            
-            # Check if game date is today or in the future
-            try:
-                date_obj = datetime.strptime(game_date, '%Y-%m-%d').date()
-                today_obj = datetime.now().date()
-                if date_obj > today_obj:
-                    skipped_future += 1
-                    print(f"  [SKIP] Skipping {home_team} vs {away_team} on {game_date} - future game")
-                    continue
-                if date_obj == today_obj:
-                    # Today's game - might not be played yet, but try anyway
-                    print(f"  [TODAY] Checking today's game: {home_team} vs {away_team} (might not be finished yet)")
-            except Exception as e:
-                print(f"  [WARN] Could not parse game_date {game_date}: {e}")
+                    print(f"  [MISS] No games in DB for {game_date}")
                 continue
-            
-            # First, try to get result from database
-            result = self._fetch_game_result_from_db(game_date, home_team, away_team)
 
+            # Not found in DB - try NBA API (slow)
+            print(f"  [API] Not in DB, trying NBA API for {home_team} vs {away_team} on {game_date}...")
+            result = self._fetch_game_result(game_date, home_team, away_team)
+            # Rate limit API calls
+            time.sleep(0.6)
             if not result:
-                if use_api:
-                    # Not found in DB - try NBA API (slow)
-                    print(f"  [API] Not in DB, trying NBA API for {home_team} vs {away_team} on {game_date}...")
-                    result = self._fetch_game_result(game_date, home_team, away_team)
-                    if result:
-                        api_updated += 1
-                        print(f"  [OK] Found result via API: {home_team} vs {away_team} on {game_date}")
-                    else:
-                        skipped_not_found += 1
-                        print(f"  [MISS] Not found in API for {game_date}")
-                    # Rate limit API calls
-                    time.sleep(0.6)
-                else:
-                    # DB-only mode - just count as not found
-                    skipped_not_found += 1
-                    # Quick debug info
-                    cursor.execute('SELECT COUNT(*) FROM games WHERE game_date = ?', (game_date,))
-                    games_on_date = cursor.fetchone()[0]
-                    if games_on_date > 0:
-                        print(f"  [MISS] No match in DB for {home_team} vs {away_team} on {game_date} ({games_on_date} games exist)")
-                    else:
-                        print(f"  [MISS] No games in DB for {game_date}")
-            else:
-                db_updated += 1
-                print(f"  [OK] Found in DB: {home_team} vs {away_team} on {game_date}")
-
-            if result:
-                home_score, away_score, actual_winner = result
-
-                # Normalize team names for comparison
-                home_full, home_abbrev = self._normalize_team_name(home_team)
-                away_full, away_abbrev = self._normalize_team_name(away_team)
-                winner_full, winner_abbrev = self._normalize_team_name(actual_winner)
-                
-                # Calculate if prediction was correct
-                predicted_winner = home_team if pred_home_prob > pred_away_prob else away_team
-                pred_winner_full, pred_winner_abbrev = self._normalize_team_name(predicted_winner)
-                
-                # Match winner names (handles different formats)
-                actual_is_home = (winner_full == home_full or winner_abbrev == home_abbrev or 
-                                 actual_winner.lower() == home_team.lower())
-                prediction_was_home = (pred_winner_full == home_full or pred_winner_abbrev == home_abbrev or
-                                      predicted_winner.lower() == home_team.lower())
-                
-                predicted_winner_correct = 1 if actual_is_home == prediction_was_home else 0
-
-                # Calculate prediction error (Brier score component)
-                actual_home_outcome = 1 if actual_is_home else 0
-                prediction_error = (pred_home_prob - actual_home_outcome) ** 2
-
-                # Calculate calibration error
-                calibration_error = abs(pred_home_prob - actual_home_outcome)
-
-                # Update prediction record
-                cursor.execute('''
-                    UPDATE predictions
-                    SET actual_winner = ?,
-                        actual_home_score = ?,
-                        actual_away_score = ?,
-                        correct = ?,
-                        prediction_error = ?,
-                        calibration_error = ?
-                    WHERE id = ?
-                ''', (actual_winner, home_score, away_score, predicted_winner_correct,
-                      prediction_error, calibration_error, pred_id))
-
-                updated_count += 1
-                print(f"  [OK] Updated {home_team} vs {away_team} on {game_date}: {actual_winner} won")
+                skipped_not_found += 1
+                print(f"  [MISS] Not found in API for {game_date}")
+                continue
+
+            self._apply_api_result(pred_id, home_team, pred_home_prob, pred_away_prob, result)
+            api_updated += 1
+            print(f"  [OK] Found result via API: {home_team} vs {away_team} on {game_date}: {result[2]} won")
+
+        # Roll up the dates that just received results
+        touched_dates = [row[0] for row in cursor.execute('''
+            SELECT DISTINCT p.game_date
+            FROM temp.pending_results s
+            JOIN predictions p ON p.id = s.prediction_id
+            WHERE p.actual_winner IS NOT NULL
+        ''')]
 
+        cursor.execute('DROP TABLE IF EXISTS temp.pending_results')
+        cursor.execute('DROP TABLE IF EXISTS temp.team_names')
         self.conn.commit()
+
+        if touched_dates:
+            self.refresh_daily_metrics(touched_dates)
+
+        updated_count = db_updated + api_updated
         print(f"[OK] Update complete: {updated_count} updated ({db_updated} from DB, {api_updated} from API)")
         if skipped_future > 0:
             print(f"  [SKIP]  Skipped {skipped_future} future games")
         if skipped_not_found > 0:
             print(f"  [WARN]  Could not find results for {skipped_not_found} games")
         return updated_count
-    
+
+    @staticmethod
+    def _normalize_game_date(game_date) -> Optional[str]:
+        """Normalize a stored game_date to YYYY-MM-DD (None if unparseable)."""
+        if isinstance(game_date, str):
+            for fmt in ['%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%d/%m/%Y']:
+                try:
+                    return datetime.strptime(game_date[:10], fmt).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+        try:
+            return pd.to_datetime(game_date).strftime('%Y-%m-%d')
+        except Exception:
+            return None
+
+    def _stage_pending_predictions(self, pending_predictions: List[Tuple]) -> int:
+        """
+        Load pending predictions into temp.pending_results keyed by team IDs.
+
+        Stored team IDs are used as-is; rows written before the IDs existed are
+        resolved once per distinct spelling through the alias index.
+
+        Returns:
+            Number of predictions skipped because the game is in the future
+        """
+        team_ids = {}
+        for _, _, home_team, away_team, home_id, away_id in pending_predictions:
+            for name, stored_id in ((home_team, home_id), (away_team, away_id)):
+                if stored_id is None and name not in team_ids:
+                    team_ids[name] = resolve_team_id(name)
+
+        today = datetime.now().strftime('%Y-%m-%d')
+        rows = []
+        skipped_future = 0
+        for pred_id, game_date, home_team, away_team, home_id, away_id in pending_predictions:
+            normalized = self._normalize_game_date(game_date)
+            if normalized is None:
+                print(f"  [WARN]  Warning: Could not parse game_date {game_date}")
+                continue
+            if normalized > today:
+                skipped_future += 1
+                print(f"  [SKIP] Skipping {home_team} vs {away_team} on {normalized} - future game")
+                continue
+            rows.append((pred_id, normalized,
+                         home_id if home_id is not None else team_ids[home_team],
+                         away_id if away_id is not None else team_ids[away_team]))
+
+        cursor = self.conn.cursor()
+        cursor.execute('DROP TABLE IF EXISTS temp.pending_results')
+        cursor.execute('''
+            CREATE TEMP TABLE pending_results (
+                prediction_id INTEGER PRIMARY KEY,
+                game_date TEXT,
+                home_team_id INTEGER,
+                away_team_id INTEGER
+            )
+        ''')
+        cursor.executemany('INSERT INTO temp.pending_results VALUES (?, ?, ?, ?)', rows)
+
+        cursor.execute('DROP TABLE IF EXISTS temp.team_names')
+        cursor.execute('CREATE TEMP TABLE team_names (team_id INTEGER PRIMARY KEY, full_name TEXT)')
+        cursor.executemany('INSERT INTO temp.team_names VALUES (?, ?)',
+                           [(team_id, team['full_name']) for team_id, team in TEAMS_BY_ID.items()])
+        return skipped_future
+
+    def _apply_results_from_games(self) -> int:
+        """
+        Apply final scores from games to every staged prediction in one UPDATE.
+
+        correct, prediction_error (Brier component) and calibration_error are
+        computed in SQL from the home win outcome.
+
+        Returns:
+            Number of predictions updated
+        """
+        cursor = self.conn.cursor()
+        # Completed games only (skip 0-0 placeholder rows), one row per matchup and date
+        results_sql = '''
+            SELECT s.prediction_id,
+                   g.home_score, g.away_score,
+                   CASE WHEN g.home_score > g.away_score THEN 1 ELSE 0 END AS home_won,
+                   CASE WHEN g.home_score > g.away_score THEN g.home_team_id ELSE g.away_team_id END AS winner_id,
+                   CASE WHEN g.home_score > g.away_score THEN g.home_team ELSE g.away_team END AS winner_name
+            FROM temp.pending_results s
+            JOIN games g
+              ON g.game_date = s.game_date
+             AND g.home_team_id = s.home_team_id
+             AND g.away_team_id = s.away_team_id
+            WHERE g.home_score IS NOT NULL AND g.away_score IS NOT NULL
+            AND (g.home_score > 0 OR g.away_score > 0)
+            GROUP BY s.prediction_id
+        '''
+
+        if sqlite3.sqlite_version_info >= (3, 33, 0):
+            cursor.execute(f'''
+                UPDATE predictions
+                SET actual_winner = COALESCE(n.full_name, r.winner_name),
+                    actual_home_score = r.home_score,
+                    actual_away_score = r.away_score,
+                    correct = CASE WHEN (predictions.predicted_home_prob > predictions.predicted_away_prob) = r.home_won
+                                   THEN 1 ELSE 0 END,
+                    prediction_error = (predictions.predicted_home_prob - r.home_won) * (predictions.predicted_home_prob - r.home_won),
+                    calibration_error = ABS(predictions.predicted_home_prob - r.home_won)
+                FROM ({results_sql}) r
+                LEFT JOIN temp.team_names n ON n.team_id = r.winner_id
+                WHERE predictions.id = r.prediction_id
+            ''')
+            return cursor.rowcount
+
+        # SQLite < 3.33 has no UPDATE ... FROM: same join, applied with executemany
+        results = cursor.execute(f'''
+            SELECT r.prediction_id, COALESCE(n.full_name, r.winner_name), r.home_score, r.away_score,
+                   CASE WHEN (p.predicted_home_prob > p.predicted_away_prob) = r.home_won THEN 1 ELSE 0 END,
+                   (p.predicted_home_prob - r.home_won) * (p.predicted_home_prob - r.home_won),
+                   ABS(p.predicted_home_prob - r.home_won)
+            FROM ({results_sql}) r
+            JOIN predictions p ON p.id = r.prediction_id
+            LEFT JOIN temp.team_names n ON n.team_id = r.winner_id
+        ''').fetchall()
+        cursor.executemany('''
+            UPDATE predictions
+            SET actual_winner = ?, actual_home_score = ?, actual_away_score = ?,
+                correct = ?, prediction_error = ?, calibration_error = ?
+            WHERE id = ?
+        ''', [row[1:] + (row[0],) for row in results])
+        return len(results)
+
+    def _apply_api_result(self, pred_id: int, home_team: str, pred_home_prob: float,
+                          pred_away_prob: float, result: Tuple[int, int, str]):
+        """Store one result fetched from the NBA API (same metrics as the SQL path)."""
+        home_score, away_score, actual_winner = result
+        actual_home_outcome = 1 if teams_match(actual_winner, home_team) else 0
+        predicted_home = pred_home_prob > pred_away_prob
+        self.conn.execute('''
+            UPDATE predictions
+            SET actual_winner = ?,
+                actual_home_score = ?,
+                actual_away_score = ?,
+                correct = ?,
+                prediction_error = ?,
+                calibration_error = ?
+            WHERE id = ?
+        ''', (actual_winner, home_score, away_score,
+              1 if predicted_home == bool(actual_home_outcome) else 0,
+              (pred_home_prob - actual_home_outcome) ** 2,
+              abs(pred_home_prob - actual_home_outcome),
+              pred_id))
+
     def _normalize_team_name(self, team_name: str) -> Tuple[str, str]:
         """
         Normalize team name to handle both full names and abbreviations.
@@ -302,138 +439,12 @@ class ModelFeedbackSystem:
         if not team_name:
             return ("", "")
         
-        team_lower = team_name.lower().strip()
-        
-        # Check if it's already in our variations map
-        if team_lower in self.team_name_variations:
-            full = self.team_name_variations[team_lower]
-            abbrev = self.team_full_to_abbrev.get(full, "")
-            return (full, abbrev)
-        
-        # Try direct lookup
-        if team_name in self.team_full_to_abbrev:
-            return (team_name, self.team_full_to_abbrev[team_name])
-        if team_name in self.team_abbrev_to_full:
-            return (self.team_abbrev_to_full[team_name], team_name)
-        
-        # Try fuzzy matching - check if team name contains or is contained in known names
-        for full_name, abbrev in self.team_full_to_abbrev.items():
-            if team_lower in full_name.lower() or full_name.lower() in team_lower:
-                return (full_name, abbrev)
-            if team_lower == abbrev.lower():
-                return (full_name, abbrev)
-        
-        # Return as-is if no match found
-        return (team_name, team_name)
+        team_id = resolve_team_id(team_name)
+        if team_id is None:
+            # Return as-is if no match found
+            return (team_name, team_name)
+        return (team_full_name(team_id), team_tricode(team_id))
     
-    def _fetch_game_result_from_db(self, game_date: str, home_team: str, away_team: str) -> Optional[Tuple[int, int, str]]:
-        """
-        Try to get game result from local database first (faster than API).
-
-        Returns:
-            (home_score, away_score, winning_team) or None if not found
-        """
-        try:
-            cursor = self.conn.cursor()
-
-            # Normalize team names to handle both full names and abbreviations
-            home_full, home_abbrev = self._normalize_team_name(home_team)
-            away_full, away_abbrev = self._normalize_team_name(away_team)
-
-            # Build list of all possible team name combinations to try
-            home_variants = list(set([home_team, home_full, home_abbrev, home_team.upper(), home_abbrev.upper()]))
-            away_variants = list(set([away_team, away_full, away_abbrev, away_team.upper(), away_abbrev.upper()]))
-
-            # Also try just the city/mascot parts
-            if ' ' in home_full:
-                home_variants.extend([home_full.split()[-1], home_full.split()[0]])  # "Celtics", "Boston"
-            if ' ' in away_full:
-                away_variants.extend([away_full.split()[-1], away_full.split()[0]])
-
-            # Special handling for "LA" vs "Los Angeles" teams
-            # "Los Angeles Clippers" -> also try "LA Clippers"
-            # "Los Angeles Lakers" -> also try "LA Lakers"
-            if 'Los Angeles' in home_full:
-                la_short = home_full.replace('Los Angeles', 'LA')
-                home_variants.append(la_short)
-            if 'Los Angeles' in away_full:
-                la_short = away_full.replace('Los Angeles', 'LA')
-                away_variants.append(la_short)
-
-            # Remove empty strings and duplicates
-            home_variants = list(set([h for h in home_variants if h]))
-            away_variants = list(set([a for a in away_variants if a]))
-
-            # Strategy 1: Try all combinations of name variants
-            for h in home_variants:
-                for a in away_variants:
-                    cursor.execute('''
-                        SELECT home_score, away_score, home_team, away_team
-                        FROM games
-                        WHERE game_date = ?
-                        AND home_team = ? AND away_team = ?
-                        AND home_score IS NOT NULL AND away_score IS NOT NULL
-                        AND (home_score > 0 OR away_score > 0)
-                        LIMIT 1
-                    ''', (game_date, h, a))
-
-                    result = cursor.fetchone()
-                    if result:
-                        home_score, away_score, db_home, db_away = result
-                        # Skip 0-0 (incomplete/stale row); only use real scores
-                        if (home_score or 0) == 0 and (away_score or 0) == 0:
-                            continue
-                        winner = db_home if home_score > away_score else db_away
-                        # Normalize winner name to match prediction format
-                        winner_full, _ = self._normalize_team_name(winner)
-                        return (int(home_score), int(away_score), winner_full)
-
-            # Strategy 2: Try using team IDs (most reliable)
-            # Get team IDs from NBA API
-            team_map = {t['full_name']: t['id'] for t in teams.get_teams()}
-            home_id = team_map.get(home_full) or team_map.get(home_team)
-            away_id = team_map.get(away_full) or team_map.get(away_team)
-
-            if home_id and away_id:
-                cursor.execute('''
-                    SELECT home_score, away_score, home_team, away_team
-                    FROM games
-                    WHERE game_date = ?
-                    AND home_team_id = ? AND away_team_id = ?
-                    AND home_score IS NOT NULL AND away_score IS NOT NULL
-                    AND (home_score > 0 OR away_score > 0)
-                    LIMIT 1
-                ''', (game_date, home_id, away_id))
-
-                result = cursor.fetchone()
-                if result:
-                    home_score, away_score, db_home, db_away = result
-                    if (home_score or 0) == 0 and (away_score or 0) == 0:
-                        pass  # skip 0-0, fall through to not found
-                    else:
-                        winner = db_home if home_score > away_score else db_away
-                        winner_full, _ = self._normalize_team_name(winner)
-                        return (int(home_score), int(away_score), winner_full)
-
-            # Debug info when not found
-            cursor.execute('SELECT COUNT(*) FROM games WHERE game_date = ?', (game_date,))
-            games_on_date = cursor.fetchone()[0]
-            if games_on_date > 0:
-                # Show what games are actually in the DB for this date
-                cursor.execute('''
-                    SELECT home_team, away_team, home_team_id, away_team_id
-                    FROM games WHERE game_date = ? LIMIT 10
-                ''', (game_date,))
-                db_games = cursor.fetchall()
-                print(f"  [NOTFOUND] No match for {home_full} vs {away_full} on {game_date}")
-                print(f"     DB has {games_on_date} games. Sample: {db_games[:3]}")
-            return None
-        except Exception as e:
-            print(f"Error checking database for game result: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-
     def _fetch_game_result(self, game_date: str, home_team: str, away_team: str) -> Tuple[int, int, str]:
         """
         Fetch actual game result from NBA API using leaguegamefinder (more reliable for historical games)
@@ -441,6 +452,8 @@ class ModelFeedbackSystem:
         Returns:
             (home_score, away_score, winning_team) or None if not found
         """
+        from nba_api.stats.endpoints import leaguegamefinder  # local import: slow, API path only
+
         try:
             # Parse game date
             date_obj = datetime.strptime(game_date, '%Y-%m-%d')
@@ -457,11 +470,8 @@ class ModelFeedbackSystem:
             print(f"  Fetching from NBA API: {home_full} ({home_abbrev}) vs {away_full} ({away_abbrev}) on {game_date}")
             
             # Get team IDs
-            team_map = {t['full_name']: t['id'] for t in teams.get_teams()}
-            team_map_abbrev = {t['abbreviation']: t['id'] for t in teams.get_teams()}
-            
-            home_id = team_map.get(home_full) or team_map_abbrev.get(home_abbrev)
-            away_id = team_map.get(away_full) or team_map_abbrev.get(away_abbrev)
+            home_id = resolve_team_id(home_full)
+            away_id = resolve_team_id(away_full)
             
             if not home_id or not away_id:
                 print(f"    [ERROR] Could not find team IDs: home={home_id}, away={away_id}")
@@ -561,33 +571,145 @@ class ModelFeedbackSystem:
             traceback.print_exc()
             return None
 
-    def evaluate_model_performance(self, period_days: int = 30) -> Dict:
+    # ------------------------------------------------------------------
+    # Daily metrics rollup
+    # ------------------------------------------------------------------
+    CALIBRATION_BUCKET_PCT = 5  # Bucket width in percentage points
+
+    def refresh_daily_metrics(self, game_dates: Optional[List[str]] = None) -> int:
         """
-        Evaluate model performance over a period
+        Recompute the daily rollup rows for the given game dates.
+
+        Each day is rebuilt from its verified predictions in one grouped
+        INSERT, so corrected results are picked up and re-running is harmless.
 
         Args:
-            period_days: Number of days to evaluate
+            game_dates: Dates to refresh (None = rebuild every date)
 
         Returns:
-            Dict with performance metrics
+            Number of days written
         """
-        cursor = self.conn.cursor()
+        if game_dates is None:
+            date_filter, params = '', ()
+        else:
+            game_dates = sorted(set(game_dates))
+            if not game_dates:
+                return 0
+            date_filter = f"AND game_date IN ({','.join('?' * len(game_dates))})"
+            params = tuple(game_dates)
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self.conn:
+            self.conn.execute(f'''
+                DELETE FROM prediction_metrics_daily WHERE 1 = 1 {date_filter}
+            ''', params)
+            self.conn.execute(f'''
+                DELETE FROM prediction_calibration_daily WHERE 1 = 1 {date_filter}
+            ''', params)
+
+            cursor = self.conn.execute(f'''
+                INSERT INTO prediction_metrics_daily
+                SELECT game_date,
+                       COUNT(*),
+                       COUNT(correct),
+                       COALESCE(SUM(correct), 0),
+                       COUNT(prediction_error),
+                       COALESCE(SUM(prediction_error), 0),
+                       COALESCE(SUM(calibration_error), 0),
+                       COUNT(confidence),
+                       COALESCE(SUM(confidence), 0),
+                       COUNT(CASE WHEN confidence >= 0.70 THEN correct END),
+                       COALESCE(SUM(CASE WHEN confidence >= 0.70 THEN correct END), 0),
+                       COUNT(CASE WHEN confidence < 0.70 THEN correct END),
+                       COALESCE(SUM(CASE WHEN confidence < 0.70 THEN correct END), 0),
+                       COUNT(CASE WHEN predicted_home_prob > 0.5 THEN correct END),
+                       COALESCE(SUM(CASE WHEN predicted_home_prob > 0.5 THEN correct END), 0),
+                       COUNT(CASE WHEN confidence >= 0.60 THEN correct END),
+                       COALESCE(SUM(CASE WHEN confidence >= 0.60 THEN correct END), 0),
+                       ?
+                FROM predictions
+                WHERE actual_winner IS NOT NULL AND game_date IS NOT NULL {date_filter}
+                GROUP BY game_date
+            ''', (now,) + params)
+            days_written = cursor.rowcount
+
+            # Bucket by the predicted winner's probability (whole percents, so
+            # 0.60 lands in the 0.60 bucket); a hit is a correct pick
+            width = self.CALIBRATION_BUCKET_PCT
+            self.conn.execute(f'''
+                INSERT INTO prediction_calibration_daily
+                SELECT game_date, bucket, COUNT(*), SUM(correct), SUM(winner_prob)
+                FROM (
+                    SELECT game_date, correct,
+                           MAX(predicted_home_prob, predicted_away_prob) AS winner_prob,
+                           CAST(ROUND(MAX(predicted_home_prob, predicted_away_prob) * 100) AS INTEGER) / ? * ? / 100.0 AS bucket
+                    FROM predictions
+                    WHERE actual_winner IS NOT NULL AND game_date IS NOT NULL
+                    AND correct IS NOT NULL
+                    AND predicted_home_prob IS NOT NULL AND predicted_away_prob IS NOT NULL
+                    {date_filter}
+                )
+                GROUP BY game_date, bucket
+            ''', (width, width) + params)
 
-        cutoff_date = (datetime.now() - timedelta(days=period_days)).strftime('%Y-%m-%d')
+        return days_written
 
-        # Get verified predictions
-        cursor.execute('''
-            SELECT predicted_home_prob, predicted_away_prob, confidence,
-                   correct, prediction_error, calibration_error,
-                   predicted_winner, actual_winner
-            FROM predictions
-            WHERE actual_winner IS NOT NULL
-            AND game_date >= ?
-        ''', (cutoff_date,))
+    def _window_start(self, period_days: Optional[int]) -> str:
+        """First game date of a window (None = everything on record)."""
+        if period_days is None:
+            return ''
+        return (datetime.now() - timedelta(days=period_days)).strftime('%Y-%m-%d')
+
+    def get_calibration_buckets(self, period_days: Optional[int] = 30) -> List[Dict]:
+        """
+        Reliability table for a window, summed from the daily buckets.
+
+        Returns:
+            One dict per bucket: bucket, predictions, hit_rate, avg_probability
+        """
+        rows = self.conn.execute('''
+            SELECT bucket, SUM(predictions), SUM(hits), SUM(sum_probability)
+            FROM prediction_calibration_daily
+            WHERE game_date >= ?
+            GROUP BY bucket
+            ORDER BY bucket
+        ''', (self._window_start(period_days),)).fetchall()
+        return [{
+            'bucket': round(bucket, 2),
+            'predictions': n,
+            'hit_rate': round(hits / n, 4),
+            'avg_probability': round(sum_prob / n, 4)
+        } for bucket, n, hits, sum_prob in rows if n]
+
+    def evaluate_model_performance(self, period_days: Optional[int] = 30,
+                                   save_snapshot: bool = False) -> Dict:
+        """
+        Evaluate model performance over a period
 
-        predictions = cursor.fetchall()
+        Answered from the daily rollup (one SUM over at most period_days
+        rows); reading does not write a model_performance snapshot unless
+        save_snapshot is set.
+
+        Args:
+            period_days: Number of days to evaluate (None = all verified predictions)
+            save_snapshot: Also record the result in model_performance
 
-        if not predictions:
+        Returns:
+            Dict with performance metrics
+        """
+        row = self.conn.execute('''
+            SELECT SUM(total_predictions), SUM(graded), SUM(correct),
+                   SUM(error_count), SUM(sum_squared_error), SUM(sum_calibration_error),
+                   SUM(confidence_count), SUM(sum_confidence),
+                   SUM(high_conf_graded), SUM(high_conf_correct),
+                   SUM(low_conf_graded), SUM(low_conf_correct),
+                   SUM(home_pick_graded), SUM(home_pick_correct),
+                   SUM(favorite_graded), SUM(favorite_correct)
+            FROM prediction_metrics_daily
+            WHERE game_date >= ?
+        ''', (self._window_start(period_days),)).fetchone()
+
+        if not row or not row[0]:
             return {
                 'total_predictions': 0,
                 'accuracy': 0.0,
@@ -596,60 +718,50 @@ class ModelFeedbackSystem:
                 'error': 'No verified predictions in period'
             }
 
-        df = pd.DataFrame(predictions, columns=[
-            'pred_home_prob', 'pred_away_prob', 'confidence',
-            'correct', 'pred_error', 'calib_error',
-            'predicted_winner', 'actual_winner'
-        ])
+        (total, graded, correct, error_count, sum_sq_error, sum_calib_error,
+         confidence_count, sum_confidence, high_graded, high_correct,
+         low_graded, low_correct, home_graded, home_correct,
+         favorite_graded, favorite_correct) = row
 
-        # Calculate metrics
-        total = len(df)
-        accuracy = df['correct'].mean()
-        brier_score = df['pred_error'].mean()
-        calibration_score = df['calib_error'].mean()
-        avg_confidence = df['confidence'].mean()
-
-        # High vs low confidence accuracy
-        high_conf = df[df['confidence'] >= 0.70]
-        low_conf = df[df['confidence'] < 0.70]
-
-        high_conf_acc = high_conf['correct'].mean() if len(high_conf) > 0 else 0.0
-        low_conf_acc = low_conf['correct'].mean() if len(low_conf) > 0 else 0.0
-
-        # Bias analysis
-        home_predicted = df[df['pred_home_prob'] > 0.5]
-        home_bias = home_predicted['correct'].mean() if len(home_predicted) > 0 else 0.0
-
-        # Favorite bias (predicted higher probability team)
-        favorite_correct = df[df['confidence'] >= 0.60]['correct'].mean() if len(df[df['confidence'] >= 0.60]) > 0 else 0.0
+        def ratio(numerator, denominator):
+            return numerator / denominator if denominator else 0.0
 
         metrics = {
             'total_predictions': total,
-            'correct_predictions': int(df['correct'].sum()),
-            'accuracy': round(accuracy, 4),
-            'brier_score': round(brier_score, 4),
-            'calibration_score': round(calibration_score, 4),
-            'avg_confidence': round(avg_confidence, 4),
-            'high_conf_accuracy': round(high_conf_acc, 4),
-            'low_conf_accuracy': round(low_conf_acc, 4),
-            'home_bias': round(home_bias, 4),
-            'favorite_bias': round(favorite_correct, 4),
+            'correct_predictions': int(correct),
+            'accuracy': round(ratio(correct, graded), 4),
+            'brier_score': round(ratio(sum_sq_error, error_count), 4),
+            'calibration_score': round(ratio(sum_calib_error, error_count), 4),
+            'avg_confidence': round(ratio(sum_confidence, confidence_count), 4),
+            'high_conf_accuracy': round(ratio(high_correct, high_graded), 4),
+            'low_conf_accuracy': round(ratio(low_correct, low_graded), 4),
+            'home_bias': round(ratio(home_correct, home_graded), 4),
+            'favorite_bias': round(ratio(favorite_correct, favorite_graded), 4),
             'period_days': period_days,
             'evaluation_date': datetime.now().strftime('%Y-%m-%d')
         }
 
-        # Save performance snapshot
-        self._save_performance_snapshot(metrics)
+        if save_snapshot:
+            self._save_performance_snapshot(metrics)
 
         return metrics
 
+    def record_performance_snapshot(self, period_days: int = 30) -> Dict:
+        """Evaluate a window and keep it as today's model_performance snapshot."""
+        return self.evaluate_model_performance(period_days=period_days, save_snapshot=True)
+
     def _save_performance_snapshot(self, metrics: Dict):
-        """Save performance metrics to database"""
+        """Save performance metrics to database (one row per evaluation date and window)"""
         cursor = self.conn.cursor()
 
-        period_start = (datetime.now() - timedelta(days=metrics['period_days'])).strftime('%Y-%m-%d')
+        period_start = self._window_start(metrics['period_days'])
         period_end = datetime.now().strftime('%Y-%m-%d')
 
+        cursor.execute('''
+            DELETE FROM model_performance
+            WHERE evaluation_date = ? AND period_start = ? AND period_end = ?
+        ''', (metrics['evaluation_date'], period_start, period_end))
+
         cursor.execute('''
             INSERT INTO model_performance (
                 evaluation_date, period_start, period_end,
@@ -0,0 +1,41 @@
+"""
+Model Identity
+One content hash naming a saved model directory
+
+Predictions, drift sketches and run checkpoints are all tagged with the
+model that produced them. The tag is derived from file contents, never
+mtimes, so a fresh clone or CI checkout of the same model gets the same tag.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+
+def model_content_hash(model_dir) -> str:
+    """sha256 of the names and bytes of every file in the model directory."""
+    digest = hashlib.sha256()
+    model_dir = Path(model_dir)
+    if model_dir.exists():
+        for path in sorted(model_dir.iterdir()):
+            if path.is_file():
+                digest.update(path.name.encode('utf-8') + b'\0')
+                digest.update(path.read_bytes())
+                digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def model_version(model_dir) -> str:
+    """
+    Version tag for a saved model.
+
+    Models saved with a model_version in calibration_config.json use it;
+    older models are named by their content hash ("sha-1a2b3c4d5e6f").
+    """
+    config_path = Path(model_dir) / "calibration_config.json"
+    if config_path.exists():
+        with open(config_path, 'r') as f:
+            version = json.load(f).get('model_version')
+        if version:
+            return version
+    return f"sha-{model_content_hash(model_dir)[:12]}"
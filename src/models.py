@@ -5,8 +5,10 @@ src/models.py - PROPER Stacked Ensemble Model with Temperature Scaling
 import numpy as np
 import pandas as pd
 from pathlib import Path
+from datetime import datetime
 import pickle
 import json
+import threading
 from typing import Dict, Tuple, List, Optional
 from scipy.optimize import minimize
 
@@ -21,12 +23,25 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.neural_network import MLPClassifier
 
-try:
-    import shap
-    SHAP_AVAILABLE = True
-except ImportError:
-    SHAP_AVAILABLE = False
-    print("Warning: SHAP not available. Feature explanations will be limited.")
+from src.drift_monitor import build_training_sketch
+from src.model_identity import model_version
+
+# shap takes seconds to import: it is loaded on the first explanation, not here
+_explainer_lock = threading.Lock()
+
+
+def _shap_tree_explainer(model):
+    """SHAP TreeExplainer for a tree model, or None if shap is unavailable."""
+    try:
+        import shap
+    except ImportError:
+        print("Warning: SHAP not available. Feature explanations will be limited.")
+        return None
+    try:
+        return shap.TreeExplainer(model)
+    except Exception as e:
+        print(f"  Warning: Could not initialize SHAP explainer: {e}")
+        return None
 
 
 class TemperatureScaling:
@@ -161,8 +176,9 @@ class StackedEnsembleModel:
         self.feature_names = None
         self.is_trained = False
 
-        # For SHAP
-        self.explainer = None
+        # For SHAP (built on first use, see explainer)
+        self._explainer = None
+        self._explainer_ready = False
 
         # Temperature calibrator for fixing overconfidence
         self.temperature_calibrator = TemperatureScaling()
@@ -171,6 +187,12 @@ class StackedEnsembleModel:
         # Temperature scaling handles calibration instead
         self.max_confidence = 1.0  # No cap
         self.min_confidence_to_predict = 0.52  # Predictions below this are coin flips
+
+        # Version tag of the saved model (set by save()/load())
+        self.version = None
+
+        # Training distribution sketch for drift monitoring (set by train())
+        self.training_sketch = None
         
     def train(self, X: pd.DataFrame, y: pd.Series,
               sample_weights: Optional[np.ndarray] = None,
@@ -195,6 +217,9 @@ class StackedEnsembleModel:
         # Handle missing values
         X = X.fillna(0)
 
+        # Reference distribution the drift monitor compares live inputs with
+        self.training_sketch = build_training_sketch(X, self.feature_names)
+
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
         X_scaled = pd.DataFrame(X_scaled, columns=self.feature_names)
@@ -308,15 +333,8 @@ class StackedEnsembleModel:
         # Evaluate calibration improvement
         self._evaluate_calibration(meta_probs, all_meta_targets)
         
-        # Setup SHAP explainer (using XGBoost as primary)
-        if SHAP_AVAILABLE:
-            try:
-                self.explainer = shap.TreeExplainer(self.base_models['xgboost'])
-            except Exception as e:
-                print(f"  Warning: Could not initialize SHAP explainer: {e}")
-                self.explainer = None
-        else:
-            self.explainer = None
+        # SHAP explainer (using XGBoost as primary) is rebuilt on next use
+        self._explainer_ready = False
         
         self.is_trained = True
         
@@ -523,6 +541,16 @@ class StackedEnsembleModel:
             'temperature_factor': self.temperature_calibrator.temperature
         }
 
+    @property
+    def explainer(self):
+        """SHAP TreeExplainer on the XGBoost base model (None if unavailable)."""
+        if not self._explainer_ready:
+            with _explainer_lock:
+                if not self._explainer_ready:
+                    self._explainer = _shap_tree_explainer(self.base_models['xgboost'])
+                    self._explainer_ready = True
+        return self._explainer
+
     def _get_aggregated_feature_importance(self, X_scaled: np.ndarray) -> list:
         """
         Get feature importance aggregated across multiple models.
@@ -656,8 +684,10 @@ class StackedEnsembleModel:
         with open(model_dir / "feature_names.json", 'w') as f:
             json.dump(self.feature_names, f)
 
-        # Save calibration config
+        # Save calibration config (model_version tags every prediction made with it)
+        self.version = datetime.now().strftime('%Y%m%d-%H%M%S')
         calibration_config = {
+            'model_version': self.version,
             'temperature': self.temperature_calibrator.temperature,
             'max_confidence': self.max_confidence,
             'min_confidence_to_predict': self.min_confidence_to_predict
@@ -665,6 +695,11 @@ class StackedEnsembleModel:
         with open(model_dir / "calibration_config.json", 'w') as f:
             json.dump(calibration_config, f)
 
+        # Save training sketch (drift monitor reference)
+        if self.training_sketch is not None:
+            with open(model_dir / "training_sketch.json", 'w') as f:
+                json.dump(dict(self.training_sketch, version=f"training:{self.version}"), f)
+
         print(f"Model saved to {model_dir}")
         print(f"  Temperature factor: {self.temperature_calibrator.temperature:.3f}")
         
@@ -746,19 +781,15 @@ class StackedEnsembleModel:
                 self.max_confidence = config.get('max_confidence', 1.0)
                 self.min_confidence_to_predict = config.get('min_confidence_to_predict', 0.52)
 
+        # Saved model_version, or a content hash for models saved before versioning
+        self.version = model_version(model_dir)
+
         # Load feature names
         with open(model_dir / "feature_names.json", 'r') as f:
             self.feature_names = json.load(f)
 
-        # Setup SHAP
-        if SHAP_AVAILABLE:
-            try:
-                self.explainer = shap.TreeExplainer(self.base_models['xgboost'])
-            except Exception as e:
-                print(f"Warning: Could not initialize SHAP explainer: {e}")
-                self.explainer = None
-        else:
-            self.explainer = None
+        # SHAP explainer is built on first use
+        self._explainer_ready = False
 
         self.is_trained = True
         print(f"Model loaded from {model_dir}")
@@ -17,6 +17,10 @@ from datetime import datetime
 import os
 from dotenv import load_dotenv
 
+from src.http_client import http_get
+from src.odds_key_manager import record_quota_headers
+from src.team_identity import normalize_team_key, resolve_team_id, team_nickname, teams_match
+
 # Load environment variables
 load_dotenv()
 
@@ -62,7 +66,8 @@ class OddsAPIClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = http_get(url, params=params, timeout=10)
+            record_quota_headers(self.api_key, response)
             response.raise_for_status()
             
             # Check remaining quota
@@ -133,45 +138,14 @@ class OddsAPIClient:
             "LA Lakers" -> "lakers"
             "Golden State Warriors" -> "warriors"
         """
-        normalized = team_name.lower()
-        
-        # Remove city names (more comprehensive)
-        cities_to_remove = [
-            "los angeles", "new york", "golden state", "oklahoma city",
-            "san antonio", "new orleans", "portland", "phoenix",
-            "miami", "boston", "chicago", "cleveland", "dallas",
-            "denver", "detroit", "houston", "indiana", "milwaukee",
-            "minnesota", "memphis", "orlando", "philadelphia",
-            "sacramento", "toronto", "utah", "washington", "atlanta",
-            "brooklyn", "charlotte", "la ", "ny "
-        ]
-        
-        for city in cities_to_remove:
-            normalized = normalized.replace(city, "")
-        
-        # Get the team name (usually the last word)
-        words = normalized.strip().split()
-        if words:
-            return words[-1]  # "lakers", "celtics", "nuggets", etc.
-        return ""
+        team_id = resolve_team_id(team_name)
+        if team_id is None:
+            return normalize_team_key(team_name)
+        return team_nickname(team_id).lower()
     
     def _teams_match(self, team1: str, team2: str) -> bool:
-        """Check if two team names match using multiple strategies"""
-        # Strategy 1: Exact match
-        if team1.lower() == team2.lower():
-            return True
-        
-        # Strategy 2: Normalized match
-        norm1 = self._normalize_team_name(team1)
-        norm2 = self._normalize_team_name(team2)
-        if norm1 and norm2 and norm1 == norm2:
-            return True
-        
-        # Strategy 3: One contains the other
-        if team1.lower() in team2.lower() or team2.lower() in team1.lower():
-            return True
-        
-        return False
+        """Check if two team names name the same team (see src/team_identity.py)"""
+        return teams_match(team1, team2)
     
     def _parse_game_odds(self, game: Dict) -> Dict:
         """
@@ -246,7 +220,8 @@ class OddsAPIClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=5)
+            response = http_get(url, params=params, timeout=5)
+            record_quota_headers(self.api_key, response)
             return {
                 'remaining': response.headers.get('x-requests-remaining', 'Unknown'),
                 'used': response.headers.get('x-requests-used', 'Unknown')
@@ -0,0 +1,309 @@
+"""
+Odds Cache
+Indexed, compressed local store of raw Odds API boards
+
+The single persisted copy of the Odds API board: OddsSnapshotService (and
+through it RealOddsFetcher) reads and writes boards here. It replaces the
+per-day data/odds_cache/odds_YYYYMMDD.json files. Each fetch
+is one row in odds_cache_fetches; each game of the board is stored as a
+zlib-compressed JSON payload keyed by (fetch_id, event_id). A pointer table
+keyed by (home_team_id, away_team_id, game_date) tracks the freshest
+payload per game, so single-game lookups are one primary-key read.
+"""
+
+import json
+import os
+import sqlite3
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+    EASTERN = ZoneInfo('America/New_York')
+except Exception:  # tzdata missing (Windows without the tzdata package)
+    EASTERN = None
+
+from src.team_identity import resolve_team_id
+
+
+DEFAULT_TTL_MINUTES = int(os.getenv('ODDS_CACHE_TTL_MINUTES', '30'))
+
+
+def game_date_from_commence(commence_time: str) -> str:
+    """Local (US Eastern) game date for an ISO UTC commence_time."""
+    try:
+        start = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return ''
+    if EASTERN is not None:
+        start = start.astimezone(EASTERN)
+    else:
+        start = start - timedelta(hours=5)
+    return start.strftime('%Y-%m-%d')
+
+
+def compress_payload(data) -> bytes:
+    """Compact JSON + zlib."""
+    return zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def decompress_payload(blob: bytes):
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+class OddsCache:
+    """
+    Local cache of Odds API boards.
+
+    Features:
+    - Entries keyed by fetch timestamp and game, payloads compressed
+    - O(1) freshest-snapshot lookup per game (pointer table)
+    - TTL decides whether callers serve from cache or hit the API
+    - One-time import of the legacy odds_*.json files
+    """
+
+    def __init__(self, db_path: str = "data/nba_predictor.db",
+                 ttl_minutes: int = DEFAULT_TTL_MINUTES):
+        self.db_path = Path(db_path)
+        self.ttl = timedelta(minutes=ttl_minutes)
+        self._init_tables()
+
+    def _init_tables(self):
+        """Initialize odds cache tables."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS odds_cache_fetches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fetched_at TIMESTAMP,
+                games INTEGER,
+                source TEXT
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS odds_cache_games (
+                fetch_id INTEGER,
+                event_id TEXT,
+                commence_time TEXT,
+                payload BLOB,
+                PRIMARY KEY (fetch_id, event_id)
+            ) WITHOUT ROWID
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS odds_cache_latest (
+                home_team_id INTEGER,
+                away_team_id INTEGER,
+                game_date DATE,
+                fetch_id INTEGER,
+                event_id TEXT,
+                fetched_at TIMESTAMP,
+                PRIMARY KEY (home_team_id, away_team_id, game_date)
+            ) WITHOUT ROWID
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_odds_cache_fetches_fetched_at
+            ON odds_cache_fetches(fetched_at)
+        """)
+
+        conn.commit()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def store_board(self, games: List[Dict], fetched_at: datetime = None,
+                    source: str = 'the-odds-api') -> int:
+        """
+        Store one raw /odds board in a single transaction.
+
+        Returns:
+            fetch_id of the stored board
+        """
+        fetched_at = fetched_at or datetime.now()
+        rows = []
+        latest = []
+        for position, game in enumerate(games):
+            event_id = game.get('id') or f"#{position}"
+            rows.append((event_id, game.get('commence_time'), compress_payload(game)))
+
+            home_id = resolve_team_id(game.get('home_team', ''))
+            away_id = resolve_team_id(game.get('away_team', ''))
+            game_date = game_date_from_commence(game.get('commence_time', ''))
+            if home_id is not None and away_id is not None and game_date:
+                latest.append((home_id, away_id, game_date, event_id))
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO odds_cache_fetches (fetched_at, games, source) VALUES (?, ?, ?)",
+                (fetched_at.isoformat(), len(games), source)
+            )
+            fetch_id = cursor.lastrowid
+            conn.executemany("""
+                INSERT OR REPLACE INTO odds_cache_games (fetch_id, event_id, commence_time, payload)
+                VALUES (?, ?, ?, ?)
+            """, [(fetch_id,) + row for row in rows])
+            # Older imports must not overwrite a fresher pointer
+            conn.executemany("""
+                INSERT INTO odds_cache_latest
+                (home_team_id, away_team_id, game_date, fetch_id, event_id, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (home_team_id, away_team_id, game_date) DO UPDATE SET
+                    fetch_id = excluded.fetch_id,
+                    event_id = excluded.event_id,
+                    fetched_at = excluded.fetched_at
+                WHERE excluded.fetched_at >= odds_cache_latest.fetched_at
+            """, [
+                (home_id, away_id, game_date, fetch_id, event_id, fetched_at.isoformat())
+                for home_id, away_id, game_date, event_id in latest
+            ])
+        conn.close()
+        return fetch_id
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def is_fresh(self, fetched_at: datetime, max_age: timedelta = None) -> bool:
+        """Whether an entry fetched at fetched_at is within the TTL."""
+        return datetime.now() - fetched_at < (self.ttl if max_age is None else max_age)
+
+    def latest_board(self, max_age: Optional[timedelta] = None
+                     ) -> Optional[Tuple[datetime, List[Dict]]]:
+        """
+        Newest stored board.
+
+        Args:
+            max_age: Only return it if younger than this (None = any age)
+
+        Returns:
+            (fetched_at, games) or None
+        """
+        conn = sqlite3.connect(self.db_path)
+        header = conn.execute("""
+            SELECT id, fetched_at FROM odds_cache_fetches
+            ORDER BY fetched_at DESC
+            LIMIT 1
+        """).fetchone()
+
+        if not header:
+            conn.close()
+            return None
+
+        fetched_at = datetime.fromisoformat(header[1])
+        if max_age is not None and not self.is_fresh(fetched_at, max_age):
+            conn.close()
+            return None
+
+        rows = conn.execute("""
+            SELECT payload FROM odds_cache_games
+            WHERE fetch_id = ?
+            ORDER BY commence_time
+        """, (header[0],)).fetchall()
+        conn.close()
+        return fetched_at, [decompress_payload(row[0]) for row in rows]
+
+    def get_game(self, home_team, away_team, game_date: str = None,
+                 max_age: Optional[timedelta] = None) -> Optional[Dict]:
+        """
+        Freshest raw game payload for one matchup.
+
+        Args:
+            home_team: Home team name or ID
+            away_team: Away team name or ID
+            game_date: Game date (YYYY-MM-DD); if None, the earliest listed date
+            max_age: Only return payloads younger than this (None = any age)
+        """
+        home_id = resolve_team_id(home_team)
+        away_id = resolve_team_id(away_team)
+        if home_id is None or away_id is None:
+            return None
+
+        conn = sqlite3.connect(self.db_path)
+        if game_date:
+            pointer = conn.execute("""
+                SELECT fetch_id, event_id, fetched_at FROM odds_cache_latest
+                WHERE home_team_id = ? AND away_team_id = ? AND game_date = ?
+            """, (home_id, away_id, game_date)).fetchone()
+        else:
+            pointer = conn.execute("""
+                SELECT fetch_id, event_id, fetched_at FROM odds_cache_latest
+                WHERE home_team_id = ? AND away_team_id = ? AND game_date >= ?
+                ORDER BY game_date
+                LIMIT 1
+            """, (home_id, away_id, datetime.now().strftime('%Y-%m-%d'))).fetchone()
+
+        if not pointer or (max_age is not None and
+                           not self.is_fresh(datetime.fromisoformat(pointer[2]), max_age)):
+            conn.close()
+            return None
+
+        row = conn.execute("""
+            SELECT payload FROM odds_cache_games WHERE fetch_id = ? AND event_id = ?
+        """, (pointer[0], pointer[1])).fetchone()
+        conn.close()
+        return decompress_payload(row[0]) if row else None
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def import_legacy_json(self, cache_dir: str = "data/odds_cache") -> int:
+        """
+        Import legacy odds_YYYYMMDD.json files once (only into an empty cache).
+
+        Returns:
+            Number of boards imported
+        """
+        cache_dir = Path(cache_dir)
+        if not cache_dir.exists():
+            return 0
+
+        conn = sqlite3.connect(self.db_path)
+        has_entries = conn.execute("SELECT 1 FROM odds_cache_fetches LIMIT 1").fetchone()
+        conn.close()
+        if has_entries:
+            return 0
+
+        imported = 0
+        for path in sorted(cache_dir.glob("odds_*.json")):
+            try:
+                # The file date, not its mtime: a fresh checkout must not look fresh
+                fetched_at = datetime.strptime(path.stem.split('_', 1)[1], '%Y%m%d')
+                with open(path, 'r') as f:
+                    games = json.load(f)
+            except (ValueError, IndexError, OSError) as e:
+                print(f"[WARN] Skipping legacy odds cache file {path.name}: {e}")
+                continue
+            self.store_board(games, fetched_at, source='legacy_json')
+            imported += 1
+
+        if imported:
+            print(f"Imported {imported} legacy odds cache files into {self.db_path}")
+        return imported
+
+    def prune(self, keep_days: int = 30) -> int:
+        """
+        Delete boards older than keep_days (pointers to them go too).
+
+        Returns:
+            Number of boards removed
+        """
+        cutoff = (datetime.now() - timedelta(days=keep_days)).isoformat()
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            old_ids = [row[0] for row in conn.execute(
+                "SELECT id FROM odds_cache_fetches WHERE fetched_at < ?", (cutoff,)
+            )]
+            if old_ids:
+                conn.executemany("DELETE FROM odds_cache_games WHERE fetch_id = ?",
+                                 [(fid,) for fid in old_ids])
+                conn.executemany("DELETE FROM odds_cache_latest WHERE fetch_id = ?",
+                                 [(fid,) for fid in old_ids])
+                conn.execute("DELETE FROM odds_cache_fetches WHERE fetched_at < ?", (cutoff,))
+        conn.close()
+        return len(old_ids)
@@ -0,0 +1,351 @@
+"""
+Odds History (Line Movement)
+Compact append-only store of per-bookmaker moneyline prices over time
+
+Every odds board fetch is recorded here, but a row is only appended when a
+bookmaker's price for a game actually moved. Prices are stored as integers
+(decimal odds x 1000) and timestamps as unix seconds in a WITHOUT ROWID
+table clustered on (game, bookmaker, time), so opening/closing/movement
+queries are range scans and the table stays small over several seasons.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+ODDS_SCALE = 1000  # 1.909 -> 1909
+
+
+def encode_odds(decimal_odds: float) -> int:
+    """Decimal odds -> integer storage format."""
+    return int(round(float(decimal_odds) * ODDS_SCALE))
+
+
+def decode_odds(encoded: int) -> float:
+    """Integer storage format -> decimal odds."""
+    return encoded / ODDS_SCALE
+
+
+def _date_key(game_date: str) -> int:
+    """'2026-01-05' -> 20260105"""
+    return int(game_date.replace('-', '')[:8])
+
+
+def _commence_ts(commence_time: Optional[str]) -> Optional[int]:
+    """ISO commence_time -> unix seconds (None if missing/invalid)."""
+    if not commence_time:
+        return None
+    try:
+        return int(datetime.fromisoformat(commence_time.replace('Z', '+00:00')).timestamp())
+    except ValueError:
+        return None
+
+
+class OddsHistoryStore:
+    """
+    Line-movement time series for NBA moneylines.
+
+    Features:
+    - Append-only, one row per price change per bookmaker
+    - Integer-encoded odds and timestamps
+    - Opening line, closing line and movement queries
+    - Downsampling/compaction of old games (opening and closing always kept)
+    """
+
+    def __init__(self, db_path: str = "data/nba_predictor.db"):
+        self.db_path = Path(db_path)
+        self._bookmaker_ids: Dict[str, int] = {}
+        self._init_tables()
+
+    def _init_tables(self):
+        """Initialize odds history tables."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS odds_bookmakers (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE
+            )
+        """)
+
+        # Clustered on game + bookmaker + time: the primary key is the index
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS odds_history (
+                game_date INTEGER,
+                home_team_id INTEGER,
+                away_team_id INTEGER,
+                bookmaker_id INTEGER,
+                observed_at INTEGER,
+                home_odds INTEGER,
+                away_odds INTEGER,
+                PRIMARY KEY (game_date, home_team_id, away_team_id, bookmaker_id, observed_at)
+            ) WITHOUT ROWID
+        """)
+
+        # Tip-off time per game, so in-play prices are never recorded as "closing"
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS odds_history_games (
+                game_date INTEGER,
+                home_team_id INTEGER,
+                away_team_id INTEGER,
+                commence_at INTEGER,
+                PRIMARY KEY (game_date, home_team_id, away_team_id)
+            ) WITHOUT ROWID
+        """)
+
+        # Every query goes through the primary key; drop the observed_at-only
+        # index older databases were created with
+        cursor.execute("DROP INDEX IF EXISTS idx_odds_history_observed")
+
+        conn.commit()
+        conn.close()
+
+    def _bookmaker_id(self, conn: sqlite3.Connection, key: str) -> int:
+        """Small dictionary table: bookmaker key -> integer id."""
+        bookmaker_id = self._bookmaker_ids.get(key)
+        if bookmaker_id is None:
+            conn.execute("INSERT OR IGNORE INTO odds_bookmakers (key) VALUES (?)", (key,))
+            bookmaker_id = conn.execute(
+                "SELECT id FROM odds_bookmakers WHERE key = ?", (key,)
+            ).fetchone()[0]
+            self._bookmaker_ids[key] = bookmaker_id
+        return bookmaker_id
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def record_board(self, index: Dict[Tuple[int, int, str], Dict],
+                     observed_at: Optional[datetime] = None) -> int:
+        """
+        Record one odds board fetch.
+
+        Args:
+            index: (home_team_id, away_team_id, game_date) -> parsed odds with
+                   'bookmakers': {key: {'home': decimal, 'away': decimal}} and
+                   'commence_time' (see OddsSnapshotService)
+            observed_at: Fetch time (default: now)
+
+        Returns:
+            Number of price changes appended
+        """
+        observed = int((observed_at or datetime.now()).timestamp())
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            # Last known price per (game, bookmaker) for the games on this board
+            game_keys = [(_date_key(d), h, a) for (h, a, d) in index]
+            last_prices = {}
+            for game_key in game_keys:
+                for row in conn.execute("""
+                    SELECT bookmaker_id, home_odds, away_odds
+                    FROM odds_history o
+                    WHERE game_date = ? AND home_team_id = ? AND away_team_id = ?
+                      AND observed_at = (
+                          SELECT MAX(observed_at) FROM odds_history i
+                          WHERE i.game_date = o.game_date
+                            AND i.home_team_id = o.home_team_id
+                            AND i.away_team_id = o.away_team_id
+                            AND i.bookmaker_id = o.bookmaker_id
+                      )
+                """, game_key):
+                    last_prices[(*game_key, row[0])] = (row[1], row[2])
+
+            rows = []
+            games = []
+            for (home_id, away_id, game_date), odds in index.items():
+                date_key = _date_key(game_date)
+                commence_at = _commence_ts(odds.get('commence_time'))
+                if commence_at is not None:
+                    if commence_at <= observed:
+                        continue  # In-play prices are not pre-game line movement
+                    games.append((date_key, home_id, away_id, commence_at))
+
+                for bookmaker, prices in (odds.get('bookmakers') or {}).items():
+                    if not prices.get('home') or not prices.get('away'):
+                        continue
+                    bookmaker_id = self._bookmaker_id(conn, bookmaker)
+                    encoded = (encode_odds(prices['home']), encode_odds(prices['away']))
+                    if last_prices.get((date_key, home_id, away_id, bookmaker_id)) == encoded:
+                        continue
+                    rows.append((date_key, home_id, away_id, bookmaker_id, observed, *encoded))
+
+            conn.executemany("""
+                INSERT OR REPLACE INTO odds_history_games
+                (game_date, home_team_id, away_team_id, commence_at)
+                VALUES (?, ?, ?, ?)
+            """, games)
+            conn.executemany("""
+                INSERT OR IGNORE INTO odds_history
+                (game_date, home_team_id, away_team_id, bookmaker_id, observed_at, home_odds, away_odds)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        conn.close()
+
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def get_line_movement(self, home_team_id: int, away_team_id: int, game_date: str,
+                          bookmaker: Optional[str] = None) -> List[Dict]:
+        """
+        Full price history for a game, oldest first.
+
+        Returns:
+            [{'observed_at': datetime, 'bookmaker': str, 'home_odds': float,
+              'away_odds': float}, ...]
+        """
+        query = """
+            SELECT o.observed_at, b.key, o.home_odds, o.away_odds
+            FROM odds_history o
+            JOIN odds_bookmakers b ON b.id = o.bookmaker_id
+            WHERE o.game_date = ? AND o.home_team_id = ? AND o.away_team_id = ?
+        """
+        params = [_date_key(game_date), home_team_id, away_team_id]
+        if bookmaker:
+            query += " AND b.key = ?"
+            params.append(bookmaker)
+        query += " ORDER BY o.observed_at, b.key"
+
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+
+        return [
+            {
+                'observed_at': datetime.fromtimestamp(row[0]),
+                'bookmaker': row[1],
+                'home_odds': decode_odds(row[2]),
+                'away_odds': decode_odds(row[3])
+            }
+            for row in rows
+        ]
+
+    def _line_at_edge(self, home_team_id: int, away_team_id: int, game_date: str,
+                      closing: bool) -> Optional[Dict]:
+        """First (opening) or last (closing) price of each bookmaker, plus consensus."""
+        edge = 'MAX' if closing else 'MIN'
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(f"""
+            SELECT b.key, o.home_odds, o.away_odds, o.observed_at
+            FROM odds_history o
+            JOIN odds_bookmakers b ON b.id = o.bookmaker_id
+            WHERE o.game_date = ? AND o.home_team_id = ? AND o.away_team_id = ?
+              AND o.observed_at = (
+                  SELECT {edge}(i.observed_at) FROM odds_history i
+                  WHERE i.game_date = o.game_date
+                    AND i.home_team_id = o.home_team_id
+                    AND i.away_team_id = o.away_team_id
+                    AND i.bookmaker_id = o.bookmaker_id
+              )
+        """, (_date_key(game_date), home_team_id, away_team_id)).fetchall()
+        conn.close()
+
+        if not rows:
+            return None
+
+        bookmakers = {row[0]: {'home': decode_odds(row[1]), 'away': decode_odds(row[2])} for row in rows}
+        avg_home = sum(b['home'] for b in bookmakers.values()) / len(bookmakers)
+        avg_away = sum(b['away'] for b in bookmakers.values()) / len(bookmakers)
+
+        # Vig-free implied probability from the consensus price
+        home_implied = 1 / avg_home
+        away_implied = 1 / avg_away
+
+        return {
+            'bookmakers': bookmakers,
+            'avg_home_odds': round(avg_home, 3),
+            'avg_away_odds': round(avg_away, 3),
+            'home_prob': round(home_implied / (home_implied + away_implied), 4),
+            'observed_at': datetime.fromtimestamp(
+                max(row[3] for row in rows) if closing else min(row[3] for row in rows)
+            )
+        }
+
+    def get_opening_line(self, home_team_id: int, away_team_id: int,
+                         game_date: str) -> Optional[Dict]:
+        """First recorded price per bookmaker and the consensus opening line."""
+        return self._line_at_edge(home_team_id, away_team_id, game_date, closing=False)
+
+    def get_closing_line(self, home_team_id: int, away_team_id: int,
+                         game_date: str) -> Optional[Dict]:
+        """Last pre-game price per bookmaker and the consensus closing line."""
+        return self._line_at_edge(home_team_id, away_team_id, game_date, closing=True)
+
+    def get_movement_summary(self, home_team_id: int, away_team_id: int,
+                             game_date: str) -> Optional[Dict]:
+        """
+        Opening vs closing consensus for closing-line-value features.
+
+        Returns:
+            {'opening_home_prob', 'closing_home_prob', 'home_prob_move',
+             'opening_home_odds', 'closing_home_odds', 'observations'}
+        """
+        opening = self.get_opening_line(home_team_id, away_team_id, game_date)
+        closing = self.get_closing_line(home_team_id, away_team_id, game_date)
+        if not opening or not closing:
+            return None
+
+        conn = sqlite3.connect(self.db_path)
+        observations = conn.execute("""
+            SELECT COUNT(*) FROM odds_history
+            WHERE game_date = ? AND home_team_id = ? AND away_team_id = ?
+        """, (_date_key(game_date), home_team_id, away_team_id)).fetchone()[0]
+        conn.close()
+
+        return {
+            'opening_home_prob': opening['home_prob'],
+            'closing_home_prob': closing['home_prob'],
+            'home_prob_move': round(closing['home_prob'] - opening['home_prob'], 4),
+            'opening_home_odds': opening['avg_home_odds'],
+            'closing_home_odds': closing['avg_home_odds'],
+            'observations': observations
+        }
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def compact(self, full_resolution_days: int = 14, bucket_minutes: int = 60) -> int:
+        """
+        Downsample line movement for games older than full_resolution_days.
+
+        Keeps, per game and bookmaker, the first price in each time bucket
+        plus the last (closing) price. Opening lines are always the first
+        price of their bucket, so they survive too.
+
+        Returns:
+            Number of rows removed
+        """
+        cutoff = _date_key((datetime.now() - timedelta(days=full_resolution_days)).strftime('%Y-%m-%d'))
+        bucket_seconds = bucket_minutes * 60
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            cursor = conn.execute("""
+                DELETE FROM odds_history
+                WHERE (game_date, home_team_id, away_team_id, bookmaker_id, observed_at) IN (
+                    SELECT game_date, home_team_id, away_team_id, bookmaker_id, observed_at
+                    FROM (
+                        SELECT game_date, home_team_id, away_team_id, bookmaker_id, observed_at,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY game_date, home_team_id, away_team_id,
+                                                bookmaker_id, observed_at / ?
+                                   ORDER BY observed_at
+                               ) AS bucket_rank,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY game_date, home_team_id, away_team_id, bookmaker_id
+                                   ORDER BY observed_at DESC
+                               ) AS recency_rank
+                        FROM odds_history
+                        WHERE game_date < ?
+                    )
+                    WHERE bucket_rank > 1 AND recency_rank > 1
+                )
+            """, (bucket_seconds, cutoff))
+            removed = cursor.rowcount
+        conn.close()
+
+        return removed
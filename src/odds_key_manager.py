@@ -1,27 +1,202 @@
 """
 Simple API Key Manager for The Odds API
 Stores multiple keys and selects the best one based on quota
+
+Quota is tracked in a SQLite ledger fed by the x-requests-remaining /
+x-requests-used headers of every real odds call (record_quota_headers), so
+picking a key normally costs no requests. Keys are only probed when their
+ledger entry is missing or stale.
 """
 
 import os
 import json
+import hashlib
+import sqlite3
+import threading
+from calendar import monthrange
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, List
-import requests
+from typing import Dict, Optional, List, Tuple
+from src.http_client import http_get
+
+
+LEDGER_DB = Path(os.getenv('ODDS_QUOTA_DB', 'data/nba_predictor.db'))
+LEGACY_LEDGER_FILE = Path('data/odds_api_quota.json')
+LEDGER_MAX_AGE_HOURS = float(os.getenv('ODDS_QUOTA_MAX_AGE_HOURS', '12'))
+
+
+def _fingerprint(api_key: str) -> str:
+    """Ledger key for an API key (the key itself is never written to the ledger)."""
+    return hashlib.sha1(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+class QuotaLedger:
+    """
+    Persisted per-key quota state: remaining, used, status and when it was seen.
+
+    Stored in SQLite (one row per key) so the Streamlit app and the
+    daily/morning runs share it: reads always see the latest entry written
+    by any process, and updates are per-key upserts.
+    """
+
+    def __init__(self, db_path: Path = LEDGER_DB, legacy_file: Path = LEGACY_LEDGER_FILE):
+        self.db_path = Path(db_path)
+        self._init_table()
+        self._import_legacy(Path(legacy_file))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_table(self):
+        """Initialize the quota ledger table."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS odds_api_quota (
+                key_fingerprint TEXT PRIMARY KEY,
+                remaining INTEGER,
+                used INTEGER,
+                status TEXT,
+                error TEXT,
+                updated_at TIMESTAMP
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def _import_legacy(self, legacy_file: Path):
+        """Import the old JSON ledger once, so known keys aren't re-probed."""
+        if not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, 'r') as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"Error loading legacy quota ledger: {e}")
+            return
+
+        conn = self._connect()
+        with conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO odds_api_quota
+                (key_fingerprint, remaining, used, status, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (fingerprint, entry.get('remaining'), entry.get('used'), entry.get('status', 'OK'),
+                 entry.get('error'), entry.get('updated_at'))
+                for fingerprint, entry in entries.items()
+            ])
+        conn.close()
+        try:
+            legacy_file.rename(legacy_file.with_suffix('.json.imported'))
+        except OSError:
+            pass  # Another process imported it first
+
+    def update(self, api_key: str, remaining: Optional[int], used: Optional[int],
+               status: str = 'OK', error: Optional[str] = None):
+        """Record the latest known quota for a key."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("""
+                    INSERT INTO odds_api_quota
+                    (key_fingerprint, remaining, used, status, error, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (key_fingerprint) DO UPDATE SET
+                        remaining = excluded.remaining,
+                        used = excluded.used,
+                        status = excluded.status,
+                        error = excluded.error,
+                        updated_at = excluded.updated_at
+                """, (_fingerprint(api_key), remaining, used, status, error,
+                      datetime.now().isoformat()))
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error saving quota ledger: {e}")
+
+    def get(self, api_key: str) -> Optional[Dict]:
+        conn = self._connect()
+        row = conn.execute("""
+            SELECT remaining, used, status, error, updated_at
+            FROM odds_api_quota WHERE key_fingerprint = ?
+        """, (_fingerprint(api_key),)).fetchone()
+        conn.close()
+        if not row:
+            return None
+        entry = {'remaining': row[0], 'used': row[1], 'status': row[2], 'updated_at': row[4]}
+        if row[3]:
+            entry['error'] = row[3]
+        return entry
+
+    def is_stale(self, api_key: str, max_age_hours: float = LEDGER_MAX_AGE_HOURS) -> bool:
+        """True if the key has no entry, or its entry is older than max_age_hours
+        or predates the monthly quota reset."""
+        entry = self.get(api_key)
+        if not entry:
+            return True
+        updated_at = datetime.fromisoformat(entry['updated_at'])
+        now = datetime.now()
+        if (now.year, now.month) != (updated_at.year, updated_at.month):
+            return True
+        return now - updated_at > timedelta(hours=max_age_hours)
+
+
+_ledger: Optional[QuotaLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """Process-wide quota ledger."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = QuotaLedger()
+    return _ledger
+
+
+def record_quota_headers(api_key: Optional[str], response) -> Optional[Dict]:
+    """
+    Feed an Odds API response's quota headers into the ledger.
+
+    Call after every request made with a key; responses without quota
+    headers are ignored (except 401, which marks the key invalid).
+    """
+    if not api_key or response is None:
+        return None
+    if response.status_code == 401:
+        get_quota_ledger().update(api_key, 0, None, status='ERROR', error='Invalid API key')
+        return None
+
+    remaining = response.headers.get('x-requests-remaining')
+    used = response.headers.get('x-requests-used')
+    if remaining is None:
+        return None
+    try:
+        remaining = int(float(remaining))
+        used = int(float(used)) if used is not None else None
+    except ValueError:
+        return None
+
+    get_quota_ledger().update(api_key, remaining, used)
+    return {'remaining': remaining, 'used': used}
 
 
 class OddsKeyManager:
     """Manages multiple Odds API keys and selects best available"""
 
-    def __init__(self, keys_file: str = "data/odds_api_keys.json"):
+    def __init__(self, keys_file: str = "data/odds_api_keys.json",
+                 ledger: Optional[QuotaLedger] = None):
         """
         Initialize key manager
 
         Args:
             keys_file: Path to JSON file storing API keys
+            ledger: Quota ledger (default: process-wide ledger)
         """
         self.keys_file = Path(keys_file)
         self.keys: Dict[str, str] = {}
+        self.ledger = ledger or get_quota_ledger()
         self._load_keys()
 
     def _load_keys(self):
@@ -70,7 +245,7 @@ class OddsKeyManager:
 
     def get_key_quota(self, api_key: str) -> Dict:
         """
-        Check quota for a specific API key
+        Check quota for a specific API key (live probe, updates the ledger)
 
         Returns:
             {
@@ -81,22 +256,22 @@ class OddsKeyManager:
             }
         """
         try:
-            response = requests.get(
+            response = http_get(
                 "https://api.the-odds-api.com/v4/sports",
                 params={'apiKey': api_key},
                 timeout=5
             )
 
             if response.status_code == 200:
-                remaining = response.headers.get('x-requests-remaining', '0')
-                used = response.headers.get('x-requests-used', '0')
+                quota = record_quota_headers(api_key, response) or {'remaining': 0, 'used': 0}
 
                 return {
-                    'remaining': int(remaining),
-                    'used': int(used),
+                    'remaining': quota['remaining'],
+                    'used': quota['used'],
                     'status': 'OK'
                 }
             elif response.status_code == 401:
+                record_quota_headers(api_key, response)
                 return {'error': 'Invalid API key', 'status': 'ERROR', 'remaining': 0, 'used': 0}
             else:
                 return {'error': f'HTTP {response.status_code}', 'status': 'ERROR', 'remaining': 0, 'used': 0}
@@ -104,10 +279,33 @@ class OddsKeyManager:
         except Exception as e:
             return {'error': str(e), 'status': 'ERROR', 'remaining': 0, 'used': 0}
 
-    def get_all_quotas(self) -> Dict[str, Dict]:
+    def get_cached_quota(self, api_key: str, max_age_hours: float = LEDGER_MAX_AGE_HOURS) -> Dict:
+        """
+        Quota for a key from the ledger; probes only if the entry is stale.
+
+        Returns the same shape as get_key_quota(), plus 'updated_at'.
+        """
+        if self.ledger.is_stale(api_key, max_age_hours):
+            self.get_key_quota(api_key)
+
+        entry = self.ledger.get(api_key)
+        if not entry:
+            return {'error': 'Quota unknown', 'status': 'ERROR', 'remaining': 0, 'used': 0}
+        return {
+            'remaining': entry.get('remaining') or 0,
+            'used': entry.get('used') or 0,
+            'status': entry.get('status', 'OK'),
+            'updated_at': entry.get('updated_at'),
+            **({'error': entry['error']} if entry.get('error') else {})
+        }
+
+    def get_all_quotas(self, use_ledger: bool = False) -> Dict[str, Dict]:
         """
         Get quota info for all stored keys
 
+        Args:
+            use_ledger: Read fresh ledger entries instead of probing every key
+
         Returns:
             {
                 'key_name': {
@@ -122,7 +320,7 @@ class OddsKeyManager:
         quotas = {}
 
         for name, api_key in self.keys.items():
-            quota_info = self.get_key_quota(api_key)
+            quota_info = self.get_cached_quota(api_key) if use_ledger else self.get_key_quota(api_key)
             masked_key = api_key[:8] + "..." + api_key[-4:] if len(api_key) > 12 else "***"
 
             quotas[name] = {
@@ -137,6 +335,8 @@ class OddsKeyManager:
         """
         Get the best API key with sufficient quota
 
+        Uses the quota ledger; only keys with a missing or stale entry are probed.
+
         Args:
             min_remaining: Minimum requests remaining required (default: 50)
 
@@ -147,7 +347,7 @@ class OddsKeyManager:
         max_remaining = 0
 
         for name, api_key in self.keys.items():
-            quota = self.get_key_quota(api_key)
+            quota = self.get_cached_quota(api_key)
 
             if quota.get('status') == 'OK':
                 remaining = quota.get('remaining', 0)
@@ -159,6 +359,56 @@ class OddsKeyManager:
 
         return best_key
 
+    def daily_budget(self, min_remaining: int = 0, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Requests each key can spend per day until the monthly quota reset.
+
+        Args:
+            min_remaining: Reserve to keep untouched on every key
+            now: Reference time (default: now)
+
+        Returns:
+            {key_name: requests_per_day}
+        """
+        now = now or datetime.now()
+        days_left = monthrange(now.year, now.month)[1] - now.day + 1
+
+        budget = {}
+        for name, api_key in self.keys.items():
+            quota = self.get_cached_quota(api_key)
+            if quota.get('status') != 'OK':
+                continue
+            spendable = max(0, quota.get('remaining', 0) - min_remaining)
+            budget[name] = spendable // days_left
+        return budget
+
+    def plan_refreshes(self, refreshes: int, start: datetime, end: datetime,
+                       min_remaining: int = 50) -> List[Tuple[datetime, str]]:
+        """
+        Spread a day's odds refreshes evenly between start and end across keys.
+
+        Each refresh costs one request. Keys are assigned in proportion to
+        their daily budget, and the plan is cut short if the combined budget
+        can't cover every refresh.
+
+        Returns:
+            [(refresh_time, key_name), ...] in time order
+        """
+        budget = {name: n for name, n in self.daily_budget(min_remaining).items() if n > 0}
+        refreshes = min(refreshes, sum(budget.values()))
+        if refreshes <= 0:
+            return []
+
+        step = (end - start) / refreshes if refreshes > 1 else timedelta(0)
+        spent = {name: 0 for name in budget}
+        plan = []
+        for i in range(refreshes):
+            # Key with the largest share of its budget still unspent
+            name = max(budget, key=lambda n: (budget[n] - spent[n]) / budget[n])
+            spent[name] += 1
+            plan.append((start + step * i, name))
+        return plan
+
     def get_key_by_name(self, name: str) -> Optional[str]:
         """Get a specific key by name"""
         return self.keys.get(name)
@@ -5,7 +5,6 @@ Since real-time odds APIs require paid subscriptions, this module provides
 accurate odds calculations based on the same math bookmakers use.
 """
 
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 import re
@@ -13,6 +12,19 @@ from datetime import datetime
 import time
 import numpy as np
 
+from src.http_client import get_http_client
+from src.team_identity import normalize_team_key, resolve_team_id, team_nickname
+
+
+# Different bookmaker profiles with different margins
+BOOKMAKER_PROFILES = {
+    'Pinnacle': {'margin': 0.025, 'type': 'sharp'},      # Sharpest book
+    'Bet365': {'margin': 0.045, 'type': 'recreational'},  # Most popular
+    'DraftKings': {'margin': 0.05, 'type': 'us'},        # US market
+    'FanDuel': {'margin': 0.048, 'type': 'us'},          # US market
+    'BetMGM': {'margin': 0.052, 'type': 'us'},           # US market
+}
+
 
 def generate_bookmaker_odds(home_prob: float, away_prob: float = None,
                            home_elo: float = 1500, away_elo: float = 1500) -> Dict:
@@ -33,58 +45,32 @@ def generate_bookmaker_odds(home_prob: float, away_prob: float = None,
     Returns:
         Dict with bookmaker odds
     """
-    if away_prob is None:
-        away_prob = 1 - home_prob
-
-    # Ensure probabilities are valid
-    home_prob = max(0.05, min(0.95, home_prob))
-    away_prob = max(0.05, min(0.95, away_prob))
-
-    # Normalize
-    total = home_prob + away_prob
-    home_prob /= total
-    away_prob /= total
-
-    # Different bookmaker profiles with different margins
-    bookmaker_profiles = {
-        'Pinnacle': {'margin': 0.025, 'type': 'sharp'},      # Sharpest book
-        'Bet365': {'margin': 0.045, 'type': 'recreational'},  # Most popular
-        'DraftKings': {'margin': 0.05, 'type': 'us'},        # US market
-        'FanDuel': {'margin': 0.048, 'type': 'us'},          # US market
-        'BetMGM': {'margin': 0.052, 'type': 'us'},           # US market
-    }
-
-    bookmakers = {}
-
-    for bookie_name, profile in bookmaker_profiles.items():
-        margin = profile['margin']
-
-        # Apply margin using the multiplicative method
-        home_implied = home_prob * (1 + margin / 2)
-        away_implied = away_prob * (1 + margin / 2)
-
-        # Convert to decimal odds
-        home_odds = round(1 / home_implied, 2)
-        away_odds = round(1 / away_implied, 2)
-
-        # Round to standard increments (books use specific increments)
-        home_odds = _round_to_odds_increment(home_odds)
-        away_odds = _round_to_odds_increment(away_odds)
-
-        bookmakers[bookie_name] = {
-            'home': home_odds,
-            'away': away_odds,
-            'margin': round(margin * 100, 1)
+    slate = generate_bookmaker_odds_matrix(
+        [home_prob], None if away_prob is None else [away_prob]
+    )
+    names = slate['bookmakers']
+    home_odds = slate['home_odds'][0]
+    away_odds = slate['away_odds'][0]
+
+    bookmakers = {
+        name: {
+            'home': float(home_odds[j]),
+            'away': float(away_odds[j]),
+            'margin': round(BOOKMAKER_PROFILES[name]['margin'] * 100, 1)
         }
+        for j, name in enumerate(names)
+    }
 
-    # Find best odds
-    best_home = max(bookmakers.items(), key=lambda x: x[1]['home'])
-    best_away = max(bookmakers.items(), key=lambda x: x[1]['away'])
+    # Find best odds (first bookmaker wins ties)
+    best_home = int(home_odds.argmax())
+    best_away = int(away_odds.argmax())
+    home_prob = float(slate['home_prob'][0])
+    away_prob = float(slate['away_prob'][0])
 
     return {
         'bookmakers': bookmakers,
-        'best_home': {'bookmaker': best_home[0], 'odds': best_home[1]['home']},
-        'best_away': {'bookmaker': best_away[0], 'odds': best_away[1]['away']},
+        'best_home': {'bookmaker': names[best_home], 'odds': float(home_odds[best_home])},
+        'best_away': {'bookmaker': names[best_away], 'odds': float(away_odds[best_away])},
         'fair_home_odds': round(1 / home_prob, 2),
         'fair_away_odds': round(1 / away_prob, 2),
         'home_probability': round(home_prob * 100, 1),
@@ -93,26 +79,69 @@ def generate_bookmaker_odds(home_prob: float, away_prob: float = None,
     }
 
 
+def generate_bookmaker_odds_matrix(home_probs, away_probs=None,
+                                   profiles: Dict[str, Dict] = None) -> Dict:
+    """
+    Simulated odds for a whole slate and every bookmaker profile at once.
+
+    Args:
+        home_probs: Model home win probabilities, shape (games,)
+        away_probs: Away probabilities (default 1 - home_probs)
+        profiles: Bookmaker profiles (default BOOKMAKER_PROFILES)
+
+    Returns:
+        {'bookmakers': names, 'home_odds': (games x bookmakers),
+         'away_odds': (games x bookmakers), 'home_prob': (games,), 'away_prob': (games,)}
+    """
+    profiles = profiles or BOOKMAKER_PROFILES
+    home = np.atleast_1d(np.asarray(home_probs, dtype=float))
+    away = 1 - home if away_probs is None else np.atleast_1d(np.asarray(away_probs, dtype=float))
+
+    # Ensure probabilities are valid, then normalize
+    home = np.clip(home, 0.05, 0.95)
+    away = np.clip(away, 0.05, 0.95)
+    total = home + away
+    home = home / total
+    away = away / total
+
+    names = list(profiles)
+    # Apply margin using the multiplicative method
+    scale = 1 + np.array([profiles[name]['margin'] for name in names]) / 2
+
+    # Convert to decimal odds, then round to standard increments
+    home_odds = round_to_odds_increment_array(np.round(1 / (home[:, None] * scale), 2))
+    away_odds = round_to_odds_increment_array(np.round(1 / (away[:, None] * scale), 2))
+
+    return {
+        'bookmakers': names,
+        'home_odds': home_odds,
+        'away_odds': away_odds,
+        'home_prob': home,
+        'away_prob': away,
+    }
+
+
 def _round_to_odds_increment(odds: float) -> float:
     """
     Round odds to standard bookmaker increments.
     Books don't offer odds like 1.873 - they use specific increments.
     """
-    if odds < 1.5:
-        # Very short odds: 0.01 increments
-        return round(odds, 2)
-    elif odds < 2.0:
-        # Short odds: 0.02 increments
-        return round(odds / 0.02) * 0.02
-    elif odds < 3.0:
-        # Medium odds: 0.05 increments
-        return round(odds / 0.05) * 0.05
-    elif odds < 5.0:
-        # Longer odds: 0.1 increments
-        return round(odds / 0.1) * 0.1
-    else:
-        # Long odds: 0.25 increments
-        return round(odds / 0.25) * 0.25
+    return float(round_to_odds_increment_array(odds))
+
+
+def round_to_odds_increment_array(odds):
+    """
+    Array version of _round_to_odds_increment.
+
+    < 1.5: 0.01, < 2.0: 0.02, < 3.0: 0.05, < 5.0: 0.1, otherwise 0.25 increments
+    """
+    odds = np.asarray(odds, dtype=float)
+    step = np.select(
+        [odds < 1.5, odds < 2.0, odds < 3.0, odds < 5.0],
+        [0.01, 0.02, 0.05, 0.1],
+        default=0.25
+    )
+    return np.where(odds < 1.5, np.round(odds, 2), np.round(odds / step) * step)
 
 
 def odds_to_american(decimal_odds: float) -> str:
@@ -155,8 +184,7 @@ class BettingOddsScraper:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.http = get_http_client()
     
     def get_oddsportal_odds(self, home_team: str, away_team: str) -> Optional[Dict]:
         """
@@ -178,7 +206,7 @@ class BettingOddsScraper:
             # Search for the specific game
             search_url = "https://www.oddsportal.com/basketball/usa/nba/"
             
-            response = self.session.get(search_url, timeout=10)
+            response = self.http.get(search_url, headers=self.headers, timeout=10)
             if response.status_code != 200:
                 return None
             
@@ -208,7 +236,7 @@ class BettingOddsScraper:
     def _scrape_oddsportal_game(self, game_url: str) -> Optional[Dict]:
         """Scrape detailed odds from a specific game page"""
         try:
-            response = self.session.get(game_url, timeout=10)
+            response = self.http.get(game_url, headers=self.headers, timeout=10)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract odds from the table
@@ -262,7 +290,7 @@ class BettingOddsScraper:
         """
         try:
             url = "https://www.flashscore.com/basketball/usa/nba/"
-            response = self.session.get(url, timeout=10)
+            response = self.http.get(url, headers=self.headers, timeout=10)
             
             if response.status_code != 200:
                 return None
@@ -326,18 +354,11 @@ class BettingOddsScraper:
         return None
     
     def _normalize_team_name(self, team_name: str) -> str:
-        """Normalize team names for matching"""
-        # Remove common words and convert to lowercase
-        normalized = team_name.lower()
-        normalized = normalized.replace('los angeles', 'la')
-        normalized = normalized.replace('new york', 'ny')
-        normalized = normalized.replace('golden state', 'gs')
-        
-        # Extract key words (usually the last word is the team name)
-        words = normalized.split()
-        if len(words) > 1:
-            return words[-1]  # e.g., "lakers", "celtics", "nuggets"
-        return normalized
+        """Normalize team names for matching (lowercase nickname, e.g. 'lakers')"""
+        team_id = resolve_team_id(team_name)
+        if team_id is None:
+            return normalize_team_key(team_name)
+        return team_nickname(team_id).lower()
 
 
 # Simple fallback using a free odds API (no key required for basic access)
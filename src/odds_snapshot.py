@@ -0,0 +1,224 @@
+"""
+Odds Snapshot Service
+Fetches the NBA odds board once per refresh interval and serves every game from it
+
+The Odds API returns the whole board for one quota request, so a slate of
+N games costs 1 request instead of N. The board is indexed by
+(home_team_id, away_team_id, game_date) and persisted in the odds cache
+(OddsCache), so other processes and RealOddsFetcher reuse a fresh board
+instead of re-fetching.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.odds_api_client import OddsAPIClient
+from src.odds_cache import OddsCache, game_date_from_commence
+from src.odds_history import OddsHistoryStore
+from src.odds_key_manager import OddsKeyManager
+from src.team_identity import resolve_team_id
+
+
+DEFAULT_REFRESH_MINUTES = int(os.getenv('ODDS_SNAPSHOT_REFRESH_MINUTES', '60'))
+
+
+def index_board(games: List[Dict], parse_game: Callable[[Dict], Optional[Dict]]
+                ) -> Dict[Tuple[int, int, str], Dict]:
+    """
+    Index a raw Odds API board by (home_team_id, away_team_id, game_date).
+
+    Args:
+        games: Raw /odds response
+        parse_game: Parser turning one raw game into the parsed odds dict
+    """
+    index = {}
+    for game in games:
+        home_id = resolve_team_id(game.get('home_team', ''))
+        away_id = resolve_team_id(game.get('away_team', ''))
+        game_date = game_date_from_commence(game.get('commence_time', ''))
+        if home_id is None or away_id is None or not game_date:
+            print(f"[WARN] Skipping unrecognized odds game: {game.get('away_team')} @ {game.get('home_team')}")
+            continue
+        parsed = parse_game(game)
+        if parsed:
+            index[(home_id, away_id, game_date)] = parsed
+    return index
+
+
+class OddsSnapshotService:
+    """
+    Slate-level odds board shared by all games.
+
+    Features:
+    - One Odds API request per refresh interval (instead of one per game)
+    - Optional budgeted schedule spreading the day's requests across keys
+    - O(1) lookup by (home_team_id, away_team_id, game_date)
+    - Boards persisted in the shared odds cache, reused across processes while fresh
+    - Every fetch recorded in the line-movement history (OddsHistoryStore)
+    - Thread-safe: concurrent predictions trigger at most one fetch
+    """
+
+    # Wait this long before re-fetching after a failed board download
+    FAILURE_BACKOFF = timedelta(minutes=5)
+
+    def __init__(self, db_path: str = "data/nba_predictor.db",
+                 odds_client: Optional[OddsAPIClient] = None,
+                 refresh_minutes: int = DEFAULT_REFRESH_MINUTES,
+                 key_manager: Optional[OddsKeyManager] = None):
+        """
+        Args:
+            db_path: Database holding the odds cache
+            odds_client: Client used for board downloads
+            refresh_minutes: Target interval between downloads
+            key_manager: If given (and it has keys), downloads follow the
+                         day's budgeted plan (OddsKeyManager.plan_refreshes)
+        """
+        self.db_path = Path(db_path)
+        self.odds_client = odds_client or OddsAPIClient()
+        self.refresh_interval = timedelta(minutes=refresh_minutes)
+        self.cache = OddsCache(db_path, ttl_minutes=refresh_minutes)
+        self.history = OddsHistoryStore(db_path)
+        self.key_manager = key_manager
+        self._plan: Optional[Tuple[date, List[Tuple[datetime, str]]]] = None
+
+        self._games: List[Dict] = []
+        self._index: Dict[Tuple[int, int, str], Dict] = {}
+        self._fetched_at: Optional[datetime] = None
+        self._failed_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def find_game_odds(self, home_team: str, away_team: str,
+                       game_date: str = None) -> Optional[Dict]:
+        """
+        Odds for one matchup from the current snapshot.
+
+        Args:
+            home_team: Home team name (e.g., "Los Angeles Lakers")
+            away_team: Away team name (e.g., "Boston Celtics")
+            game_date: Game date (YYYY-MM-DD); if None, the next listed game
+
+        Returns:
+            Parsed odds (see OddsAPIClient._parse_game_odds) or None
+        """
+        home_id = resolve_team_id(home_team)
+        away_id = resolve_team_id(away_team)
+        if home_id is None or away_id is None:
+            print(f"[WARN] Unknown team name for odds lookup: {away_team} @ {home_team}")
+            return None
+        return self.find_game_odds_by_id(home_id, away_id, game_date)
+
+    def find_game_odds_by_id(self, home_team_id: int, away_team_id: int,
+                             game_date: str = None) -> Optional[Dict]:
+        """Odds for one matchup by team IDs (see find_game_odds)."""
+        index = self.get_index()
+
+        if game_date:
+            return index.get((home_team_id, away_team_id, game_date))
+
+        candidates = sorted(
+            (key[2], odds) for key, odds in index.items()
+            if key[0] == home_team_id and key[1] == away_team_id
+        )
+        return candidates[0][1] if candidates else None
+
+    def get_index(self, force_refresh: bool = False) -> Dict[Tuple[int, int, str], Dict]:
+        """
+        Current board indexed by (home_team_id, away_team_id, game_date).
+
+        Served from memory, then from the latest persisted snapshot, and
+        only re-fetched once older than the refresh interval.
+        """
+        with self._lock:
+            now = datetime.now()
+            due = self._due_refresh(now)
+            # A snapshot fetched after the due slot is current; with no slot
+            # due (today's budget is spent) the latest snapshot is served
+            cutoff = due[0] if due else datetime.min
+            if not force_refresh:
+                if self._fetched_at and self._fetched_at > cutoff:
+                    return self._index
+
+                loaded = self.cache.latest_board(
+                    max_age=None if cutoff == datetime.min else now - cutoff
+                )
+                if loaded is not None:
+                    self._fetched_at, self._games = loaded
+                    self._index = index_board(self._games, self.odds_client._parse_game_odds)
+                    return self._index
+
+                if due is None:
+                    return self._index
+
+                if self._failed_at and now - self._failed_at < self.FAILURE_BACKOFF:
+                    return self._index
+
+            return self._refresh(due[1] if due else None)
+
+    def _due_refresh(self, now: datetime) -> Optional[Tuple[datetime, Optional[str]]]:
+        """
+        The refresh slot currently due: (slot_time, key_name).
+
+        Without a key manager a refresh is due every refresh interval, on the
+        client's key. With one, the day's refreshes follow its budgeted plan:
+        at most one download per slot, on the slot's key. Returns None if no
+        slot is due yet (or the keys have no budget left today).
+        """
+        if self.key_manager is None or not self.key_manager.list_keys():
+            return now - self.refresh_interval, None
+
+        if self._plan is None or self._plan[0] != now.date():
+            day_start = datetime.combine(now.date(), datetime.min.time())
+            refreshes = math.ceil(timedelta(days=1) / self.refresh_interval)
+            plan = self.key_manager.plan_refreshes(refreshes, day_start, day_start + timedelta(days=1))
+            self._plan = (now.date(), plan)
+            print(f"Odds refresh plan: {len(plan)} of {refreshes} refreshes fit today's key budget")
+
+        due = [slot for slot in self._plan[1] if slot[0] <= now]
+        return due[-1] if due else None
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+    def _refresh(self, key_name: Optional[str] = None) -> Dict[Tuple[int, int, str], Dict]:
+        """Download the board once (on key_name's key, if given), index it and persist it."""
+        if key_name:
+            self.odds_client.api_key = self.key_manager.get_key_by_name(key_name)
+        games = self.odds_client.get_upcoming_games_odds()
+        fetched_at = datetime.now()
+
+        if not games:
+            self._failed_at = fetched_at
+            return self._index
+
+        index = index_board(games, self.odds_client._parse_game_odds)
+
+        try:
+            self.cache.store_board(games, fetched_at)
+        except sqlite3.Error as e:
+            print(f"[WARN] Could not cache odds board: {e}")
+        try:
+            self.history.record_board(index, fetched_at)
+        except sqlite3.Error as e:
+            print(f"[WARN] Could not record line movement: {e}")
+        self._games = games
+        self._index = index
+        self._fetched_at = fetched_at
+        print(f"Odds snapshot: {len(index)} games indexed")
+        return index
+
+    def get_board(self, force_refresh: bool = False) -> List[Dict]:
+        """Current board as raw /odds games (same refresh rules as get_index)."""
+        self.get_index(force_refresh=force_refresh)
+        return self._games
+
+    def list_games(self) -> List[Dict]:
+        """All games on the current board (parsed odds)."""
+        return list(self.get_index().values())
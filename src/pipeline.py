@@ -0,0 +1,312 @@
+"""
+Pipeline Runner
+Small declarative step graph with concurrent execution of independent steps
+
+A workflow is a list of Steps. Each step names the values it needs
+(inputs), the values it produces (outputs) and the steps it must wait for
+without consuming anything (after). Every step whose dependencies are done
+runs at once on a thread pool; wall time and status are recorded per step.
+A failed non-critical step only skips the steps that need its outputs.
+With a RunCheckpoint, completed steps are persisted and restored on resume.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.telemetry import span
+
+
+class StopPipeline(Exception):
+    """Raised by a step to end the workflow early (e.g. no games today)."""
+
+    def __init__(self, reason: str, success: bool = True):
+        super().__init__(reason)
+        self.reason = reason
+        self.success = success
+
+
+@dataclass
+class Step:
+    """One unit of work in a workflow graph"""
+    name: str
+    func: Callable[..., Any]         # Called with its inputs as keyword arguments
+    inputs: Tuple[str, ...] = ()     # Context values required (outputs of other steps or seeds)
+    outputs: Tuple[str, ...] = ()    # Context values produced (one: return value; several: dict)
+    after: Tuple[str, ...] = ()      # Steps to wait for without consuming their outputs
+    timeout: Optional[float] = None  # Seconds before the step is abandoned
+    critical: bool = True            # Failure ends the workflow
+    resumable: bool = True           # Restorable from a checkpoint (False: in-memory setup)
+
+
+@dataclass
+class StepResult:
+    """Outcome of one step"""
+    name: str
+    status: str = 'pending'  # ok, failed, timeout, skipped, stopped, resumed
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a workflow run"""
+    success: bool
+    context: Dict[str, Any]
+    steps: Dict[str, StepResult] = field(default_factory=dict)
+    seconds: float = 0.0
+    stop_reason: Optional[str] = None
+
+    def summary_lines(self) -> List[str]:
+        """One line per step: status, wall time and error."""
+        lines = []
+        for result in self.steps.values():
+            line = f"  {result.name:<22} {result.status:<8} {result.seconds:7.2f}s"
+            if result.error:
+                line += f"  ({result.error})"
+            lines.append(line)
+        return lines
+
+
+class StepGraph:
+    """
+    Runs a list of Steps in dependency order with bounded concurrency.
+
+    Features:
+    - Declared inputs/outputs/after edges, validated before running
+    - Independent steps run concurrently (ThreadPoolExecutor)
+    - Per-step wall time, status and error
+    - Per-step timeouts (the worker thread cannot be killed, so it is abandoned)
+    - Non-critical failures only skip the steps that need their outputs
+    - Checkpoint/resume: completed steps are restored, and in-memory setup
+      steps only run if something downstream still has to run
+    """
+
+    def __init__(self, steps: List[Step], max_workers: int = 4,
+                 logger: Optional[logging.Logger] = None):
+        self.steps = {step.name: step for step in steps}
+        self.max_workers = max_workers
+        self.logger = logger or logging.getLogger(__name__)
+        self._validate(steps)
+
+    def _validate(self, steps: List[Step]):
+        if len(self.steps) != len(steps):
+            raise ValueError("Duplicate step names in pipeline")
+        producers = self._producers()
+        for step in steps:
+            for name in step.after:
+                if name not in self.steps:
+                    raise ValueError(f"Step '{step.name}' waits for unknown step '{name}'")
+        # Cycle check and topological order (Kahn)
+        self._order = []
+        remaining = {name: set(self._dependencies(step, producers)) for name, step in self.steps.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps & remaining.keys()]
+            if not ready:
+                raise ValueError(f"Cycle in pipeline between steps: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            self._order.extend(ready)
+
+    def _producers(self) -> Dict[str, str]:
+        producers = {}
+        for step in self.steps.values():
+            for output in step.outputs:
+                if output in producers:
+                    raise ValueError(f"Output '{output}' produced by both '{producers[output]}' and '{step.name}'")
+                producers[output] = step.name
+        return producers
+
+    @staticmethod
+    def _dependencies(step: Step, producers: Dict[str, str]) -> List[str]:
+        return [producers[name] for name in step.inputs if name in producers] + list(step.after)
+
+    def run(self, context: Optional[Dict[str, Any]] = None, checkpoint=None) -> PipelineResult:
+        """
+        Execute the graph.
+
+        Args:
+            context: Seed values available as step inputs
+            checkpoint: Optional RunCheckpoint; successful resumable steps are
+                        saved to it, and restored from it when it resumes
+
+        Returns:
+            PipelineResult (context holds every produced output)
+        """
+        context = dict(context or {})
+        producers = self._producers()
+        for step in self.steps.values():
+            for name in step.inputs:
+                if name not in producers and name not in context:
+                    raise ValueError(f"Step '{step.name}' needs '{name}', which nothing provides")
+
+        results = {name: StepResult(name) for name in self.steps}
+        if checkpoint is not None:
+            self._restore(checkpoint, results, context, producers)
+        running: Dict[Future, Tuple[str, float]] = {}
+        success = True
+        stop_reason = None
+        started = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='step')
+        try:
+            while True:
+                if stop_reason is None:
+                    self._skip_unreachable(results, producers)
+                    for name in self._ready(results, producers):
+                        step = self.steps[name]
+                        kwargs = {key: context[key] for key in step.inputs}
+                        results[name].status = 'running'
+                        self.logger.info(f"[STEP] {name} started")
+                        running[executor.submit(self._timed_call, name, step.func, kwargs)] = (name, time.perf_counter())
+
+                if not running:
+                    break
+
+                deadlines = [
+                    start + self.steps[name].timeout
+                    for name, start in running.values() if self.steps[name].timeout
+                ]
+                wait_for = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name, _ = running.pop(future)
+                    outcome = self._collect(future, self.steps[name], results[name], context, checkpoint)
+                    if outcome is not None:
+                        stop_success, reason = outcome
+                        success = success and stop_success
+                        stop_reason = stop_reason or reason
+
+                # Abandon steps past their timeout
+                now = time.perf_counter()
+                for future, (name, start) in list(running.items()):
+                    step = self.steps[name]
+                    if step.timeout and now - start >= step.timeout:
+                        running.pop(future)
+                        result = results[name]
+                        result.status, result.seconds = 'timeout', now - start
+                        result.error = f"timed out after {step.timeout:g}s"
+                        self.logger.warning(f"[STEP] {name} timed out after {step.timeout:g}s")
+                        if step.critical:
+                            success = False
+                            stop_reason = stop_reason or f"critical step '{name}' timed out"
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for result in results.values():
+            if result.status == 'pending':
+                result.status = 'skipped'
+
+        return PipelineResult(success=success, context=context, steps=results,
+                              seconds=time.perf_counter() - started, stop_reason=stop_reason)
+
+    @staticmethod
+    def _timed_call(name: str, func: Callable, kwargs: Dict) -> Tuple[Any, float, Optional[BaseException]]:
+        """Run a step in its worker thread: (value, seconds, exception)."""
+        start = time.perf_counter()
+        try:
+            with span(f"step.{name}"):
+                value = func(**kwargs)
+            return value, time.perf_counter() - start, None
+        except Exception as e:
+            return None, time.perf_counter() - start, e
+
+    def _restore(self, checkpoint, results: Dict[str, StepResult],
+                 context: Dict[str, Any], producers: Dict[str, str]):
+        """Mark steps completed by a previous attempt as resumed and load their outputs."""
+        restored = {}
+        for name in self._order:
+            step = self.steps[name]
+            if not step.resumable:
+                continue
+            # A step that reruns makes everything downstream of it stale
+            upstream = [dep for dep in self._dependencies(step, producers) if self.steps[dep].resumable]
+            outputs = checkpoint.load_step(name) if all(dep in restored for dep in upstream) else None
+            if outputs is None or any(key not in outputs for key in step.outputs):
+                checkpoint.invalidate(name)
+                continue
+            restored[name] = outputs
+
+        # In-memory setup steps are only needed if something after them still runs
+        needed = set()
+        for name in reversed(self._order):
+            step = self.steps[name]
+            if name in restored:
+                continue
+            dependents = [
+                other for other, other_step in self.steps.items()
+                if name in self._dependencies(other_step, producers)
+            ]
+            if step.resumable or not dependents or any(dep in needed for dep in dependents):
+                needed.add(name)
+
+        for name in self._order:
+            if name in needed:
+                continue
+            context.update(restored.get(name, {}))
+            results[name].status = 'resumed'
+            self.logger.info(f"[STEP] {name} restored from checkpoint")
+
+    def _collect(self, future: Future, step: Step, result: StepResult,
+                 context: Dict[str, Any], checkpoint=None) -> Optional[Tuple[bool, str]]:
+        """Record a finished step; returns (success, reason) if the workflow must stop."""
+        value, result.seconds, error = future.result()
+        if isinstance(error, StopPipeline):
+            result.status = 'stopped'
+            result.error = error.reason
+            self.logger.info(f"[STEP] {step.name} stopped the workflow: {error.reason}")
+            return error.success, error.reason
+        if error is not None:
+            result.status = 'failed'
+            result.error = f"{type(error).__name__}: {error}"
+            self.logger.error(f"[STEP] {step.name} failed: {error}", exc_info=error)
+            if step.critical:
+                return False, f"critical step '{step.name}' failed"
+            return None
+
+        if len(step.outputs) == 1:
+            context[step.outputs[0]] = value
+        elif step.outputs:
+            for key in step.outputs:
+                context[key] = value[key]
+        result.status = 'ok'
+        self.logger.info(f"[STEP] {step.name} done in {result.seconds:.2f}s")
+
+        if checkpoint is not None and step.resumable:
+            try:
+                checkpoint.save_step(step.name, {key: context[key] for key in step.outputs}, result.seconds)
+            except (OSError, TypeError, ValueError) as e:
+                self.logger.warning(f"[STEP] {step.name} checkpoint not saved: {e}")
+        return None
+
+    def _ready(self, results: Dict[str, StepResult], producers: Dict[str, str]) -> List[str]:
+        """Pending steps whose dependencies have all finished."""
+        finished = {'ok', 'failed', 'timeout', 'skipped', 'resumed'}
+        ready = []
+        for name, step in self.steps.items():
+            if results[name].status != 'pending':
+                continue
+            if all(results[dep].status in finished for dep in self._dependencies(step, producers)):
+                ready.append(name)
+        return ready
+
+    def _skip_unreachable(self, results: Dict[str, StepResult], producers: Dict[str, str]):
+        """Skip pending steps whose inputs come from a step that did not succeed."""
+        changed = True
+        while changed:
+            changed = False
+            for name, step in self.steps.items():
+                if results[name].status != 'pending':
+                    continue
+                missing = [
+                    producers[key] for key in step.inputs
+                    if key in producers and results[producers[key]].status in ('failed', 'timeout', 'skipped')
+                ]
+                if missing:
+                    results[name].status = 'skipped'
+                    results[name].error = f"input from '{missing[0]}' unavailable"
+                    self.logger.warning(f"[STEP] {name} skipped: input from '{missing[0]}' unavailable")
+                    changed = True
@@ -5,11 +5,118 @@ Robust caching system for NBA player statistics to avoid slow API calls
 
 import sqlite3
 import json
+import copy
+import threading
+import weakref
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Any, Dict, Hashable, Optional, List, Iterable, Tuple
 import time
 
+# Entries kept in the in-process tier (a slate touches ~30 rosters + ~500 players)
+DEFAULT_MEMORY_SIZE = 2048
+
+
+def _json_default(value):
+    """Serialize numpy scalars coming from nba_api DataFrames."""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _LRUTier:
+    """
+    Bounded in-memory LRU with per-entry expiry.
+
+    Expired entries are dropped on lookup; when full, the least recently
+    used entry is evicted. Values are deep-copied in and out so callers
+    can't mutate cached state.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MEMORY_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any, expires_at: float):
+        if self.max_size <= 0 or expires_at <= time.time():
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+# One memory tier per cache file, shared by every PlayerStatsCache instance in
+# the process (NBADataFetcher is constructed per game during a slate)
+_memory_tiers: Dict[str, _LRUTier] = {}
+_memory_tiers_lock = threading.Lock()
+
+
+def _shared_memory_tier(db_path: Path, max_size: int) -> _LRUTier:
+    key = str(db_path.resolve())
+    with _memory_tiers_lock:
+        tier = _memory_tiers.get(key)
+        if tier is None:
+            tier = _LRUTier(max_size)
+            _memory_tiers[key] = tier
+        return tier
+
+
+def _release_connection(connections: Dict[int, sqlite3.Connection],
+                        lock: threading.Lock, key: int):
+    """Close and forget a per-thread connection (runs when its thread is collected)."""
+    with lock:
+        conn = connections.pop(key, None)
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
 
 class PlayerStatsCache:
     """
@@ -19,17 +126,54 @@ class PlayerStatsCache:
     - Stores player stats with expiration (24h TTL)
     - Automatic cleanup of stale data
     - Batch updates for efficiency
-    - Thread-safe operations
+    - Thread-safe operations (one persistent connection per thread)
+    - In-process LRU tier in front of SQLite (writes go through to both)
     """
 
-    def __init__(self, db_path: str = 'data/player_cache.db'):
+    def __init__(self, db_path: str = 'data/player_cache.db',
+                 memory_size: int = DEFAULT_MEMORY_SIZE):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._memory = _shared_memory_tier(self.db_path, memory_size)
+        self._disk_hits = 0
+        self._disk_misses = 0
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
         self._init_db()
 
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get this thread's persistent connection (opened on first use)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            # WAL lets prediction worker threads read while another thread writes
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections[id(conn)] = conn
+            # The cache is shared process-wide: release the connection when its
+            # thread goes away (pool workers, Streamlit script runs), not on close()
+            weakref.finalize(threading.current_thread(), _release_connection,
+                             self._connections, self._connections_lock, id(conn))
+        return conn
+
+    def close(self):
+        """Close all per-thread connections."""
+        with self._connections_lock:
+            for conn in self._connections.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
     def _init_db(self):
         """Initialize cache database with tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
 
         # Player stats cache table
@@ -69,37 +213,53 @@ class PlayerStatsCache:
         ''')
 
         conn.commit()
-        conn.close()
+
+    def _count_disk(self, hit: bool, n: int = 1):
+        """Record SQLite-tier lookups."""
+        with self._stats_lock:
+            if hit:
+                self._disk_hits += n
+            else:
+                self._disk_misses += n
+
+    def _read_disk(self, key: Hashable, query: str, params: tuple) -> Optional[Any]:
+        """Look up one row in SQLite and promote a live hit to the memory tier."""
+        result = self._get_conn().execute(query, params).fetchone()
+
+        if result:
+            value_json, expires_at = result
+            expires = datetime.fromisoformat(expires_at)
+            if datetime.now() < expires:
+                value = json.loads(value_json)
+                self._memory.set(key, value, expires.timestamp())
+                self._count_disk(True)
+                return value
+
+        self._count_disk(False)
+        return None
 
     def get_player_stats(self, player_id: int) -> Optional[Dict]:
         """Get cached player stats if not expired"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        key = ('player', int(player_id))
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached
 
-        cursor.execute('''
+        return self._read_disk(key, '''
             SELECT stats_json, expires_at
             FROM player_stats_cache
             WHERE player_id = ?
         ''', (player_id,))
 
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            stats_json, expires_at = result
-            if datetime.now() < datetime.fromisoformat(expires_at):
-                return json.loads(stats_json)
-
-        return None
-
     def set_player_stats(self, player_id: int, player_name: str,
                         team_id: int, stats: Dict, ttl_hours: int = 24):
         """Cache player stats with expiration"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
 
         cached_at = datetime.now()
         expires_at = cached_at + timedelta(hours=ttl_hours)
+        stats_json = json.dumps(stats, default=_json_default)
 
         cursor.execute('''
             INSERT OR REPLACE INTO player_stats_cache
@@ -109,43 +269,128 @@ class PlayerStatsCache:
             player_id,
             player_name,
             team_id,
-            json.dumps(stats),
+            stats_json,
             cached_at.isoformat(),
             expires_at.isoformat()
         ))
 
         conn.commit()
-        conn.close()
+        self._memory.set(('player', int(player_id)), json.loads(stats_json), expires_at.timestamp())
+
+    def get_many_player_stats(self, player_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Get cached stats for many players in one query.
+
+        Players found in the memory tier skip SQLite entirely.
+
+        Returns:
+            Dictionary mapping player_id -> stats for unexpired entries only
+            (missing/expired players are simply absent)
+        """
+        ids = list({int(pid) for pid in player_ids if pid})
+        if not ids:
+            return {}
+
+        results = {}
+        remaining = []
+        for pid in ids:
+            cached = self._memory.get(('player', pid))
+            if cached is not None:
+                results[pid] = cached
+            else:
+                remaining.append(pid)
+
+        if not remaining:
+            return results
+
+        conn = self._get_conn()
+        now = datetime.now()
+        found = 0
+
+        # Stay under SQLite's host-parameter limit
+        for start in range(0, len(remaining), 500):
+            chunk = remaining[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(f'''
+                SELECT player_id, stats_json, expires_at
+                FROM player_stats_cache
+                WHERE player_id IN ({placeholders}) AND expires_at > ?
+            ''', (*chunk, now.isoformat())).fetchall()
+            for player_id, stats_json, expires_at in rows:
+                stats = json.loads(stats_json)
+                results[player_id] = stats
+                self._memory.set(('player', player_id), stats,
+                                 datetime.fromisoformat(expires_at).timestamp())
+                found += 1
+
+        self._count_disk(True, found)
+        self._count_disk(False, len(remaining) - found)
+        return results
+
+    def set_many_player_stats(self, entries: Iterable[Tuple[int, str, int, Dict]],
+                              ttl_hours: int = 24) -> int:
+        """
+        Cache stats for many players in a single transaction.
+
+        Args:
+            entries: Iterable of (player_id, player_name, team_id, stats)
+            ttl_hours: Expiration for every entry
+
+        Returns:
+            Number of rows written
+        """
+        cached_at = datetime.now()
+        expires_at = cached_at + timedelta(hours=ttl_hours)
+
+        rows = [
+            (
+                int(player_id),
+                player_name,
+                int(team_id) if team_id is not None else None,
+                json.dumps(stats, default=_json_default),
+                cached_at.isoformat(),
+                expires_at.isoformat()
+            )
+            for player_id, player_name, team_id, stats in entries
+        ]
+        if not rows:
+            return 0
+
+        conn = self._get_conn()
+        with conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO player_stats_cache
+                (player_id, player_name, team_id, stats_json, cached_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+        for row in rows:
+            self._memory.set(('player', row[0]), json.loads(row[3]), expires_at.timestamp())
+
+        return len(rows)
 
     def get_team_roster(self, team_id: int, season: str) -> Optional[List[Dict]]:
         """Get cached team roster"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        key = ('roster', int(team_id), season)
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached
 
-        cursor.execute('''
+        return self._read_disk(key, '''
             SELECT roster_json, expires_at
             FROM team_roster_cache
             WHERE team_id = ? AND season = ?
         ''', (team_id, season))
 
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            roster_json, expires_at = result
-            if datetime.now() < datetime.fromisoformat(expires_at):
-                return json.loads(roster_json)
-
-        return None
-
     def set_team_roster(self, team_id: int, season: str,
                        roster: List[Dict], ttl_hours: int = 168):  # 1 week
         """Cache team roster"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
 
         cached_at = datetime.now()
         expires_at = cached_at + timedelta(hours=ttl_hours)
+        roster_json = json.dumps(roster, default=_json_default)
 
         cursor.execute('''
             INSERT OR REPLACE INTO team_roster_cache
@@ -154,43 +399,38 @@ class PlayerStatsCache:
         ''', (
             team_id,
             season,
-            json.dumps(roster),
+            roster_json,
             cached_at.isoformat(),
             expires_at.isoformat()
         ))
 
         conn.commit()
-        conn.close()
+        # Store the JSON round-trip so memory hits match what SQLite would return
+        self._memory.set(('roster', int(team_id), season), json.loads(roster_json),
+                         expires_at.timestamp())
 
     def get_team_aggregated_stats(self, team_id: int, season: str) -> Optional[Dict]:
         """Get cached aggregated team player stats"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        key = ('team', int(team_id), season)
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached
 
-        cursor.execute('''
+        return self._read_disk(key, '''
             SELECT stats_json, expires_at
             FROM team_player_stats_cache
             WHERE team_id = ? AND season = ?
         ''', (team_id, season))
 
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            stats_json, expires_at = result
-            if datetime.now() < datetime.fromisoformat(expires_at):
-                return json.loads(stats_json)
-
-        return None
-
     def set_team_aggregated_stats(self, team_id: int, season: str,
                                   stats: Dict, ttl_hours: int = 24):
         """Cache aggregated team player stats"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
 
         cached_at = datetime.now()
         expires_at = cached_at + timedelta(hours=ttl_hours)
+        stats_json = json.dumps(stats, default=_json_default)
 
         cursor.execute('''
             INSERT OR REPLACE INTO team_player_stats_cache
@@ -199,17 +439,18 @@ class PlayerStatsCache:
         ''', (
             team_id,
             season,
-            json.dumps(stats),
+            stats_json,
             cached_at.isoformat(),
             expires_at.isoformat()
         ))
 
         conn.commit()
-        conn.close()
+        self._memory.set(('team', int(team_id), season), json.loads(stats_json),
+                         expires_at.timestamp())
 
     def cleanup_expired(self):
         """Remove expired cache entries"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
 
         now = datetime.now().isoformat()
@@ -220,13 +461,13 @@ class PlayerStatsCache:
 
         deleted = cursor.rowcount
         conn.commit()
-        conn.close()
+        self._memory.purge_expired()
 
         return deleted
 
     def clear_all(self):
         """Clear entire cache"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
 
         cursor.execute('DELETE FROM player_stats_cache')
@@ -234,11 +475,11 @@ class PlayerStatsCache:
         cursor.execute('DELETE FROM team_player_stats_cache')
 
         conn.commit()
-        conn.close()
+        self._memory.clear()
 
     def get_cache_stats(self) -> Dict:
-        """Get cache statistics"""
-        conn = sqlite3.connect(self.db_path)
+        """Get cache statistics (entry counts plus hit/miss counters per tier)"""
+        conn = self._get_conn()
         cursor = conn.cursor()
 
         cursor.execute('SELECT COUNT(*) FROM player_stats_cache')
@@ -255,11 +496,14 @@ class PlayerStatsCache:
         cursor.execute('SELECT COUNT(*) FROM player_stats_cache WHERE expires_at < ?', (now,))
         expired_players = cursor.fetchone()[0]
 
-        conn.close()
+        with self._stats_lock:
+            disk_stats = {'hits': self._disk_hits, 'misses': self._disk_misses}
 
         return {
             'total_players': player_count,
             'total_rosters': roster_count,
             'total_team_stats': team_stats_count,
-            'expired_entries': expired_players
+            'expired_entries': expired_players,
+            'memory': self._memory.stats(),
+            'sqlite': disk_stats
         }
@@ -0,0 +1,178 @@
+"""
+Predictions Table Schema
+Normalized keys (team IDs, game_id, model version) for the predictions table
+
+The predictions table historically stored free-text team names (tricodes or
+full names) and an often empty game_id. This migration adds home_team_id,
+away_team_id, game_id and model_version, backfills them in bulk and adds the
+indexes consumers need, so lookups no longer re-normalize names.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from src.team_identity import resolve_team_id
+
+
+# Recorded in schema_migrations once the bulk backfill has run
+MIGRATION_NAME = 'predictions_keys_v1'
+
+PREDICTION_KEY_COLUMNS = [
+    ('home_team_id', 'INTEGER'),
+    ('away_team_id', 'INTEGER'),
+    ('game_id', 'TEXT'),
+    ('model_version', 'TEXT'),
+]
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def _migration_applied(conn: sqlite3.Connection) -> bool:
+    return _table_exists(conn, 'schema_migrations') and conn.execute(
+        "SELECT 1 FROM schema_migrations WHERE name = ?", (MIGRATION_NAME,)
+    ).fetchone() is not None
+
+
+def migrate_predictions_table(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Add and backfill the normalized key columns of predictions (idempotent).
+
+    Runs once per database: afterwards writers populate the columns and
+    result reconciliation fills game_id for recent rows (backfill_game_ids
+    with since), so later calls are a single marker lookup.
+
+    Args:
+        conn: Open connection; the caller owns it (committed here)
+
+    Returns:
+        Counts of backfilled rows: {'team_ids': n, 'game_ids': n}
+    """
+    if not _table_exists(conn, 'predictions') or _migration_applied(conn):
+        return {'team_ids': 0, 'game_ids': 0}
+
+    for column, column_type in PREDICTION_KEY_COLUMNS:
+        try:
+            conn.execute(f"ALTER TABLE predictions ADD COLUMN {column} {column_type}")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_predictions_result_date
+        ON predictions(actual_winner, game_date)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_predictions_game_id
+        ON predictions(game_id)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_predictions_date_team_ids
+        ON predictions(game_date, home_team_id, away_team_id)
+    """)
+
+    counts = {
+        'team_ids': backfill_team_ids(conn),
+        'game_ids': backfill_game_ids(conn),
+    }
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name TEXT PRIMARY KEY,
+            applied_at TIMESTAMP
+        )
+    """)
+    conn.execute(
+        "INSERT OR IGNORE INTO schema_migrations (name, applied_at) VALUES (?, ?)",
+        (MIGRATION_NAME, datetime.now().isoformat())
+    )
+    conn.commit()
+    return counts
+
+
+def backfill_team_ids(conn: sqlite3.Connection) -> int:
+    """
+    Fill home_team_id / away_team_id from the stored names.
+
+    Each distinct spelling is resolved once, then applied with one
+    executemany per side.
+    """
+    updated = 0
+    for side in ('home', 'away'):
+        names = [row[0] for row in conn.execute(f"""
+            SELECT DISTINCT {side}_team FROM predictions
+            WHERE {side}_team_id IS NULL AND {side}_team IS NOT NULL
+        """)]
+        resolved = [(resolve_team_id(name), name) for name in names]
+        resolved = [(team_id, name) for team_id, name in resolved if team_id is not None]
+        if not resolved:
+            continue
+        before = conn.total_changes
+        conn.executemany(f"""
+            UPDATE predictions SET {side}_team_id = ?
+            WHERE {side}_team = ? AND {side}_team_id IS NULL
+        """, resolved)
+        updated += conn.total_changes - before
+    return updated
+
+
+def backfill_game_ids(conn: sqlite3.Connection, since: Optional[str] = None) -> int:
+    """
+    Fill empty game_id values from games on (game_date, home_team_id, away_team_id).
+
+    Args:
+        conn: Open connection (not committed here)
+        since: Only rows with game_date >= since (YYYY-MM-DD); None = all rows
+    """
+    if not _table_exists(conn, 'games'):
+        return 0
+    before = conn.total_changes
+    conn.execute("""
+        UPDATE predictions
+        SET game_id = (
+            SELECT g.game_id FROM games g
+            WHERE g.game_date = predictions.game_date
+            AND g.home_team_id = predictions.home_team_id
+            AND g.away_team_id = predictions.away_team_id
+            LIMIT 1
+        )
+        WHERE (game_id IS NULL OR game_id = '')
+        AND home_team_id IS NOT NULL AND away_team_id IS NOT NULL
+        AND EXISTS (
+            SELECT 1 FROM games g
+            WHERE g.game_date = predictions.game_date
+            AND g.home_team_id = predictions.home_team_id
+            AND g.away_team_id = predictions.away_team_id
+        )
+        AND game_date >= ?
+    """, (since or '',))
+    return conn.total_changes - before
+
+
+def prediction_keys(conn: sqlite3.Connection, game_date: str, home_team, away_team,
+                    game_id: Optional[str] = None) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    """
+    Normalized keys for a prediction about to be written.
+
+    Args:
+        conn: Open connection (used to look up game_id in games if not given)
+        game_date: Game date (YYYY-MM-DD)
+        home_team: Home team name, tricode or ID
+        away_team: Away team name, tricode or ID
+        game_id: NBA game ID if the caller already has it
+
+    Returns:
+        (home_team_id, away_team_id, game_id)
+    """
+    home_id = resolve_team_id(home_team)
+    away_id = resolve_team_id(away_team)
+    if not game_id and home_id is not None and away_id is not None and _table_exists(conn, 'games'):
+        row = conn.execute("""
+            SELECT game_id FROM games
+            WHERE game_date = ? AND home_team_id = ? AND away_team_id = ?
+            LIMIT 1
+        """, (game_date, home_id, away_id)).fetchone()
+        game_id = row[0] if row else None
+    return home_id, away_id, game_id or None
@@ -16,27 +16,25 @@ sys.path.insert(0, str(project_root))
 
 from src.models import StackedEnsembleModel
 from src.data_fetcher import NBADataFetcher, FeatureEngineer
-from nba_api.stats.static import teams
+from src.team_identity import resolve_team_id, team_full_name
+from src.telemetry import span
 
 
 class NBAPredictor:
     """Main predictor class"""
 
-    def __init__(self, db_path='data/nba_predictor.db', model_dir='models'):
+    def __init__(self, db_path='data/nba_predictor.db', model_dir='models',
+                 data_fetcher=None, feature_engineer=None):
         self.model = StackedEnsembleModel()
-        self.data_fetcher = NBADataFetcher(db_path)
-        self.feature_engineer = FeatureEngineer(db_path)
+        # Shared instances from src.components when injected
+        self.data_fetcher = data_fetcher or NBADataFetcher(db_path)
+        self.feature_engineer = feature_engineer or FeatureEngineer(db_path)
         # Handle case where db_path is passed as model_dir (backwards compatibility)
         if model_dir.endswith('.db'):
             self.model_dir = 'models'
         else:
             self.model_dir = model_dir
         self.model_loaded = False
-        
-        # Team name to ID mapping
-        self.team_map = {t['full_name']: t['id'] for t in teams.get_teams()}
-        self.team_abbrev_map = {t['abbreviation']: t['id'] for t in teams.get_teams()}
-        self.id_to_name = {t['id']: t['full_name'] for t in teams.get_teams()}
     
     def load_model(self):
         """Load the trained model"""
@@ -133,17 +131,7 @@ class NBAPredictor:
     
     def _get_team_id(self, team_name):
         """Convert team name to team ID"""
-        # Try full name first
-        if team_name in self.team_map:
-            return self.team_map[team_name]
-        # Try abbreviation
-        if team_name in self.team_abbrev_map:
-            return self.team_abbrev_map[team_name]
-        # Try partial match
-        for name, tid in self.team_map.items():
-            if team_name.lower() in name.lower() or name.lower() in team_name.lower():
-                return tid
-        return None
+        return resolve_team_id(team_name)
     
     def predict_game(self, home_team, away_team, game_date=None):
         """Predict the outcome of a game using real features"""
@@ -160,12 +148,13 @@ class NBAPredictor:
         
         # Create features using FeatureEngineer
         try:
-            features = self.feature_engineer.create_features_for_game(
-                home_team_id=home_team_id,
-                away_team_id=away_team_id,
-                game_date=game_date,
-                include_player_stats=True  # Now enabled with robust caching
-            )
+            with span('features'):
+                features = self.feature_engineer.create_features_for_game(
+                    home_team_id=home_team_id,
+                    away_team_id=away_team_id,
+                    game_date=game_date,
+                    include_player_stats=True  # Now enabled with robust caching
+                )
             
             # Ensure features is a dictionary (even if empty)
             if not isinstance(features, dict):
@@ -196,7 +185,8 @@ class NBAPredictor:
             print(f"Features before prediction: {len(features_backup)} features")
             
             # Make prediction
-            result = self.model.predict_single(features)
+            with span('inference'):
+                result = self.model.predict_single(features)
 
             # Ensure result is a dictionary
             if not isinstance(result, dict):
@@ -208,6 +198,7 @@ class NBAPredictor:
             # Add team names FIRST
             result['home_team'] = home_team
             result['away_team'] = away_team
+            result['model_version'] = getattr(self.model, 'version', None)
 
             # APPLY PATTERN-BASED ADJUSTMENTS (from error analysis)
             result = self._apply_pattern_adjustments(result, features_backup)
@@ -336,8 +327,8 @@ class NBAPredictor:
             home_team_id = game['home_team_id']
             away_team_id = game['away_team_id']
 
-            home_team = self.id_to_name.get(home_team_id, f"Team {home_team_id}")
-            away_team = self.id_to_name.get(away_team_id, f"Team {away_team_id}")
+            home_team = team_full_name(home_team_id) or f"Team {home_team_id}"
+            away_team = team_full_name(away_team_id) or f"Team {away_team_id}"
 
             result = self.predict_game(home_team, away_team, game['game_date'])
 
@@ -3,12 +3,16 @@ Real Bookmaker Odds Fetcher
 Fetches live odds from The Odds API (free tier: 500 requests/month)
 """
 
-import requests
 import os
 from typing import Dict, Optional, List
 from datetime import datetime
-import json
-from pathlib import Path
+
+from src.http_client import http_get
+from src.odds_api_client import OddsAPIClient
+from src.odds_cache import DEFAULT_TTL_MINUTES
+from src.odds_key_manager import OddsKeyManager, record_quota_headers
+from src.odds_snapshot import OddsSnapshotService
+from src.team_identity import normalize_team_key, resolve_team_id, team_tricode
 
 class RealOddsFetcher:
     """
@@ -18,7 +22,8 @@ class RealOddsFetcher:
     Sign up: https://the-odds-api.com/
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, db_path: str = "data/nba_predictor.db",
+                 cache_ttl_minutes: int = DEFAULT_TTL_MINUTES):
         """
         Initialize with API key.
 
@@ -27,64 +32,37 @@ class RealOddsFetcher:
 
         Args:
             api_key: The Odds API key (optional, will read from .env)
+            db_path: Database holding the local odds cache
+            cache_ttl_minutes: Serve cached odds younger than this instead of calling the API
         """
         self.api_key = api_key or os.getenv('ODDS_API_KEY')
         self.base_url = "https://api.the-odds-api.com/v4"
         self.sport = "basketball_nba"
-        self.cache_dir = Path("data/odds_cache")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-
-    def get_todays_odds(self) -> List[Dict]:
+        # Boards go through the slate snapshot service: downloads follow the
+        # keys' budgeted refresh plan, persisted once and shared with the
+        # feature pipeline
+        self.snapshot = OddsSnapshotService(db_path, OddsAPIClient(self.api_key),
+                                            refresh_minutes=cache_ttl_minutes,
+                                            key_manager=OddsKeyManager())
+        self.cache = self.snapshot.cache
+        self.cache.import_legacy_json("data/odds_cache")
+
+    def get_todays_odds(self, force_refresh: bool = False) -> List[Dict]:
         """
         Get all NBA game odds for today.
 
+        Args:
+            force_refresh: Call the API even if the cached board is within the TTL
+
         Returns:
             List of games with odds from multiple bookmakers
         """
-        if not self.api_key:
-            print("[WARN] No Odds API key found. Set ODDS_API_KEY in .env file")
-            print("Get free key at: https://the-odds-api.com/")
-            return []
+        games = self.snapshot.get_board(force_refresh=force_refresh)
+        if games:
+            return games
 
-        url = f"{self.base_url}/sports/{self.sport}/odds"
-        params = {
-            'apiKey': self.api_key,
-            'regions': 'us,eu',  # US and European bookmakers
-            'markets': 'h2h',     # Head-to-head (moneyline)
-            'oddsFormat': 'decimal',
-            'dateFormat': 'iso'
-        }
-
-        try:
-            response = requests.get(url, params=params, timeout=10)
-
-            # Check remaining requests
-            remaining = response.headers.get('x-requests-remaining', 'Unknown')
-            used = response.headers.get('x-requests-used', 'Unknown')
-            print(f"Odds API Usage: {used} used, {remaining} remaining")
-
-            if response.status_code == 200:
-                games = response.json()
-
-                # Cache the response
-                cache_file = self.cache_dir / f"odds_{datetime.now().strftime('%Y%m%d')}.json"
-                with open(cache_file, 'w') as f:
-                    json.dump(games, f, indent=2)
-
-                return games
-            elif response.status_code == 401:
-                print("[ERROR] Invalid API key. Check your ODDS_API_KEY in .env")
-                return []
-            elif response.status_code == 429:
-                print("[ERROR] Rate limit exceeded. Using cached odds if available.")
-                return self._load_cached_odds()
-            else:
-                print(f"[ERROR] Error fetching odds: {response.status_code}")
-                return self._load_cached_odds()
-
-        except Exception as e:
-            print(f"[ERROR] Error fetching odds: {e}")
-            return self._load_cached_odds()
+        # Download failed (or no key): newest cached board of any age
+        return self._load_cached_odds()
 
     def get_game_odds(self, home_team: str, away_team: str) -> Optional[Dict]:
         """
@@ -114,6 +92,11 @@ class RealOddsFetcher:
                 'last_update': '2024-12-28T10:30:00Z'
             }
         """
+        # Freshest cached snapshot of this game, if within the TTL
+        cached_game = self.cache.get_game(home_team, away_team, max_age=self.cache.ttl)
+        if cached_game:
+            return self._parse_game_odds(cached_game)
+
         all_games = self.get_todays_odds()
 
         if not all_games:
@@ -210,46 +193,24 @@ class RealOddsFetcher:
         }
 
     def _normalize_team_name(self, team: str) -> str:
-        """Normalize team name for matching"""
-        # Convert to lowercase and remove common words
-        team = team.lower().strip()
-        team = team.replace('los angeles', 'la')
-        team = team.replace('new york', 'ny')
-        team = team.replace('golden state', 'gs')
-
-        # Common abbreviations
-        abbrev_map = {
-            'lakers': 'lal', 'celtics': 'bos', 'warriors': 'gsw',
-            'nets': 'bkn', 'knicks': 'nyk', 'bulls': 'chi',
-            'cavaliers': 'cle', 'mavericks': 'dal', 'nuggets': 'den',
-            'pistons': 'det', 'rockets': 'hou', 'pacers': 'ind',
-            'clippers': 'lac', 'heat': 'mia', 'bucks': 'mil',
-            'timberwolves': 'min', 'pelicans': 'nop', 'thunder': 'okc',
-            'magic': 'orl', '76ers': 'phi', 'suns': 'phx',
-            'blazers': 'por', 'kings': 'sac', 'spurs': 'sas',
-            'raptors': 'tor', 'jazz': 'uta', 'wizards': 'was',
-            'hawks': 'atl', 'hornets': 'cha', 'grizzlies': 'mem',
-            'sixers': 'phi', 'trail blazers': 'por'
-        }
-
-        for full, abbrev in abbrev_map.items():
-            if full in team:
-                return abbrev
-
-        return team
+        """Normalize team name for matching (lowercase tricode, e.g. 'lal')"""
+        team_id = resolve_team_id(team)
+        if team_id is None:
+            return normalize_team_key(team)
+        return team_tricode(team_id).lower()
 
     def _load_cached_odds(self) -> List[Dict]:
-        """Load most recent cached odds"""
-        cache_files = sorted(self.cache_dir.glob("odds_*.json"), reverse=True)
-
-        if cache_files:
-            try:
-                with open(cache_files[0], 'r') as f:
-                    data = json.load(f)
-                print(f"📁 Using cached odds from {cache_files[0].name}")
-                return data
-            except Exception as e:
-                print(f"Error loading cache: {e}")
+        """Load most recent cached odds (any age)"""
+        try:
+            cached = self.cache.latest_board()
+        except Exception as e:
+            print(f"Error loading cache: {e}")
+            return []
+
+        if cached:
+            fetched_at, games = cached
+            print(f"📁 Using cached odds from {fetched_at.strftime('%Y-%m-%d %H:%M')}")
+            return games
 
         return []
 
@@ -262,7 +223,8 @@ class RealOddsFetcher:
         params = {'apiKey': self.api_key}
 
         try:
-            response = requests.get(url, params=params, timeout=5)
+            response = http_get(url, params=params, timeout=5)
+            record_quota_headers(self.api_key, response)
             return {
                 'remaining': response.headers.get('x-requests-remaining', 'Unknown'),
                 'used': response.headers.get('x-requests-used', 'Unknown'),
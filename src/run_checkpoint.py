@@ -0,0 +1,181 @@
+"""
+Run Checkpoints
+Per-run step outputs on disk so a failed daily run can resume
+
+Every run writes to data/runs/<date>_<fingerprint>/, where the fingerprint
+hashes the run parameters and the model files. Each completed step records
+its status, wall time and outputs (one JSON file per output, with a
+sha256) in manifest.json. With resume enabled, steps whose outputs are
+still valid are restored instead of re-executed, so a rerun after a
+network failure only redoes the steps that did not finish.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.model_identity import model_content_hash
+
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def _json_default(obj):
+    """JSON encoder fallback for NumPy scalars/arrays and datetimes."""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def model_fingerprint(model_dir: str) -> str:
+    """Hash of the model directory contents (see model_identity)."""
+    return model_content_hash(model_dir)
+
+
+def run_fingerprint(params: Dict[str, Any]) -> str:
+    """Short, stable hash of a run's input parameters."""
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class RunCheckpoint:
+    """
+    Checkpoint store for one workflow run.
+
+    Features:
+    - Run directory keyed by date and input fingerprint
+    - Outputs persisted after every successful step (atomic writes)
+    - Output checksums: a truncated or edited file invalidates the step
+    - Old run directories pruned after keep_days
+    """
+
+    def __init__(self, run_date: str, params: Dict[str, Any],
+                 root: str = "data/runs", resume: bool = False, keep_days: int = 14):
+        """
+        Args:
+            run_date: Date the run is for (YYYY-MM-DD)
+            params: Run inputs (CLI parameters, model fingerprint, ...)
+            root: Directory holding all run directories
+            resume: Reuse completed steps of a previous run with the same inputs
+            keep_days: Age after which other run directories are deleted
+        """
+        self.root = Path(root)
+        self.fingerprint = run_fingerprint(dict(params, run_date=run_date))
+        self.run_dir = self.root / f"{run_date}_{self.fingerprint}"
+        self.resume = resume
+
+        if not resume and self.run_dir.exists():
+            shutil.rmtree(self.run_dir)
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+
+        self.manifest = self._load_manifest() if resume else {}
+        if not self.manifest:
+            self.manifest = {
+                'run_date': run_date,
+                'fingerprint': self.fingerprint,
+                'params': params,
+                'created_at': datetime.now().isoformat(),
+                'steps': {},
+            }
+            self._write_manifest()
+
+        self.prune(keep_days)
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.run_dir / MANIFEST_NAME, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest if manifest.get('fingerprint') == self.fingerprint else {}
+
+    def _write_manifest(self):
+        self._write_atomic(self.run_dir / MANIFEST_NAME,
+                           json.dumps(self.manifest, indent=2).encode('utf-8'))
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------------------
+    def save_step(self, name: str, outputs: Dict[str, Any], seconds: float):
+        """Persist a successful step and its outputs."""
+        files = {}
+        for key, value in outputs.items():
+            data = json.dumps(value, default=_json_default).encode('utf-8')
+            file_name = f"{name}.{key}.json"
+            self._write_atomic(self.run_dir / file_name, data)
+            files[key] = {'file': file_name, 'sha256': hashlib.sha256(data).hexdigest()}
+
+        self.manifest['steps'][name] = {
+            'status': 'ok',
+            'seconds': round(seconds, 3),
+            'completed_at': datetime.now().isoformat(),
+            'outputs': files,
+        }
+        self._write_manifest()
+
+    def load_step(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Outputs of a step completed by a previous attempt of this run.
+
+        Returns:
+            {output: value} (empty for steps without outputs), or None if the
+            step has to run (not resuming, never completed, or invalid outputs)
+        """
+        if not self.resume:
+            return None
+        entry = self.manifest['steps'].get(name)
+        if not entry or entry.get('status') != 'ok':
+            return None
+
+        outputs = {}
+        for key, spec in entry.get('outputs', {}).items():
+            try:
+                data = (self.run_dir / spec['file']).read_bytes()
+            except OSError:
+                return None
+            if hashlib.sha256(data).hexdigest() != spec['sha256']:
+                return None
+            outputs[key] = json.loads(data.decode('utf-8'))
+        return outputs
+
+    def invalidate(self, name: str):
+        """Forget a step (it reruns, e.g. because an upstream step reran)."""
+        if self.manifest['steps'].pop(name, None) is not None:
+            self._write_manifest()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def prune(self, keep_days: int = 14) -> int:
+        """Delete other run directories older than keep_days."""
+        cutoff = (datetime.now() - timedelta(days=keep_days)).timestamp()
+        removed = 0
+        for path in self.root.iterdir():
+            if path.is_dir() and path != self.run_dir and path.stat().st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
@@ -0,0 +1,193 @@
+"""
+Team Identity
+One precomputed alias index resolving any team spelling to its NBA team ID
+
+Every spelling seen across the project (nba_api full names, cities,
+nicknames, tricodes, "LA" variants, bookmaker and scraper spellings) is
+mapped to a team ID once at import, so resolution is a dict lookup.
+Names that miss the index go through a memoized fuzzy matcher.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional
+
+from nba_api.stats.static import teams as nba_teams
+
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9 ]+')
+_SPACES_RE = re.compile(r'\s+')
+
+# Extra spellings used by bookmakers, scrapers and older data, keyed by tricode
+EXTRA_ALIASES = {
+    'ATL': ['atl hawks'],
+    'BKN': ['brk', 'bk nets', 'bkn nets'],
+    'CHA': ['cho', 'cha hornets'],
+    'GSW': ['gs', 'gs warriors', 'golden st warriors', 'golden st'],
+    'LAC': ['la clippers', 'l a clippers', 'lac clippers'],
+    'LAL': ['la lakers', 'l a lakers', 'lal lakers'],
+    'NOP': ['no', 'nor', 'no pelicans', 'new orleans pels'],
+    'NYK': ['ny', 'ny knicks'],
+    'OKC': ['okc thunder', 'okla city thunder'],
+    'PHI': ['sixers', 'philly', 'phila 76ers', 'philadelphia sixers'],
+    'PHX': ['pho', 'pho suns'],
+    'POR': ['blazers', 'portland blazers', 'trailblazers'],
+    'SAS': ['sa', 'sa spurs'],
+    'CLE': ['cavs'],
+    'DAL': ['mavs'],
+    'MIN': ['wolves', 't wolves', 'twolves', 'minnesota wolves'],
+    'UTA': ['utah', 'uth'],
+    'WAS': ['wsh', 'wsh wizards'],
+}
+
+
+def normalize_team_key(name: str) -> str:
+    """
+    Canonical lookup key for a team spelling.
+
+    "L.A. Clippers" -> "la clippers", "Trail-Blazers" -> "trail blazers"
+    """
+    if not name:
+        return ''
+    key = name.lower().replace('.', '').replace('-', ' ')
+    key = _NON_ALNUM_RE.sub('', key)
+    return _SPACES_RE.sub(' ', key).strip()
+
+
+def _build_index():
+    """Team records by ID, alias key -> team ID, and aliases shared by several teams."""
+    records = {team['id']: team for team in nba_teams.get_teams()}
+    by_tricode = {team['abbreviation']: team['id'] for team in records.values()}
+
+    candidates: Dict[str, set] = {}
+
+    def add(alias: str, team_id: int):
+        key = normalize_team_key(alias)
+        if key:
+            candidates.setdefault(key, set()).add(team_id)
+
+    for team_id, team in records.items():
+        add(team['full_name'], team_id)
+        add(team['abbreviation'], team_id)
+        add(team['nickname'], team_id)
+        add(team['city'], team_id)
+        add(f"{team['abbreviation']} {team['nickname']}", team_id)
+        if team['city'] == 'Los Angeles':
+            add(f"LA {team['nickname']}", team_id)
+
+    for tricode, aliases in EXTRA_ALIASES.items():
+        team_id = by_tricode.get(tricode)
+        if team_id is None:
+            continue
+        for alias in aliases:
+            add(alias, team_id)
+
+    # "los angeles" names two teams: keep only aliases with a single owner
+    aliases = {key: next(iter(ids)) for key, ids in candidates.items() if len(ids) == 1}
+    ambiguous = frozenset(key for key, ids in candidates.items() if len(ids) > 1)
+    return records, aliases, ambiguous
+
+
+TEAMS_BY_ID, TEAM_ALIASES, AMBIGUOUS_ALIASES = _build_index()
+
+# Aliases long enough to search for inside a longer string, longest first
+_SEARCH_ALIASES = sorted(
+    ((key, team_id) for key, team_id in TEAM_ALIASES.items() if len(key) > 3),
+    key=lambda item: len(item[0]), reverse=True
+)
+
+
+@lru_cache(maxsize=1024)
+def _fuzzy_team_id(key: str) -> Optional[int]:
+    """Memoized fallback for keys that are not an exact alias."""
+    if key in AMBIGUOUS_ALIASES:
+        return None
+    padded = f' {key} '
+    # A known alias appearing as whole words ("Portland Trail Blazers (POR)")
+    for alias, team_id in _SEARCH_ALIASES:
+        if f' {alias} ' in padded:
+            return team_id
+
+    # A fragment of exactly one full name ("Angeles Lakers", "Timberwol")
+    if len(key) > 3:
+        matches = {
+            team_id for team_id, team in TEAMS_BY_ID.items()
+            if key in normalize_team_key(team['full_name'])
+        }
+        if len(matches) == 1:
+            return matches.pop()
+    return None
+
+
+def resolve_team_id(team_name: str) -> Optional[int]:
+    """
+    Resolve any team spelling to its NBA team ID.
+
+    Args:
+        team_name: Full name, city, nickname, tricode or bookmaker spelling
+
+    Returns:
+        Team ID, or None if the name is unknown or ambiguous
+    """
+    if isinstance(team_name, int):
+        return team_name if team_name in TEAMS_BY_ID else None
+    key = normalize_team_key(team_name)
+    if not key:
+        return None
+    team_id = TEAM_ALIASES.get(key)
+    if team_id is None:
+        team_id = _fuzzy_team_id(key)
+    return team_id
+
+
+def team_full_name(team_id: int) -> Optional[str]:
+    """Full name for a team ID (e.g., "Boston Celtics")."""
+    team = TEAMS_BY_ID.get(team_id)
+    return team['full_name'] if team else None
+
+
+def team_tricode(team_id: int) -> Optional[str]:
+    """Tricode for a team ID (e.g., "BOS")."""
+    team = TEAMS_BY_ID.get(team_id)
+    return team['abbreviation'] if team else None
+
+
+def team_nickname(team_id: int) -> Optional[str]:
+    """Nickname for a team ID (e.g., "Celtics")."""
+    team = TEAMS_BY_ID.get(team_id)
+    return team['nickname'] if team else None
+
+
+def to_full_name(team_name: str) -> str:
+    """Full name for any spelling, or the input unchanged if unknown."""
+    team_id = resolve_team_id(team_name)
+    return team_full_name(team_id) if team_id is not None else team_name
+
+
+def to_tricode(team_name: str) -> str:
+    """Tricode for any spelling, or the input unchanged if unknown."""
+    team_id = resolve_team_id(team_name)
+    return team_tricode(team_id) if team_id is not None else team_name
+
+
+def teams_match(team1: str, team2: str) -> bool:
+    """True if two spellings name the same team."""
+    if not team1 or not team2:
+        return False
+    id1 = resolve_team_id(team1)
+    if id1 is not None:
+        return id1 == resolve_team_id(team2)
+    return normalize_team_key(team1) == normalize_team_key(team2)
+
+
+def same_matchup(home1: str, away1: str, home2: str, away2: str,
+                 either_order: bool = False) -> bool:
+    """
+    True if (home1, away1) and (home2, away2) are the same game.
+
+    Args:
+        either_order: Also accept the pairing with home/away swapped
+    """
+    if teams_match(home1, home2) and teams_match(away1, away2):
+        return True
+    return either_order and teams_match(home1, away2) and teams_match(away1, home2)
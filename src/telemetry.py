@@ -0,0 +1,370 @@
+"""
+Run Telemetry
+Timing spans, SQLite statement counts and HTTP usage for one workflow run
+
+Between start_run() and end_run():
+- span(name) / laps(prefix) record nested wall-time spans (pipeline step,
+  game, feature group, model inference); nesting is tracked per thread
+- every sqlite3.connect() connection counts its statements (trace
+  callback) and times execute/executemany/executescript
+- outbound HTTP usage is taken from the shared HTTP client's per-host stats
+
+end_run() returns a summary; write() stores it as JSON and as a
+Prometheus textfile in logs/. Outside a run, span() and laps() are no-ops.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_SPAN_RECORDS = 20000  # Raw spans kept per run (aggregates are always complete)
+
+_original_connect = sqlite3.connect
+
+
+def _statement_kind(sql: str) -> str:
+    """First keyword of a statement (SELECT, INSERT, ...), lower-cased."""
+    words = sql.lstrip().split(None, 1)
+    return words[0].lower() if words else 'empty'
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """Cursor that adds its execute time to the active run."""
+
+    def execute(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().execute(*args, **kwargs)
+        finally:
+            _telemetry._add_sql_time(time.perf_counter() - start)
+
+    def executemany(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().executemany(*args, **kwargs)
+        finally:
+            _telemetry._add_sql_time(time.perf_counter() - start)
+
+    def executescript(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().executescript(*args, **kwargs)
+        finally:
+            _telemetry._add_sql_time(time.perf_counter() - start)
+
+
+class _TracedConnection(sqlite3.Connection):
+    """Connection that counts statements (trace callback) and times executes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _telemetry._add_connection()
+        self.set_trace_callback(_telemetry._on_statement)
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().execute(*args, **kwargs)
+        finally:
+            _telemetry._add_sql_time(time.perf_counter() - start)
+
+    def executemany(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().executemany(*args, **kwargs)
+        finally:
+            _telemetry._add_sql_time(time.perf_counter() - start)
+
+    def executescript(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().executescript(*args, **kwargs)
+        finally:
+            _telemetry._add_sql_time(time.perf_counter() - start)
+
+
+def _traced_connect(*args, **kwargs):
+    """sqlite3.connect() replacement used while a run is active."""
+    if 'factory' not in kwargs and len(args) < 6:
+        kwargs['factory'] = _TracedConnection
+    return _original_connect(*args, **kwargs)
+
+
+class _Laps:
+    """Sequential spans: lap(name) ends the previous segment and starts the next."""
+
+    def __init__(self, telemetry: 'Telemetry', prefix: str):
+        self.telemetry = telemetry
+        self.prefix = prefix
+        self.current: Optional[str] = None
+        self.started = 0.0
+
+    def lap(self, name: Optional[str]):
+        now = time.perf_counter()
+        if self.current is not None:
+            self.telemetry._record(f"{self.prefix}.{self.current}", self.started, now - self.started, {})
+        self.current = name
+        self.started = now
+
+    def stop(self):
+        self.lap(None)
+
+
+class _NullLaps:
+    def lap(self, name):
+        pass
+
+    def stop(self):
+        pass
+
+
+class Telemetry:
+    """
+    Per-run instrumentation.
+
+    Features:
+    - Nested timing spans (per-thread stack), aggregated by name
+    - SQLite statements by kind, connections opened and execute time
+    - HTTP requests, errors, bytes and latency per host (delta over the run)
+    - JSON summary and Prometheus textfile per run
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.active = False
+        self._reset(None)
+
+    def _reset(self, name: Optional[str]):
+        self.run_name = name
+        self.started_at: Optional[datetime] = None
+        self._started = 0.0
+        self._spans: List[Dict] = []
+        self._span_totals: Dict[str, List[float]] = {}  # name -> [count, total, max]
+        self._sql_counts: Dict[str, int] = {}
+        self._sql_seconds = 0.0
+        self._sql_connections = 0
+        self._http_baseline: Dict[str, Dict] = {}
+
+    # ------------------------------------------------------------------
+    # Run lifecycle
+    # ------------------------------------------------------------------
+    def start_run(self, name: str):
+        """Reset counters, hook sqlite3.connect and start recording."""
+        from src.http_client import get_http_client
+
+        with self._lock:
+            self._reset(name)
+            self.started_at = datetime.now()
+            self._started = time.perf_counter()
+            self._http_baseline = get_http_client().get_host_stats()
+            self.active = True
+        sqlite3.connect = _traced_connect
+
+    def end_run(self, success: bool = True) -> Dict[str, Any]:
+        """Stop recording, unhook sqlite3.connect and return the run summary."""
+        sqlite3.connect = _original_connect
+        with self._lock:
+            self.active = False
+        return self.summary(success)
+
+    def summary(self, success: bool = True) -> Dict[str, Any]:
+        """Run summary (JSON-serializable)."""
+        with self._lock:
+            spans = {
+                name: {'count': int(count), 'seconds': round(total, 6), 'max_seconds': round(longest, 6)}
+                for name, (count, total, longest) in sorted(
+                    self._span_totals.items(), key=lambda item: -item[1][1]
+                )
+            }
+            sql_counts = dict(sorted(self._sql_counts.items(), key=lambda item: -item[1]))
+            summary = {
+                'run': self.run_name,
+                'started_at': self.started_at.isoformat() if self.started_at else None,
+                'duration_seconds': round(time.perf_counter() - self._started, 3),
+                'success': success,
+                'spans': spans,
+                'sqlite': {
+                    'connections': self._sql_connections,
+                    'statements': sum(sql_counts.values()),
+                    'by_kind': sql_counts,
+                    'execute_seconds': round(self._sql_seconds, 6),
+                },
+                'http': self._http_delta(),
+                'inference': spans.get('inference', {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0}),
+                'span_records': list(self._spans),
+            }
+        return summary
+
+    def _http_delta(self) -> Dict[str, Dict]:
+        from src.http_client import get_http_client
+
+        delta = {}
+        for host, stats in get_http_client().get_host_stats().items():
+            before = self._http_baseline.get(host, {})
+            host_delta = {key: value - before.get(key, 0) for key, value in stats.items()}
+            if host_delta.get('requests'):
+                host_delta['elapsed_seconds'] = round(host_delta['elapsed_seconds'], 6)
+                delta[host] = host_delta
+        return delta
+
+    # ------------------------------------------------------------------
+    # Spans
+    # ------------------------------------------------------------------
+    def span(self, name: str, **attrs):
+        """Context manager timing a block (no-op outside a run)."""
+        if not self.active:
+            return nullcontext()
+        return self._span(name, attrs)
+
+    @contextmanager
+    def _span(self, name: str, attrs: Dict):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._record(name, start, time.perf_counter() - start, attrs, parent='/'.join(stack) or None)
+
+    def laps(self, prefix: str):
+        """Sequential sub-spans named prefix.<lap> (no-op outside a run)."""
+        return _Laps(self, prefix) if self.active else _NullLaps()
+
+    def _record(self, name: str, start: float, seconds: float, attrs: Dict, parent: Optional[str] = None):
+        if not self.active:
+            return
+        if parent is None:
+            stack = getattr(self._local, 'stack', None)
+            parent = '/'.join(stack) if stack else None
+        with self._lock:
+            totals = self._span_totals.setdefault(name, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+            if len(self._spans) < MAX_SPAN_RECORDS:
+                record = {
+                    'name': name,
+                    'parent': parent,
+                    'thread': threading.current_thread().name,
+                    'start': round(start - self._started, 6),
+                    'seconds': round(seconds, 6),
+                }
+                if attrs:
+                    record['attrs'] = attrs
+                self._spans.append(record)
+
+    # ------------------------------------------------------------------
+    # SQLite hooks
+    # ------------------------------------------------------------------
+    def _on_statement(self, sql: str):
+        if not self.active:
+            return
+        kind = _statement_kind(sql)
+        with self._lock:
+            self._sql_counts[kind] = self._sql_counts.get(kind, 0) + 1
+
+    def _add_sql_time(self, seconds: float):
+        if self.active:
+            with self._lock:
+                self._sql_seconds += seconds
+
+    def _add_connection(self):
+        if self.active:
+            with self._lock:
+                self._sql_connections += 1
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+    def write(self, summary: Dict[str, Any], log_dir: str = 'logs') -> Tuple[Path, Path]:
+        """
+        Write the run summary to log_dir.
+
+        Returns:
+            (JSON path, Prometheus textfile path). The JSON file is per run
+            (timestamped); the .prom file holds the latest run, as textfile
+            collectors expect.
+        """
+        log_dir = Path(log_dir)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        run = summary.get('run') or 'run'
+        stamp = (summary.get('started_at') or datetime.now().isoformat())[:19].replace(':', '').replace('-', '')
+
+        json_path = log_dir / f"telemetry_{run}_{stamp}.json"
+        with open(json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        prom_path = log_dir / f"telemetry_{run}.prom"
+        tmp_path = prom_path.with_suffix('.prom.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(prometheus_text(summary))
+        tmp_path.replace(prom_path)
+        return json_path, prom_path
+
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def prometheus_text(summary: Dict[str, Any]) -> str:
+    """Render a run summary in the Prometheus text exposition format."""
+    run = _label(summary.get('run') or 'run')
+    lines = []
+
+    def metric(name: str, help_text: str, kind: str, samples: List[Tuple[Dict[str, str], float]]):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{_label(val)}"' for key, val in dict(run=run, **labels).items())
+            lines.append(f"{name}{{{label_text}}} {value}")
+
+    metric('nba_run_duration_seconds', 'Wall time of the last run', 'gauge',
+           [({}, summary['duration_seconds'])])
+    metric('nba_run_success', 'Whether the last run succeeded', 'gauge',
+           [({}, int(bool(summary['success'])))])
+    metric('nba_run_timestamp_seconds', 'Start time of the last run', 'gauge',
+           [({}, int(datetime.fromisoformat(summary['started_at']).timestamp()) if summary.get('started_at') else 0)])
+    metric('nba_span_seconds', 'Total wall time per span name', 'gauge',
+           [({'span': name}, s['seconds']) for name, s in summary['spans'].items()])
+    metric('nba_span_count', 'Spans recorded per span name', 'gauge',
+           [({'span': name}, s['count']) for name, s in summary['spans'].items()])
+    metric('nba_sqlite_statements', 'SQLite statements executed, by kind', 'gauge',
+           [({'kind': kind}, count) for kind, count in summary['sqlite']['by_kind'].items()])
+    metric('nba_sqlite_execute_seconds', 'Time spent in SQLite execute calls', 'gauge',
+           [({}, summary['sqlite']['execute_seconds'])])
+    metric('nba_sqlite_connections', 'SQLite connections opened', 'gauge',
+           [({}, summary['sqlite']['connections'])])
+    metric('nba_http_requests', 'Outbound HTTP requests, by host', 'gauge',
+           [({'host': host}, s['requests']) for host, s in summary['http'].items()])
+    metric('nba_http_errors', 'Failed outbound HTTP requests, by host', 'gauge',
+           [({'host': host}, s['errors']) for host, s in summary['http'].items()])
+    metric('nba_http_bytes', 'Bytes received on the wire, by host', 'gauge',
+           [({'host': host}, s['bytes']) for host, s in summary['http'].items()])
+    metric('nba_http_seconds', 'Time spent in HTTP requests, by host', 'gauge',
+           [({'host': host}, s['elapsed_seconds']) for host, s in summary['http'].items()])
+    return '\n'.join(lines) + '\n'
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    """Get the process-wide telemetry recorder."""
+    return _telemetry
+
+
+def span(name: str, **attrs):
+    """Time a block in the active run (see Telemetry.span)."""
+    return _telemetry.span(name, **attrs)
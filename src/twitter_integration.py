@@ -8,14 +8,15 @@ import io
 import time
 import logging
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from pathlib import Path
-from PIL import Image
-import plotly.graph_objects as go
-import plotly.io as pio
 import tweepy
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+# plotly/kaleido and PIL are only needed to render images: imported where used
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 # Logging setup
 logger = logging.getLogger("twitter_integration")
 logger.setLevel(logging.INFO)
@@ -331,7 +332,7 @@ def setup_twitter_api(credentials: Dict) -> Dict:
 
 
 def create_chart_image(
-    fig: go.Figure, 
+    fig: "go.Figure", 
     filename: str, 
     width: int = 1200, 
     height: int = 675, 
@@ -359,6 +360,8 @@ def create_composite_image(
     tile_size: Tuple[int, int] = (1200, 675)
 ) -> str:
     """Compose multiple images into a single grid image."""
+    from PIL import Image
+
     images = [Image.open(p) for p in image_paths]
     n = len(images)
     
@@ -406,26 +409,18 @@ def format_prediction_tweet(prediction: Dict, features: Dict, max_len: int = 280
     home_team = prediction.get('home_team', 'Home')
     away_team = prediction.get('away_team', 'Away')
 
-    # Get full team names and abbreviations
-    from nba_api.stats.static import teams
-    all_teams = teams.get_teams()
-    team_dict = {team['abbreviation']: team['full_name'] for team in all_teams}
-    # Reverse mapping: full_name -> abbreviation
-    abbrev_dict = {team['full_name']: team['abbreviation'] for team in all_teams}
-
-    # Get full names (if input is abbreviation, get full name; if already full name, use as-is)
-    home_full = team_dict.get(home_team, home_team) if len(home_team) <= 3 else home_team
-    away_full = team_dict.get(away_team, away_team) if len(away_team) <= 3 else away_team
-    
-    # Get abbreviations (if input is full name, get abbreviation; if already abbreviation, use as-is)
-    home_abbrev = abbrev_dict.get(home_team, home_team) if len(home_team) > 3 else home_team
-    away_abbrev = abbrev_dict.get(away_team, away_team) if len(away_team) > 3 else away_team
+    # Get full team names and abbreviations (either spelling accepted)
+    from src.team_identity import to_full_name, to_tricode
+    home_full = to_full_name(home_team)
+    away_full = to_full_name(away_team)
+    home_abbrev = to_tricode(home_team)
+    away_abbrev = to_tricode(away_team)
 
     # Calculate predicted winner if not present
     if 'predicted_winner' in prediction:
         predicted_winner_raw = prediction.get('predicted_winner', home_team)
         # Convert to full name if it's an abbreviation
-        predicted_winner = team_dict.get(predicted_winner_raw, predicted_winner_raw) if len(predicted_winner_raw) <= 3 else predicted_winner_raw
+        predicted_winner = to_full_name(predicted_winner_raw)
     elif 'prediction' in prediction:
         # prediction['prediction'] is 'home' or 'away'
         predicted_winner = home_full if prediction.get('prediction') == 'home' else away_full